@@ -580,7 +580,9 @@ async def trigger_browser_crawl():
         
         print('🚀 开始浏览器自动化抓取...')
         items = await scraper.scrape_batch()
-        print(f'✅ 抓取完成: {{len(items)}} 条数据')
+        published = await scraper.publish(items)
+        await scraper.cleanup()
+        print(f'✅ 抓取完成: {{len(items)}} 条数据, 发布 {{published}} 条')
         
         return len(items) > 0
     except Exception as e:
@@ -0,0 +1,163 @@
+"""Recall-vs-latency benchmark for the vector store ANN indexes.
+
+Loads a synthetic clustered corpus into the configured backend, builds the
+index with derived parameters, then sweeps the per-query search effort
+(HNSW ef_search or ivfflat probes) and reports recall@k against exact
+brute-force neighbours, for single-query and batched search.
+
+Run it against a scratch database or collection, e.g.:
+
+    DATABASE_URL=postgresql://.../ann_bench python benchmark_ann.py --backend pgvector --index hnsw
+    python benchmark_ann.py --backend qdrant --collection ann_benchmark
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+import numpy as np
+from loguru import logger
+
+from config import Settings
+from storage.vector_store import VectorStore
+
+
+SWEEPS = {
+    'hnsw': ('ef_search', [10, 20, 40, 80, 160, 320]),
+    'ivfflat': ('probes', [1, 2, 4, 8, 16, 32, 64]),
+}
+
+
+def corpus_chunk(args, centers: np.ndarray, chunk_index: int, size: int) -> np.ndarray:
+    """Deterministically generate one chunk of unit-length clustered vectors."""
+    rng = np.random.default_rng([args.seed, chunk_index])
+    labels = rng.integers(len(centers), size=size)
+    vectors = centers[labels] + args.noise * rng.standard_normal((size, args.dim), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def chunk_sizes(args) -> List[int]:
+    """Row counts of each corpus chunk."""
+    full, rest = divmod(args.rows, args.chunk_size)
+    return [args.chunk_size] * full + ([rest] if rest else [])
+
+
+async def load_corpus(args, store: VectorStore, centers: np.ndarray):
+    """Insert the corpus in chunk-sized batches."""
+    offset = 0
+    start = time.perf_counter()
+    for chunk_index, size in enumerate(chunk_sizes(args)):
+        vectors = corpus_chunk(args, centers, chunk_index, size)
+        ids = list(range(offset, offset + size))
+        if not await store.store_embeddings_batch(ids, vectors, [{} for _ in ids]):
+            raise RuntimeError(f"Failed to store chunk {chunk_index}")
+        offset += size
+        logger.info(f"Loaded {offset}/{args.rows} vectors ({time.perf_counter() - start:.0f}s)")
+
+
+def exact_neighbours(args, centers: np.ndarray, queries: np.ndarray) -> List[set]:
+    """Brute-force top-k ids per query, streaming the corpus chunk by chunk."""
+    best_scores = np.full((len(queries), args.k), -np.inf, dtype=np.float32)
+    best_ids = np.zeros((len(queries), args.k), dtype=np.int64)
+    offset = 0
+    
+    for chunk_index, size in enumerate(chunk_sizes(args)):
+        scores = queries @ corpus_chunk(args, centers, chunk_index, size).T
+        ids = np.broadcast_to(np.arange(offset, offset + size), scores.shape)
+        
+        merged_scores = np.concatenate([best_scores, scores], axis=1)
+        merged_ids = np.concatenate([best_ids, ids], axis=1)
+        top = np.argpartition(-merged_scores, args.k - 1, axis=1)[:, :args.k]
+        best_scores = np.take_along_axis(merged_scores, top, axis=1)
+        best_ids = np.take_along_axis(merged_ids, top, axis=1)
+        offset += size
+    
+    return [set(map(str, row)) for row in best_ids]
+
+
+def recall(results: List[List[Dict]], truth: List[set], k: int) -> float:
+    """Mean fraction of the exact top-k found by the index."""
+    found = [len({str(hit['id']) for hit in hits} & expected) for hits, expected in zip(results, truth)]
+    return sum(found) / (k * len(truth))
+
+
+async def run(args):
+    settings = Settings(
+        vector_store_type=args.backend,
+        qdrant_collection_name=args.collection,
+        qdrant_vector_size=args.dim,
+        pgvector_index_type=args.index
+    )
+    store = VectorStore(settings)
+    await store.initialize()
+    
+    centers = np.random.default_rng(args.seed).standard_normal((args.clusters, args.dim), dtype=np.float32)
+    query_rng = np.random.default_rng([args.seed, 2 ** 32])
+    queries = centers[query_rng.integers(args.clusters, size=args.queries)]
+    queries = queries + args.noise * query_rng.standard_normal(queries.shape, dtype=np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    
+    try:
+        if not args.skip_load:
+            await load_corpus(args, store, centers)
+        
+        start = time.perf_counter()
+        index_info = await store.build_index(args.index)
+        logger.info(f"Index built in {time.perf_counter() - start:.0f}s: {index_info}")
+        
+        truth = exact_neighbours(args, centers, queries)
+        
+        param_name, values = SWEEPS[args.index]
+        print(f"\n{args.backend} {args.index} rows={args.rows} dim={args.dim} k={args.k} queries={args.queries}")
+        print(f"{param_name:>10} {'recall':>8} {'single p50':>11} {'single p95':>11} {'batch/query':>12} {'batch qps':>10}")
+        
+        for value in values:
+            params = {param_name: value}
+            
+            latencies = []
+            single_results = []
+            for query in queries:
+                start = time.perf_counter()
+                single_results.append(await store.search_similar(query, args.k, **params))
+                latencies.append(time.perf_counter() - start)
+            
+            start = time.perf_counter()
+            batch_results = await store.search_similar_batch(queries, args.k, **params)
+            batch_seconds = time.perf_counter() - start
+            
+            print(
+                f"{value:>10} {recall(batch_results, truth, args.k):>8.3f} "
+                f"{np.percentile(latencies, 50) * 1000:>9.2f}ms {np.percentile(latencies, 95) * 1000:>9.2f}ms "
+                f"{batch_seconds / len(queries) * 1000:>10.2f}ms {len(queries) / batch_seconds:>10.0f}"
+            )
+            if abs(recall(single_results, truth, args.k) - recall(batch_results, truth, args.k)) > 0.01:
+                logger.warning(f"Single and batch recall differ at {param_name}={value}")
+    finally:
+        await store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["pgvector", "qdrant"], default="pgvector")
+    parser.add_argument("--index", choices=["hnsw", "ivfflat"], default="hnsw")
+    parser.add_argument("--collection", default="ann_benchmark", help="Qdrant collection to load")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=1536, help="pgvector tables are fixed at 1536")
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--noise", type=float, default=0.7)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--skip-load", action="store_true", help="Reuse a corpus loaded by a previous run")
+    args = parser.parse_args()
+    
+    if args.backend == "qdrant" and args.index != "hnsw":
+        parser.error("Qdrant only supports --index hnsw")
+    
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
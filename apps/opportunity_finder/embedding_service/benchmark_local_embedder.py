@@ -0,0 +1,113 @@
+"""Encode throughput of fixed-size batches versus token-budget batching.
+
+Embeds synthetic corpora with the configured local model: short texts like
+Hacker News titles, long ones like Reddit selftexts, and the two shuffled
+together, as a consumer batch mixing both sources would be. "before" is the
+old _generate_embeddings_sync, local_batch_size texts at a time in arrival
+order; "after" is the current one, which encodes the batches _plan_batches
+builds from length-sorted texts. Both outputs are compared before timings
+are printed.
+
+    python benchmark_local_embedder.py --texts 2048 --runs 3
+    LOCAL_MODEL_NAME=all-mpnet-base-v2 DEVICE=cuda python benchmark_local_embedder.py
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict, List
+
+import torch
+
+from config import Settings
+from embedders.local_embedder import LocalEmbedder
+
+
+WORDS = (
+    "invoice reconciliation spreadsheet customers onboarding churn pricing tool manual export "
+    "workflow accounting startup freelancers clients payments reminders dashboard integration "
+    "scheduling inventory team automate tracking reports hours week small business support"
+).split()
+
+
+def make_corpora(count: int, seed: int) -> Dict[str, List[str]]:
+    rng = random.Random(seed)
+    
+    def sentence(words: int) -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+    
+    short = [f"Show HN: {sentence(rng.randint(5, 14))}" for _ in range(count)]
+    long = [" ".join(sentence(rng.randint(8, 20)) for _ in range(rng.randint(10, 40))) for _ in range(count)]
+    mixed = rng.sample(short, count // 2) + rng.sample(long, count - count // 2)
+    rng.shuffle(mixed)
+    return {"short (HN titles)": short, "long (Reddit selftexts)": long, "mixed": mixed}
+
+
+def encode_fixed_batches(embedder: LocalEmbedder, texts: List[str]) -> torch.Tensor:
+    """The previous _generate_embeddings_sync."""
+    batch_size = embedder.settings.local_batch_size
+    all_embeddings = []
+    
+    for i in range(0, len(texts), batch_size):
+        with torch.no_grad():
+            batch_embeddings = embedder.model.encode(
+                texts[i:i + batch_size],
+                convert_to_tensor=True,
+                device=embedder.device,
+                show_progress_bar=False
+            )
+        all_embeddings.append(batch_embeddings.cpu())
+    
+    return torch.cat(all_embeddings, dim=0)
+
+
+def texts_per_second(encode, texts: List[str], runs: int) -> tuple:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        embeddings = encode(texts)
+        timings.append(time.perf_counter() - start)
+    return len(texts) / sorted(timings)[len(timings) // 2], embeddings
+
+
+async def run(args):
+    embedder = LocalEmbedder(Settings())
+    await embedder.initialize()
+    
+    try:
+        print(
+            f"\n{embedder.model_name} on {embedder.device}, local_batch_size={embedder.settings.local_batch_size} "
+            f"local_max_tokens_per_batch={embedder.settings.local_max_tokens_per_batch}"
+        )
+        print(f"{'corpus':<24} {'batches':>8} {'before texts/s':>15} {'after texts/s':>14} {'speedup':>8} {'min cos':>8}")
+        
+        for name, texts in make_corpora(args.texts, args.seed).items():
+            # Warm up both paths so model loading and allocator growth are not timed
+            encode_fixed_batches(embedder, texts[:64])
+            embedder._generate_embeddings_sync(texts[:64])
+            
+            before, fixed = texts_per_second(lambda t: encode_fixed_batches(embedder, t), texts, args.runs)
+            after, planned = texts_per_second(embedder._generate_embeddings_sync, texts, args.runs)
+            agreement = torch.nn.functional.cosine_similarity(fixed, planned, dim=1).min().item()
+            
+            print(
+                f"{name:<24} {len(embedder._plan_batches(texts)):>8} {before:>15.0f} {after:>14.0f} "
+                f"{after / before:>7.2f}x {agreement:>8.4f}"
+            )
+    finally:
+        await embedder.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=1024, help="Texts per corpus")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Write throughput of per-row INSERTs versus the binary COPY batch path.
+
+For each batch size, loads the same synthetic vectors into
+opportunity_embeddings twice: "before" is the old store_embedding path, one
+INSERT ... ON CONFLICT with the vector passed as a float list and one commit
+per row; "after" is _store_embeddings_batch_sync, which streams the batch
+into a staging table with binary COPY and upserts it in one transaction.
+
+With --compare-storage it then recreates the table as vector(1536) and as
+halfvec(1536), loads the same --compare-rows vectors through the COPY path
+into each, and reports the insert rate and the heap, index and total size.
+
+The table is truncated before every run and dropped by --compare-storage,
+so point DATABASE_URL at a scratch database:
+
+    DATABASE_URL=postgresql://.../write_bench python benchmark_pgvector_write.py
+    python benchmark_pgvector_write.py --rows 8192 --batch-sizes 32 256 2048
+    python benchmark_pgvector_write.py --batch-sizes 2048 --compare-storage
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from typing import Dict, List
+
+import numpy as np
+import psycopg2
+
+from config import Settings
+from storage.pgvector_store import PgVectorStore
+
+
+DIM = 1536  # opportunity_embeddings.embedding is fixed at 1536 dimensions
+
+
+def make_rows(rng: np.random.Generator, count: int) -> tuple:
+    """Unit-length vectors with ids and payloads shaped like the consumer's."""
+    vectors = rng.standard_normal((count, DIM), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    ids = [str(uuid.uuid4()) for _ in range(count)]
+    payloads = [
+        {
+            "title": f"Looking for a tool that reconciles invoices across three accounting systems #{i}",
+            "source_type": "reddit",
+            "score": i % 500,
+        }
+        for i in range(count)
+    ]
+    return ids, vectors, payloads
+
+
+def truncate(store: PgVectorStore):
+    with store._connection() as connection, connection.cursor() as cursor:
+        cursor.execute("TRUNCATE opportunity_embeddings")
+        connection.commit()
+
+
+def insert_per_row(store: PgVectorStore, ids: List[str], vectors: np.ndarray, payloads: List[Dict]):
+    """The previous _store_embedding_sync, called once per vector."""
+    with store._connection() as connection:
+        for vector_id, vector, payload in zip(ids, vectors, payloads):
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO opportunity_embeddings (id, embedding, payload)
+                    VALUES (%s, %s, %s)
+                    ON CONFLICT (id) DO UPDATE SET
+                        embedding = EXCLUDED.embedding,
+                        payload = EXCLUDED.payload,
+                        created_at = NOW()
+                """, (vector_id, vector.tolist(), json.dumps(payload)))
+                connection.commit()
+
+
+def insert_with_copy(store: PgVectorStore, ids: List[str], vectors: np.ndarray, payloads: List[Dict]):
+    if not store._store_embeddings_batch_sync(ids, vectors, payloads):
+        raise RuntimeError(f"Failed to store a batch of {len(ids)} embeddings")
+
+
+def rows_per_second(store: PgVectorStore, write, rows: tuple, batch_size: int) -> float:
+    """Write all rows in batch_size slices into an empty table."""
+    ids, vectors, payloads = rows
+    truncate(store)
+    start = time.perf_counter()
+    for offset in range(0, len(ids), batch_size):
+        end = offset + batch_size
+        write(store, ids[offset:end], vectors[offset:end], payloads[offset:end])
+    return len(ids) / (time.perf_counter() - start)
+
+
+def drop_table(settings: Settings):
+    connection = psycopg2.connect(settings.database_url)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS opportunity_embeddings")
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def relation_sizes(store: PgVectorStore) -> Dict[str, int]:
+    with store._connection() as connection, connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT pg_table_size('opportunity_embeddings') AS table_bytes,
+                   pg_relation_size('opportunity_embeddings_embedding_idx') AS index_bytes,
+                   pg_total_relation_size('opportunity_embeddings') AS total_bytes
+        """)
+        return dict(cursor.fetchone())
+
+
+async def compare_storage_types(args):
+    """Load the same vectors into a fresh vector and a fresh halfvec table."""
+    rows = make_rows(np.random.default_rng([args.seed, 1]), args.compare_rows)
+    batch_size = max(args.batch_sizes)
+    results = {}
+    
+    for storage_type in ("vector", "halfvec"):
+        settings = Settings(pgvector_storage_type=storage_type)
+        drop_table(settings)
+        store = PgVectorStore(settings)
+        await store.initialize()
+        try:
+            rate = rows_per_second(store, insert_with_copy, rows, batch_size)
+            results[storage_type] = {"rate": rate, **relation_sizes(store)}
+        finally:
+            await store.close()
+    drop_table(settings)
+    
+    print(f"\nstorage type, {args.compare_rows} rows in batches of {batch_size}")
+    print(f"{'type':>8} {'rows/s':>8} {'table MB':>9} {'index MB':>9} {'total MB':>9}")
+    for storage_type, result in results.items():
+        print(
+            f"{storage_type:>8} {result['rate']:>8.0f} {result['table_bytes'] / 2 ** 20:>9.1f} "
+            f"{result['index_bytes'] / 2 ** 20:>9.1f} {result['total_bytes'] / 2 ** 20:>9.1f}"
+        )
+    vector, halfvec = results["vector"], results["halfvec"]
+    print(
+        f"halfvec: {halfvec['total_bytes'] / vector['total_bytes']:.2f}x the size, "
+        f"{halfvec['rate'] / vector['rate']:.2f}x the insert rate"
+    )
+
+
+async def run(args):
+    store = PgVectorStore(Settings(pgvector_storage_type=args.storage_type))
+    await store.initialize()
+    rows = make_rows(np.random.default_rng(args.seed), args.rows)
+    
+    try:
+        print(f"\n{store.storage_type} {store.index_type} rows={args.rows}")
+        print(f"{'batch':>6} {'per-row rows/s':>15} {'COPY rows/s':>12} {'speedup':>8}")
+        for batch_size in args.batch_sizes:
+            before = rows_per_second(store, insert_per_row, rows, batch_size)
+            after = rows_per_second(store, insert_with_copy, rows, batch_size)
+            print(f"{batch_size:>6} {before:>15.0f} {after:>12.0f} {after / before:>7.1f}x")
+        truncate(store)
+    finally:
+        await store.close()
+    
+    if args.compare_storage:
+        await compare_storage_types(args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=4096, help="Rows written per run")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32, 256, 2048])
+    parser.add_argument("--storage-type", choices=["vector", "halfvec"], default="vector",
+                        help="Column type when the table is created; an existing table keeps its own")
+    parser.add_argument("--compare-storage", action="store_true",
+                        help="Also compare vector and halfvec tables (drops opportunity_embeddings)")
+    parser.add_argument("--compare-rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
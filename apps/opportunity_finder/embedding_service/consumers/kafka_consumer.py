@@ -2,17 +2,52 @@
 
 import json
 import asyncio
-from typing import Dict, Any, List
-from kafka import KafkaConsumer as Consumer
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Dict, Any, List, Deque, Optional
+import numpy as np
+from kafka import KafkaConsumer as Consumer, KafkaProducer as Producer
+from kafka.consumer.fetcher import ConsumerRecord
+from kafka.structs import OffsetAndMetadata, TopicPartition
 from loguru import logger
 
 from config import Settings
 from embedders.embedding_manager import EmbeddingManager
 from storage.vector_store import VectorStore
+from .pipeline import PipelineStage
+
+
+class _PendingBatch:
+    """One polled batch as it moves through the pipeline stages."""
+    
+    __slots__ = ('offsets', 'values', 'items', 'texts', 'embeddings', 'done')
+    
+    def __init__(self, records: List[ConsumerRecord]):
+        self.offsets: Dict[TopicPartition, int] = {}
+        for record in records:
+            tp = TopicPartition(record.topic, record.partition)
+            self.offsets[tp] = max(self.offsets.get(tp, -1), record.offset + 1)
+        self.values: List[Dict[str, Any]] = [record.value for record in records]
+        self.items: List[Dict[str, Any]] = []
+        self.texts: List[str] = []
+        self.embeddings: Optional[np.ndarray] = None
+        self.done = False
 
 
 class EmbeddingKafkaConsumer:
-    """Handles consuming clean items from Kafka and generating embeddings."""
+    """Handles consuming clean items from Kafka and generating embeddings.
+    
+    Batches flow through poll -> dedupe -> embed -> store stages connected by
+    bounded asyncio queues, so batch N+1 is embedded while batch N is being
+    written. Batches close when they reach ``batch_size`` records or
+    ``batch_max_wait_ms`` after their first record, and offsets are committed
+    manually, in poll order, only after the vector store acknowledges each
+    batch. A batch that fails ``pipeline_max_retries`` times in one stage is
+    published to ``kafka_topic_dead_letter`` and committed, so one bad batch
+    cannot hold back every later offset.
+    """
     
     def __init__(self, settings: Settings, embedding_manager: EmbeddingManager, vector_store: VectorStore):
         self.settings = settings
@@ -24,118 +59,318 @@ class EmbeddingKafkaConsumer:
             group_id=settings.kafka_consumer_group,
             value_deserializer=lambda m: json.loads(m.decode('utf-8')),
             auto_offset_reset='latest',
-            enable_auto_commit=True,
+            enable_auto_commit=False,
             max_poll_records=settings.batch_size
         )
+        # kafka-python consumers are not thread-safe, so every blocking call
+        # (poll, commit, close) goes through this single thread.
+        self._kafka_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kafka-consumer")
+        self.dead_letter_producer = None
+        if settings.kafka_topic_dead_letter:
+            self.dead_letter_producer = Producer(
+                bootstrap_servers=settings.kafka_bootstrap_servers.split(','),
+                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
+                key_serializer=lambda k: k.encode('utf-8') if k else None,
+                acks='all'
+            )
+        self._pending: Deque[_PendingBatch] = deque()
+        self.stages: List[PipelineStage] = []
         self.running = False
         logger.info(f"Embedding Kafka consumer initialized for topic: {settings.kafka_topic_clean_items}")
     
+    def _build_pipeline(self) -> asyncio.Queue:
+        """Create the dedupe, embed and store stages; return the first queue."""
+        queue_size = self.settings.pipeline_queue_size
+        dedupe_queue = asyncio.Queue(maxsize=queue_size)
+        embed_queue = asyncio.Queue(maxsize=queue_size)
+        store_queue = asyncio.Queue(maxsize=queue_size)
+        
+        self.stages = [
+            PipelineStage("dedupe", self._dedupe_stage, dedupe_queue, embed_queue,
+                          self.settings.pipeline_dedupe_concurrency,
+                          item_count=lambda batch: len(batch.values),
+                          on_error=partial(self._stage_failed, "dedupe")),
+            PipelineStage("embed", self._embed_stage, embed_queue, store_queue,
+                          self.settings.pipeline_embed_concurrency,
+                          item_count=lambda batch: len(batch.texts),
+                          on_error=partial(self._stage_failed, "embed")),
+            PipelineStage("store", self._store_stage, store_queue, None,
+                          self.settings.pipeline_store_concurrency,
+                          item_count=lambda batch: len(batch.items),
+                          on_error=partial(self._stage_failed, "store")),
+        ]
+        return dedupe_queue
+    
     async def start_consuming(self):
         """Start consuming messages from Kafka."""
         self.running = True
         logger.info("Starting Kafka message consumption for embeddings")
         
-        # Run consumer in executor to avoid blocking
-        loop = asyncio.get_event_loop()
+        poll_queue = self._build_pipeline()
+        for stage in self.stages:
+            stage.start()
+        stats_task = asyncio.create_task(self._log_stats_periodically())
         
         try:
-            await loop.run_in_executor(None, self._consume_messages)
+            while self.running:
+                records = await self._collect_batch()
+                if not records:
+                    continue
+                
+                batch = _PendingBatch(records)
+                self._pending.append(batch)
+                # Blocks while downstream stages are saturated (backpressure)
+                await poll_queue.put(batch)
+        
         except Exception as e:
             logger.error(f"Error in embedding Kafka consumer: {e}")
         finally:
-            self.stop()
+            self.running = False
+            # Drain stages in order so every queued batch reaches the store
+            for stage in self.stages:
+                await stage.stop()
+            stats_task.cancel()
+            logger.info(f"Embedding pipeline stats: {self.get_pipeline_stats()}")
+            await self._run_kafka(self.consumer.close)
+            if self.dead_letter_producer is not None:
+                self.dead_letter_producer.close()
+            self._kafka_executor.shutdown(wait=False)
+            logger.info("Embedding Kafka consumer stopped")
+    
+    async def _run_kafka(self, func, *args, **kwargs):
+        """Run a blocking kafka-python call on the consumer thread."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._kafka_executor, partial(func, *args, **kwargs))
     
-    def _consume_messages(self):
-        """Consume messages in a blocking manner."""
-        batch = []
+    async def _collect_batch(self) -> List[ConsumerRecord]:
+        """Poll until the batch is full or the wait window after its first record expires."""
+        loop = asyncio.get_event_loop()
+        max_wait = self.settings.batch_max_wait_ms / 1000
+        deadline = None
+        records: List[ConsumerRecord] = []
         
-        for message in self.consumer:
-            if not self.running:
+        while self.running and len(records) < self.settings.batch_size:
+            timeout = max_wait if deadline is None else deadline - loop.time()
+            if timeout <= 0:
                 break
             
-            try:
-                # Add message to batch
-                batch.append(message.value)
-                
-                # Process batch when it reaches target size
-                if len(batch) >= self.settings.batch_size:
-                    asyncio.run(self._process_batch(batch))
-                    batch = []
-                    
-            except Exception as e:
-                logger.error(f"Error processing embedding message: {e}")
+            polled = await self._run_kafka(
+                self.consumer.poll,
+                timeout_ms=int(timeout * 1000),
+                max_records=self.settings.batch_size - len(records)
+            )
+            
+            for partition_records in polled.values():
+                records.extend(partition_records)
+            
+            if records and deadline is None:
+                deadline = loop.time() + max_wait
+            elif not records:
+                # Idle topic: hand control back so shutdown is noticed
+                break
+        
+        return records
+    
+    async def _dedupe_stage(self, batch: _PendingBatch) -> Optional[_PendingBatch]:
+        """Select embeddable items, keeping the last copy of each repeated id.
+        
+        Items the processing service marked as near-duplicates of an earlier
+        item are skipped; the original already carries their embedding.
+        """
+        latest: Dict[Any, Dict[str, Any]] = {}
+        
+        for item in batch.values:
+            if item.get('duplicate_of'):
                 continue
+            text = item.get('cleaned_text', '')
+            if text and len(text.strip()) > 10:  # Skip very short texts
+                latest.pop(item.get('id'), None)
+                latest[item.get('id')] = item
+        
+        batch.items = list(latest.values())
+        # Truncate if too long
+        batch.texts = [item['cleaned_text'][:self.settings.max_text_length] for item in batch.items]
+        
+        if not batch.texts:
+            logger.debug("No valid texts found in batch")
+            await self._mark_done(batch)
+            return None
         
-        # Process remaining items in batch
-        if batch:
-            asyncio.run(self._process_batch(batch))
+        return batch
     
-    async def _process_batch(self, batch: List[Dict[str, Any]]):
-        """Process a batch of clean items for embedding generation."""
-        logger.debug(f"Processing embedding batch of {len(batch)} items")
+    async def _embed_stage(self, batch: _PendingBatch) -> Optional[_PendingBatch]:
+        """Generate embeddings for a batch, retrying up to pipeline_max_retries times."""
+        attempt = 0
         
-        try:
-            # Extract texts for embedding
-            texts = []
-            items_metadata = []
-            
-            for item in batch:
-                text = item.get('cleaned_text', '')
-                if text and len(text.strip()) > 10:  # Skip very short texts
-                    # Truncate if too long
-                    if len(text) > self.settings.max_text_length:
-                        text = text[:self.settings.max_text_length]
-                    
-                    texts.append(text)
-                    items_metadata.append(item)
-            
-            if not texts:
-                logger.debug("No valid texts found in batch")
-                return
-            
-            # Generate embeddings
-            embeddings = await self.embedding_manager.generate_embeddings(texts)
-            
-            if len(embeddings) != len(texts):
-                logger.error(f"Embedding count mismatch: {len(embeddings)} vs {len(texts)}")
-                return
-            
-            # Store embeddings with metadata
-            await self._store_embeddings(items_metadata, embeddings)
-            
-            logger.info(f"Successfully processed {len(embeddings)} embeddings")
+        while True:
+            try:
+                embeddings = await self.embedding_manager.generate_embeddings(batch.texts)
+                if len(embeddings) == len(batch.texts):
+                    batch.embeddings = embeddings
+                    return batch
+                error = f"Embedding count mismatch: {len(embeddings)} vs {len(batch.texts)}"
+            except Exception as e:
+                error = f"Error generating embeddings for batch: {e}"
+            logger.error(error)
             
-        except Exception as e:
-            logger.error(f"Error processing embedding batch: {e}")
+            attempt += 1
+            if not await self._backoff(batch, attempt, "embed", error):
+                return None
+    
+    async def _store_stage(self, batch: _PendingBatch) -> None:
+        """Store a batch, retrying up to pipeline_max_retries times."""
+        attempt = 0
+        
+        while not await self._store_embeddings(batch.items, batch.embeddings):
+            attempt += 1
+            if not await self._backoff(batch, attempt, "store", "Vector store rejected the batch"):
+                return None
+        
+        logger.info(f"Successfully processed {len(batch.embeddings)} embeddings")
+        logger.debug(f"Embedding cache stats: {self.embedding_manager.get_cache_stats()}")
+        await self._mark_done(batch)
+        return None
+    
+    async def _backoff(self, batch: _PendingBatch, attempt: int, stage: str, error: str) -> bool:
+        """Sleep before a retry; return False if the batch should not be retried.
+        
+        On shutdown the batch is left uncommitted to be redelivered; once its
+        retries are exhausted it is dead-lettered and committed.
+        """
+        if not self.running:
+            logger.warning(f"Leaving batch of {len(batch.items)} items uncommitted on shutdown")
+            return False
+        
+        if attempt > self.settings.pipeline_max_retries:
+            await self._dead_letter(batch, stage, f"{self.settings.pipeline_max_retries} retries exhausted: {error}")
+            return False
+        
+        wait_time = min(self.settings.pipeline_retry_max_backoff_seconds, 2 ** attempt)
+        logger.warning(f"Embedding batch failed in {stage}, retrying in {wait_time}s (attempt {attempt})")
+        await asyncio.sleep(wait_time)
+        return True
+    
+    async def _stage_failed(self, stage: str, batch: _PendingBatch, error: Exception):
+        """Dead-letter a batch whose stage handler raised, so it cannot block later commits."""
+        if not batch.done:
+            await self._dead_letter(batch, stage, f"Unhandled error: {error!r}")
     
-    async def _store_embeddings(self, items_metadata: List[Dict[str, Any]], embeddings: List[List[float]]):
-        """Store embeddings in vector store."""
-        for item, embedding in zip(items_metadata, embeddings):
+    async def _dead_letter(self, batch: _PendingBatch, stage: str, error: str):
+        """Publish a batch that cannot be processed to the dead-letter topic, then commit past it.
+        
+        The selected items are published when the dedupe stage got that far,
+        otherwise the raw message values are.
+        """
+        records = batch.items or batch.values
+        record_ids = [record.get('id') if isinstance(record, dict) else None for record in records]
+        logger.error(
+            f"Giving up on batch of {len(records)} items in {stage}: {error}; item ids: {record_ids}"
+        )
+        
+        if self.dead_letter_producer is not None:
             try:
-                # Prepare vector store payload
-                payload = {
-                    'id': item.get('id'),
-                    'source_type': item.get('source_type'),
-                    'cleaned_text': item.get('cleaned_text', ''),
-                    'entities': item.get('entities', {}),
-                    'keywords': item.get('keywords', []),
-                    'processed_at': item.get('processed_at'),
-                    'original_data': item.get('original_data', {})
-                }
-                
-                # Store in vector store
-                await self.vector_store.store_embedding(
-                    vector_id=item.get('id'),
-                    embedding=embedding,
-                    payload=payload
+                loop = asyncio.get_event_loop()
+                await loop.run_in_executor(
+                    None, self._publish_dead_letter_sync, records, record_ids, stage, error
                 )
-                
             except Exception as e:
-                logger.error(f"Error storing embedding for item {item.get('id')}: {e}")
+                # The ids are in the log above, so commit anyway rather than stall the partition
+                logger.error(f"Error publishing batch to {self.settings.kafka_topic_dead_letter}: {e}")
+        
+        await self._mark_done(batch)
+    
+    def _publish_dead_letter_sync(self, records: List[Any], record_ids: List[Any], stage: str, error: str):
+        """Send failed records to the dead-letter topic and wait for the broker."""
+        failed_at = datetime.utcnow().isoformat()
+        futures = [
+            self.dead_letter_producer.send(
+                self.settings.kafka_topic_dead_letter,
+                key=str(record_id) if record_id is not None else None,
+                value={'stage': stage, 'error': error, 'failed_at': failed_at, 'item': record}
+            )
+            for record, record_id in zip(records, record_ids)
+        ]
+        self.dead_letter_producer.flush(timeout=30)
+        for future in futures:
+            future.get(timeout=0)
+    
+    async def _mark_done(self, batch: _PendingBatch):
+        """Mark a batch as acknowledged and commit whatever is now contiguous."""
+        batch.done = True
+        await self._commit_completed()
+    
+    async def _commit_completed(self):
+        """Commit offsets for the leading run of acknowledged batches."""
+        offsets: Dict[TopicPartition, int] = {}
+        
+        while self._pending and self._pending[0].done:
+            offsets.update(self._pending.popleft().offsets)
+        
+        if not offsets:
+            return
+        
+        try:
+            await self._run_kafka(
+                self.consumer.commit,
+                {tp: OffsetAndMetadata(offset, None) for tp, offset in offsets.items()}
+            )
+        except Exception as e:
+            logger.error(f"Error committing embedding consumer offsets: {e}")
+    
+    def get_pipeline_stats(self) -> Dict[str, Any]:
+        """Get per-stage queue depth and latency metrics."""
+        return {
+            'uncommitted_batches': len(self._pending),
+            'stages': {stage.name: stage.stats() for stage in self.stages},
+            'embedding_requests': self.embedding_manager.get_request_stats(),
+        }
+    
+    async def _log_stats_periodically(self):
+        """Log a pipeline summary every pipeline_stats_interval_seconds."""
+        while True:
+            await asyncio.sleep(self.settings.pipeline_stats_interval_seconds)
+            stats = self.get_pipeline_stats()
+            summary = ", ".join(
+                f"{name}: depth={s['queue_depth']} p50={s['latency_p50']:.3f}s p95={s['latency_p95']:.3f}s"
+                for name, s in stats['stages'].items()
+            )
+            logger.info(f"Embedding pipeline: {summary}, uncommitted={stats['uncommitted_batches']}")
+            for provider, s in stats['embedding_requests'].items():
+                if s:
+                    logger.info(
+                        f"Embedding requests ({provider}): p50={s['latency_p50']:.3f}s p95={s['latency_p95']:.3f}s "
+                        f"in_flight={s['in_flight']} retries={s['retries']} rate_limited={s['rate_limited']}"
+                    )
+    
+    async def _store_embeddings(self, items_metadata: List[Dict[str, Any]], embeddings: np.ndarray) -> bool:
+        """Store embeddings in vector store as a single batch write."""
+        vector_ids = []
+        payloads = []
+        
+        for item in items_metadata:
+            # Prepare vector store payload
+            vector_ids.append(item.get('id'))
+            payloads.append({
+                'id': item.get('id'),
+                'source_type': item.get('source_type'),
+                'cleaned_text': item.get('cleaned_text', ''),
+                'entities': item.get('entities', {}),
+                'keywords': item.get('keywords', []),
+                'processed_at': item.get('processed_at'),
+                'original_data': item.get('original_data', {})
+            })
+        
+        stored = await self.vector_store.store_embeddings_batch(
+            vector_ids=vector_ids,
+            embeddings=embeddings,
+            payloads=payloads
+        )
+        
+        if not stored:
+            logger.error(f"Error storing embedding batch of {len(vector_ids)} items")
+        
+        return stored
     
     def stop(self):
-        """Stop consuming messages."""
+        """Stop consuming messages; queued batches are drained before close."""
         self.running = False
-        if self.consumer:
-            self.consumer.close()
-            logger.info("Embedding Kafka consumer stopped")
\ No newline at end of file
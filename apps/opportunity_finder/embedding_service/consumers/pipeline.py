@@ -0,0 +1,82 @@
+"""Bounded-queue stage runner used by the embedding consumer pipeline."""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from loguru import logger
+
+from metrics import StageMetrics
+
+
+class PipelineStage:
+    """A pool of workers reading from one bounded queue and feeding the next.
+    
+    The handler returns the object to pass downstream, or None to drop it.
+    If it raises, the batch goes to ``on_error`` instead. A ``None`` read
+    from the input queue tells a worker to exit.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Optional[Any]]],
+        input_queue: asyncio.Queue,
+        output_queue: Optional[asyncio.Queue],
+        concurrency: int,
+        item_count: Callable[[Any], int] = lambda batch: 1,
+        on_error: Optional[Callable[[Any, Exception], Awaitable[None]]] = None
+    ):
+        self.name = name
+        self.handler = handler
+        self.input_queue = input_queue
+        self.output_queue = output_queue
+        self.concurrency = max(1, concurrency)
+        self.item_count = item_count
+        self.on_error = on_error
+        self.metrics = StageMetrics(name)
+        self.workers: List[asyncio.Task] = []
+    
+    def start(self):
+        """Start the stage workers."""
+        self.workers = [
+            asyncio.create_task(self._worker(), name=f"{self.name}-{i}")
+            for i in range(self.concurrency)
+        ]
+    
+    async def stop(self):
+        """Let workers finish queued work, then wait for them to exit."""
+        for _ in self.workers:
+            await self.input_queue.put(None)
+        await asyncio.gather(*self.workers, return_exceptions=True)
+    
+    async def _worker(self):
+        """Process batches until a stop sentinel arrives."""
+        while True:
+            batch = await self.input_queue.get()
+            if batch is None:
+                return
+            
+            start = time.perf_counter()
+            try:
+                result = await self.handler(batch)
+            except Exception as e:
+                logger.error(f"Unhandled error in {self.name} stage: {e!r}")
+                result = None
+                if self.on_error is not None:
+                    try:
+                        await self.on_error(batch, e)
+                    except Exception as callback_error:
+                        logger.error(f"Error callback of {self.name} stage failed: {callback_error!r}")
+            self.metrics.observe(time.perf_counter() - start, self.item_count(batch))
+            
+            if result is not None and self.output_queue is not None:
+                await self.output_queue.put(result)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and latency metrics for this stage."""
+        return {
+            'queue_depth': self.input_queue.qsize(),
+            'queue_capacity': self.input_queue.maxsize,
+            'concurrency': self.concurrency,
+            **self.metrics.snapshot(),
+        }
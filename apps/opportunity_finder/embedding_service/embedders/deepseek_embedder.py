@@ -1,102 +1,87 @@
 """DeepSeek embedding provider."""
 
-import asyncio
-from typing import List
+from typing import List, Dict, Any
+import numpy as np
 import openai
-from asyncio_throttle import Throttler
 from loguru import logger
 
 from config import Settings
+from .request_fanout import RequestFanout, acquire_http_client, release_http_client
 
 
 class DeepSeekEmbedder:
-    """DeepSeek embedding provider with rate limiting and error handling."""
+    """DeepSeek embedding provider with rate limiting and error handling.
+    
+    Sub-batches are sent concurrently through a RequestFanout over a shared
+    keep-alive HTTP client.
+    """
+    
+    provider_name = "deepseek"
     
     def __init__(self, settings: Settings):
         self.settings = settings
+        self.model_name = settings.deepseek_model
         self.client = None
-        self.throttler = None
+        self.fanout = None
         
     async def initialize(self):
         """Initialize DeepSeek client and rate limiter."""
         if not self.settings.deepseek_api_key:
             raise ValueError("DeepSeek API key is required")
         
-        # DeepSeek uses OpenAI-compatible API
+        # DeepSeek uses OpenAI-compatible API; retries are handled by the fan-out
         self.client = openai.AsyncOpenAI(
             api_key=self.settings.deepseek_api_key,
             base_url="https://api.deepseek.com/v1",  # DeepSeek API base URL
-            timeout=self.settings.deepseek_timeout or 30
+            timeout=self.settings.deepseek_timeout or 30,
+            max_retries=0,
+            http_client=acquire_http_client(self.settings)
         )
         
-        # Create rate limiter (DeepSeek may have different limits)
-        rate_per_second = (self.settings.deepseek_requests_per_minute or 60) / 60
-        self.throttler = Throttler(rate_limit=rate_per_second)
+        # DeepSeek may have different limits
+        self.fanout = RequestFanout(
+            provider=self.provider_name,
+            max_concurrency=self.settings.deepseek_max_concurrency,
+            requests_per_minute=self.settings.deepseek_requests_per_minute or 60,
+            tokens_per_minute=self.settings.deepseek_tokens_per_minute,
+            max_retries=self.settings.deepseek_max_retries or 3,
+            max_backoff=self.settings.retry_max_backoff_seconds
+        )
         
         logger.info(f"DeepSeek embedder initialized with model: {self.settings.deepseek_model}")
     
-    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    async def generate_embeddings(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings using DeepSeek API.
         
         Args:
             texts: List of text strings to embed
             
         Returns:
-            List of embedding vectors
+            float32 array of shape (len(texts), dim)
         """
         if not texts:
-            return []
+            return np.empty((0, self.get_embedding_dimension()), dtype=np.float32)
         
-        embeddings = []
-        
-        # Process in batches to respect rate limits
+        # Split into request-sized sub-batches and send them concurrently
         batch_size = self.settings.deepseek_batch_size or 20
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        embeddings = await self.fanout.map(batches, self._generate_batch_embeddings)
         
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            batch_embeddings = await self._generate_batch_embeddings(batch)
-            embeddings.extend(batch_embeddings)
-        
-        return embeddings
+        return np.concatenate(embeddings, axis=0)
     
-    async def _generate_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for a batch of texts."""
-        retries = 0
-        max_retries = self.settings.deepseek_max_retries or 3
+    async def _generate_batch_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings for a batch of texts with a single API request.
         
-        while retries <= max_retries:
-            try:
-                # Apply rate limiting
-                async with self.throttler:
-                    response = await self.client.embeddings.create(
-                        model=self.settings.deepseek_model,
-                        input=texts
-                    )
-                
-                # Extract embeddings
-                embeddings = [item.embedding for item in response.data]
-                return embeddings
-                
-            except openai.RateLimitError as e:
-                retries += 1
-                wait_time = min(60, 2 ** retries)  # Exponential backoff, max 60s
-                logger.warning(f"DeepSeek rate limit hit, waiting {wait_time}s (retry {retries}/{max_retries})")
-                await asyncio.sleep(wait_time)
-                
-            except openai.APIError as e:
-                retries += 1
-                if retries > max_retries:
-                    logger.error(f"DeepSeek API error after {retries} retries: {e}")
-                    raise
-                wait_time = 2 ** retries
-                logger.warning(f"DeepSeek API error, retrying in {wait_time}s: {e}")
-                await asyncio.sleep(wait_time)
-                
-            except Exception as e:
-                logger.error(f"Unexpected error in DeepSeek embedder: {e}")
-                raise
+        Rate limiting and retries are applied by the fan-out around this call.
+        """
+        response = await self.client.embeddings.create(
+            model=self.settings.deepseek_model,
+            input=texts
+        )
         
-        raise Exception(f"Failed to generate embeddings after {max_retries} retries")
+        # Extract embeddings
+        embeddings = np.array([item.embedding for item in response.data], dtype=np.float32)
+        return embeddings
     
     def get_embedding_dimension(self) -> int:
         """Get embedding dimension for the current model."""
@@ -108,8 +93,14 @@ class DeepSeekEmbedder:
         }
         return model_dimensions.get(self.settings.deepseek_model, 1536)
     
+    def get_request_stats(self) -> Dict[str, Any]:
+        """Get request latency histogram and retry counters."""
+        return self.fanout.stats() if self.fanout else {}
+    
     async def cleanup(self):
         """Clean up resources."""
         if self.client:
-            await self.client.close()
+            # The HTTP client is shared, so release it rather than closing this client
+            await release_http_client()
+            self.client = None
         logger.info("DeepSeek embedder cleaned up")
\ No newline at end of file
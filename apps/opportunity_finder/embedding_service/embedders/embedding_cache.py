@@ -0,0 +1,252 @@
+"""Content-hash embedding cache with an in-process LRU and a persistent tier."""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any
+
+import numpy as np
+from loguru import logger
+
+from config import Settings
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache keyed by (provider, model, sha256(text)).
+    
+    The first tier is a bounded in-process LRU. The second tier is either
+    Redis (entries expire after a TTL) or a local SQLite file (least recently
+    used entries are evicted beyond a fixed entry count). Vectors are stored
+    as raw float32 bytes.
+    """
+    
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.backend = settings.embedding_cache_backend
+        self._lru: "OrderedDict[str, bytes]" = OrderedDict()
+        self._redis = None
+        self._disk: Optional[sqlite3.Connection] = None
+        self._disk_lock = threading.Lock()
+        # Upper bound on the SQLite row count; replaced keys are counted again until the next recount
+        self._disk_entries = 0
+        
+        self.stats = {
+            'lookups': 0,
+            'lru_hits': 0,
+            'backend_hits': 0,
+            'misses': 0,
+            'bytes_saved': 0,
+        }
+    
+    async def initialize(self):
+        """Connect the persistent tier."""
+        if self.backend == "redis":
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(self.settings.embedding_cache_redis_url)
+            await self._redis.ping()
+        elif self.backend == "disk":
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, self._open_disk)
+        
+        logger.info(
+            f"Embedding cache initialized (lru_size={self.settings.embedding_cache_lru_size}, "
+            f"backend={self.backend})"
+        )
+    
+    def _open_disk(self):
+        """Open the SQLite cache file and create the table if needed."""
+        directory = os.path.dirname(self.settings.embedding_cache_disk_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._disk = sqlite3.connect(
+            self.settings.embedding_cache_disk_path,
+            check_same_thread=False
+        )
+        self._disk.execute("""
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._disk.execute(
+            "CREATE INDEX IF NOT EXISTS embedding_cache_accessed_idx ON embedding_cache (accessed_at)"
+        )
+        self._disk.commit()
+        self._disk_entries = self._disk.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+    
+    @staticmethod
+    def make_key(provider: str, model: str, text: str) -> str:
+        """Build the cache key for a text embedded by a given provider and model."""
+        normalized = " ".join(text.split())
+        digest = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+        return f"emb:{provider}:{model}:{digest}"
+    
+    async def get_many(self, keys: List[str], texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Look up a batch of keys.
+        
+        Args:
+            keys: Cache keys built with make_key
+            texts: Source texts aligned with keys, used for bytes-saved accounting
+        
+        Returns:
+            Cached vectors aligned with keys, None for misses
+        """
+        results: List[Optional[bytes]] = [None] * len(keys)
+        backend_indices = []
+        
+        for i, key in enumerate(keys):
+            blob = self._lru.get(key)
+            if blob is not None:
+                self._lru.move_to_end(key)
+                results[i] = blob
+                self.stats['lru_hits'] += 1
+            else:
+                backend_indices.append(i)
+        
+        if backend_indices and self.backend != "none":
+            backend_keys = [keys[i] for i in backend_indices]
+            try:
+                blobs = await self._backend_get_many(backend_keys)
+            except Exception as e:
+                logger.warning(f"Embedding cache backend lookup failed: {e}")
+                blobs = [None] * len(backend_keys)
+            
+            for i, blob in zip(backend_indices, blobs):
+                if blob is not None:
+                    results[i] = blob
+                    self._lru_put(keys[i], blob)
+                    self.stats['backend_hits'] += 1
+        
+        vectors: List[Optional[np.ndarray]] = []
+        for text, blob in zip(texts, results):
+            if blob is None:
+                self.stats['misses'] += 1
+                vectors.append(None)
+            else:
+                self.stats['bytes_saved'] += len(text.encode('utf-8'))
+                vectors.append(np.frombuffer(blob, dtype=np.float32))
+        
+        self.stats['lookups'] += len(keys)
+        return vectors
+    
+    async def put_many(self, keys: List[str], vectors: np.ndarray):
+        """Store a batch of freshly generated vectors in both tiers."""
+        blobs = [row.tobytes() for row in np.asarray(vectors, dtype=np.float32)]
+        
+        for key, blob in zip(keys, blobs):
+            self._lru_put(key, blob)
+        
+        if self.backend != "none" and keys:
+            try:
+                await self._backend_put_many(keys, blobs)
+            except Exception as e:
+                logger.warning(f"Embedding cache backend write failed: {e}")
+    
+    def _lru_put(self, key: str, blob: bytes):
+        """Insert into the LRU tier, evicting the oldest entries."""
+        self._lru[key] = blob
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.settings.embedding_cache_lru_size:
+            self._lru.popitem(last=False)
+    
+    async def _backend_get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Fetch keys from the persistent tier."""
+        if self.backend == "redis":
+            return await self._redis.mget(keys)
+        
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._disk_get_many, keys)
+    
+    async def _backend_put_many(self, keys: List[str], blobs: List[bytes]):
+        """Write keys to the persistent tier."""
+        if self.backend == "redis":
+            ttl = self.settings.embedding_cache_ttl_seconds
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key, blob in zip(keys, blobs):
+                    pipe.set(key, blob, ex=ttl)
+                await pipe.execute()
+            return
+        
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self._disk_put_many, keys, blobs)
+    
+    def _disk_get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Fetch keys from SQLite and refresh their access time."""
+        with self._disk_lock:
+            placeholders = ",".join("?" * len(keys))
+            rows = self._disk.execute(
+                f"SELECT key, vector FROM embedding_cache WHERE key IN ({placeholders})",
+                keys
+            ).fetchall()
+            found = dict(rows)
+            
+            if found:
+                now = time.time()
+                self._disk.executemany(
+                    "UPDATE embedding_cache SET accessed_at = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._disk.commit()
+        
+        return [found.get(key) for key in keys]
+    
+    def _disk_put_many(self, keys: List[str], blobs: List[bytes]):
+        """Write keys to SQLite, evicting least recently used entries past the limit.
+        
+        Eviction only runs once the cache holds more than
+        ``embedding_cache_disk_max_entries`` and then trims it to
+        ``embedding_cache_disk_low_water_entries``, so most writes skip it.
+        """
+        with self._disk_lock:
+            now = time.time()
+            self._disk.executemany(
+                "INSERT OR REPLACE INTO embedding_cache (key, vector, accessed_at) VALUES (?, ?, ?)",
+                [(key, blob, now) for key, blob in zip(keys, blobs)]
+            )
+            self._disk_entries += len(keys)
+            
+            if self._disk_entries > self.settings.embedding_cache_disk_max_entries:
+                self._disk_entries = self._disk.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+            
+            if self._disk_entries > self.settings.embedding_cache_disk_max_entries:
+                low_water = min(
+                    self.settings.embedding_cache_disk_low_water_entries,
+                    self.settings.embedding_cache_disk_max_entries
+                )
+                self._disk.execute("""
+                    DELETE FROM embedding_cache WHERE key IN (
+                        SELECT key FROM embedding_cache
+                        ORDER BY accessed_at DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                """, (low_water,))
+                logger.debug(f"Evicted {self._disk_entries - low_water} entries from the disk embedding cache")
+                self._disk_entries = low_water
+            
+            self._disk.commit()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the overall hit rate."""
+        hits = self.stats['lru_hits'] + self.stats['backend_hits']
+        lookups = self.stats['lookups']
+        return {
+            **self.stats,
+            'hits': hits,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'lru_entries': len(self._lru),
+        }
+    
+    async def close(self):
+        """Close the persistent tier."""
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
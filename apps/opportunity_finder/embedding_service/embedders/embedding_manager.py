@@ -1,13 +1,16 @@
 """Embedding manager that coordinates different embedding providers."""
 
 import asyncio
-from typing import List, Union
+from typing import List, Union, Dict, Any
+import numpy as np
 from loguru import logger
 
 from config import Settings
+from .embedding_cache import EmbeddingCache
 from .openai_embedder import OpenAIEmbedder
 from .deepseek_embedder import DeepSeekEmbedder
 from .local_embedder import LocalEmbedder
+from .process_pool_embedder import ProcessPoolEmbedder
 
 
 class EmbeddingManager:
@@ -17,6 +20,7 @@ class EmbeddingManager:
         self.settings = settings
         self.primary_embedder = None
         self.fallback_embedder = None
+        self.cache = EmbeddingCache(settings) if settings.embedding_cache_enabled else None
         
     async def initialize(self):
         """Initialize embedding providers."""
@@ -28,8 +32,11 @@ class EmbeddingManager:
         elif self.settings.embedding_provider == "deepseek":
             self.primary_embedder = DeepSeekEmbedder(self.settings)
             self.fallback_embedder = LocalEmbedder(self.settings)
-        else:  # local
-            self.primary_embedder = LocalEmbedder(self.settings)
+        else:  # local or local_pool
+            if self.settings.embedding_provider == "local_pool":
+                self.primary_embedder = ProcessPoolEmbedder(self.settings)
+            else:
+                self.primary_embedder = LocalEmbedder(self.settings)
             # Try DeepSeek first, then OpenAI as fallback
             if self.settings.deepseek_api_key:
                 self.fallback_embedder = DeepSeekEmbedder(self.settings)
@@ -44,22 +51,29 @@ class EmbeddingManager:
             except Exception as e:
                 logger.warning(f"Fallback embedder initialization failed: {e}")
                 self.fallback_embedder = None
+        
+        if self.cache:
+            try:
+                await self.cache.initialize()
+            except Exception as e:
+                logger.warning(f"Embedding cache backend unavailable, using in-process LRU only: {e}")
+                self.cache.backend = "none"
     
-    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    async def generate_embeddings(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings for a list of texts.
         
         Args:
             texts: List of text strings to embed
             
         Returns:
-            List of embedding vectors
+            Contiguous float32 array of shape (len(texts), dim)
         """
         if not texts:
-            return []
+            return np.empty((0, self.get_embedding_dimension()), dtype=np.float32)
         
         try:
             # Try primary embedder first
-            embeddings = await self.primary_embedder.generate_embeddings(texts)
+            embeddings = await self._generate_with_cache(self.primary_embedder, texts)
             logger.debug(f"Generated {len(embeddings)} embeddings using primary embedder")
             return embeddings
             
@@ -70,7 +84,7 @@ class EmbeddingManager:
             if self.fallback_embedder:
                 try:
                     logger.info("Attempting fallback embedder")
-                    embeddings = await self.fallback_embedder.generate_embeddings(texts)
+                    embeddings = await self._generate_with_cache(self.fallback_embedder, texts)
                     logger.warning(f"Generated {len(embeddings)} embeddings using fallback embedder")
                     return embeddings
                 except Exception as fe:
@@ -79,20 +93,83 @@ class EmbeddingManager:
             # If both fail, raise the original error
             raise e
     
-    async def generate_single_embedding(self, text: str) -> List[float]:
+    async def _generate_with_cache(self, embedder, texts: List[str]) -> np.ndarray:
+        """Generate embeddings with one embedder, sending only cache misses to it.
+        
+        Keys include the embedder's provider and model so vectors from the
+        primary and fallback embedders never mix within a batch.
+        """
+        if not self.cache:
+            return np.ascontiguousarray(await embedder.generate_embeddings(texts), dtype=np.float32)
+        
+        keys = [
+            self.cache.make_key(embedder.provider_name, embedder.model_name, text)
+            for text in texts
+        ]
+        cached = await self.cache.get_many(keys, texts)
+        
+        # Embed each distinct missing key once, even if it repeats in the batch
+        miss_positions: Dict[str, List[int]] = {}
+        for i, (key, embedding) in enumerate(zip(keys, cached)):
+            if embedding is None:
+                miss_positions.setdefault(key, []).append(i)
+        
+        fresh = None
+        if miss_positions:
+            miss_keys = list(miss_positions)
+            miss_texts = [texts[miss_positions[key][0]] for key in miss_keys]
+            fresh = await embedder.generate_embeddings(miss_texts)
+            
+            if len(fresh) != len(miss_texts):
+                raise RuntimeError(f"Embedding count mismatch: {len(fresh)} vs {len(miss_texts)}")
+            
+            await self.cache.put_many(miss_keys, fresh)
+        
+        dim = fresh.shape[1] if fresh is not None else len(next(e for e in cached if e is not None))
+        embeddings = np.empty((len(texts), dim), dtype=np.float32)
+        for i, embedding in enumerate(cached):
+            if embedding is not None:
+                embeddings[i] = embedding
+        if fresh is not None:
+            for key, embedding in zip(miss_positions, fresh):
+                embeddings[miss_positions[key]] = embedding
+        
+        logger.debug(f"Embedding cache: {len(texts)} texts, {len(miss_positions)} sent to {embedder.provider_name}")
+        return embeddings
+    
+    async def generate_single_embedding(self, text: str) -> np.ndarray:
         """Generate embedding for a single text.
         
         Args:
             text: Text string to embed
             
         Returns:
-            Embedding vector
+            Embedding vector as a float32 array
         """
         embeddings = await self.generate_embeddings([text])
-        return embeddings[0] if embeddings else []
+        return embeddings[0]
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get embedding cache hit rate and bytes saved."""
+        if not self.cache:
+            return {'enabled': False}
+        return {'enabled': True, **self.cache.get_stats()}
+    
+    def get_request_stats(self) -> Dict[str, Any]:
+        """Get per-provider request latency histograms for remote embedders."""
+        return {
+            embedder.provider_name: embedder.get_request_stats()
+            for embedder in (self.primary_embedder, self.fallback_embedder)
+            if embedder is not None and hasattr(embedder, "get_request_stats")
+        }
     
     async def cleanup(self):
         """Clean up resources."""
+        if self.cache:
+            logger.info(f"Embedding cache stats: {self.get_cache_stats()}")
+            await self.cache.close()
+        if self.get_request_stats():
+            logger.info(f"Embedding request stats: {self.get_request_stats()}")
         if self.primary_embedder:
             await self.primary_embedder.cleanup()
         if self.fallback_embedder:
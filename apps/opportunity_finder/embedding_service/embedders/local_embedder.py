@@ -2,6 +2,7 @@
 
 import asyncio
 from typing import List
+import numpy as np
 import torch
 from sentence_transformers import SentenceTransformer
 from loguru import logger
@@ -12,8 +13,11 @@ from config import Settings
 class LocalEmbedder:
     """Local embedding provider using sentence-transformers."""
     
+    provider_name = "local"
+    
     def __init__(self, settings: Settings):
         self.settings = settings
+        self.model_name = settings.local_model_name
         self.model = None
         self.device = None
         
@@ -29,6 +33,10 @@ class LocalEmbedder:
         
         logger.info(f"Using device: {self.device}")
         
+        if self.settings.local_num_threads > 0:
+            torch.set_num_threads(self.settings.local_num_threads)
+            logger.info(f"Using {self.settings.local_num_threads} CPU threads for torch")
+        
         # Load model in executor to avoid blocking
         loop = asyncio.get_event_loop()
         self.model = await loop.run_in_executor(
@@ -44,17 +52,17 @@ class LocalEmbedder:
         model.to(self.device)
         return model
     
-    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    async def generate_embeddings(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings using local model.
         
         Args:
             texts: List of text strings to embed
             
         Returns:
-            List of embedding vectors
+            float32 array of shape (len(texts), dim)
         """
         if not texts:
-            return []
+            return np.empty((0, self.get_embedding_dimension()), dtype=np.float32)
         
         if not self.model:
             raise RuntimeError("Local embedding model not initialized")
@@ -68,36 +76,76 @@ class LocalEmbedder:
                 texts
             )
             
-            return embeddings.tolist()
+            return embeddings.numpy()
             
         except Exception as e:
             logger.error(f"Error generating local embeddings: {e}")
             raise
     
     def _generate_embeddings_sync(self, texts: List[str]):
-        """Generate embeddings synchronously."""
-        # Process in batches to manage memory
-        batch_size = self.settings.local_batch_size
-        all_embeddings = []
+        """Generate embeddings synchronously.
+        
+        Texts are encoded in length-sorted batches so short titles are not
+        padded to the length of a long post, then returned in input order.
+        """
+        all_embeddings = torch.empty(len(texts), self.get_embedding_dimension())
         
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
+        for batch_indices in self._plan_batches(texts):
+            batch = [texts[i] for i in batch_indices]
             
             with torch.no_grad():
                 batch_embeddings = self.model.encode(
                     batch,
+                    batch_size=len(batch),
                     convert_to_tensor=True,
                     device=self.device,
                     show_progress_bar=False
                 )
-                
-            all_embeddings.append(batch_embeddings.cpu())
+            
+            all_embeddings[torch.tensor(batch_indices)] = batch_embeddings.cpu()
         
-        # Concatenate all batches
-        if all_embeddings:
-            return torch.cat(all_embeddings, dim=0)
-        else:
-            return torch.empty(0, self.get_embedding_dimension())
+        return all_embeddings
+    
+    def _plan_batches(self, texts: List[str]) -> List[List[int]]:
+        """Group text indices into batches under a padded-token budget.
+        
+        Indices are sorted by token length, and a batch is closed when adding
+        the next text would exceed ``local_batch_size`` texts or
+        ``local_max_tokens_per_batch`` padded tokens.
+        """
+        lengths = self._token_lengths(texts)
+        max_texts = self.settings.local_batch_size
+        max_tokens = self.settings.local_max_tokens_per_batch
+        
+        batches = []
+        current: List[int] = []
+        
+        for i in sorted(range(len(texts)), key=lengths.__getitem__):
+            # Sorted ascending, so the new text sets the batch's padded length
+            if current and (len(current) >= max_texts or lengths[i] * (len(current) + 1) > max_tokens):
+                batches.append(current)
+                current = []
+            current.append(i)
+        
+        if current:
+            batches.append(current)
+        
+        return batches
+    
+    def _token_lengths(self, texts: List[str]) -> List[int]:
+        """Count tokens per text after truncation to the model's max sequence length."""
+        max_length = self.model.max_seq_length or 512
+        tokenizer = getattr(self.model, 'tokenizer', None)
+        
+        if tokenizer is not None:
+            try:
+                encoded = tokenizer(texts, truncation=True, max_length=max_length)['input_ids']
+                return [len(ids) for ids in encoded]
+            except Exception as e:
+                logger.debug(f"Tokenizer length estimate failed, using character count: {e}")
+        
+        # Roughly four characters per token for English text
+        return [min(max_length, len(text) // 4 + 2) for text in texts]
     
     def get_embedding_dimension(self) -> int:
         """Get embedding dimension for the current model."""
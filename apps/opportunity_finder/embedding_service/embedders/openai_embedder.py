@@ -1,99 +1,90 @@
 """OpenAI embedding provider."""
 
-import asyncio
-from typing import List
+import base64
+from typing import List, Dict, Any
+import numpy as np
 import openai
-from asyncio_throttle import Throttler
 from loguru import logger
 
 from config import Settings
+from .request_fanout import RequestFanout, acquire_http_client, release_http_client
 
 
 class OpenAIEmbedder:
-    """OpenAI embedding provider with rate limiting and error handling."""
+    """OpenAI embedding provider with rate limiting and error handling.
+    
+    Sub-batches are sent concurrently through a RequestFanout over a shared
+    keep-alive HTTP client.
+    """
+    
+    provider_name = "openai"
     
     def __init__(self, settings: Settings):
         self.settings = settings
+        self.model_name = settings.openai_model
         self.client = None
-        self.throttler = None
+        self.fanout = None
         
     async def initialize(self):
         """Initialize OpenAI client and rate limiter."""
         if not self.settings.openai_api_key:
             raise ValueError("OpenAI API key is required")
         
+        # Retries are handled by the fan-out so they count against our quota
         self.client = openai.AsyncOpenAI(
             api_key=self.settings.openai_api_key,
-            timeout=self.settings.openai_timeout
+            timeout=self.settings.openai_timeout,
+            max_retries=0,
+            http_client=acquire_http_client(self.settings)
         )
         
-        # Create rate limiter
-        rate_per_second = self.settings.requests_per_minute / 60
-        self.throttler = Throttler(rate_limit=rate_per_second)
+        self.fanout = RequestFanout(
+            provider=self.provider_name,
+            max_concurrency=self.settings.openai_max_concurrency,
+            requests_per_minute=self.settings.requests_per_minute,
+            tokens_per_minute=self.settings.openai_tokens_per_minute,
+            max_retries=self.settings.openai_max_retries,
+            max_backoff=self.settings.retry_max_backoff_seconds
+        )
         
         logger.info(f"OpenAI embedder initialized with model: {self.settings.openai_model}")
     
-    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    async def generate_embeddings(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings using OpenAI API.
         
         Args:
             texts: List of text strings to embed
             
         Returns:
-            List of embedding vectors
+            float32 array of shape (len(texts), dim)
         """
         if not texts:
-            return []
+            return np.empty((0, self.get_embedding_dimension()), dtype=np.float32)
         
-        embeddings = []
-        
-        # Process in batches to respect rate limits
+        # Split into request-sized sub-batches and send them concurrently
         batch_size = self.settings.openai_batch_size
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        embeddings = await self.fanout.map(batches, self._generate_batch_embeddings)
         
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            batch_embeddings = await self._generate_batch_embeddings(batch)
-            embeddings.extend(batch_embeddings)
-        
-        return embeddings
+        return np.concatenate(embeddings, axis=0)
     
-    async def _generate_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for a batch of texts."""
-        retries = 0
+    async def _generate_batch_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings for a batch of texts with a single API request.
         
-        while retries <= self.settings.openai_max_retries:
-            try:
-                # Apply rate limiting
-                async with self.throttler:
-                    response = await self.client.embeddings.create(
-                        model=self.settings.openai_model,
-                        input=texts
-                    )
-                
-                # Extract embeddings
-                embeddings = [item.embedding for item in response.data]
-                return embeddings
-                
-            except openai.RateLimitError as e:
-                retries += 1
-                wait_time = min(60, 2 ** retries)  # Exponential backoff, max 60s
-                logger.warning(f"Rate limit hit, waiting {wait_time}s (retry {retries}/{self.settings.openai_max_retries})")
-                await asyncio.sleep(wait_time)
-                
-            except openai.APIError as e:
-                retries += 1
-                if retries > self.settings.openai_max_retries:
-                    logger.error(f"OpenAI API error after {retries} retries: {e}")
-                    raise
-                wait_time = 2 ** retries
-                logger.warning(f"OpenAI API error, retrying in {wait_time}s: {e}")
-                await asyncio.sleep(wait_time)
-                
-            except Exception as e:
-                logger.error(f"Unexpected error in OpenAI embedder: {e}")
-                raise
+        Rate limiting and retries are applied by the fan-out around this call.
+        """
+        response = await self.client.embeddings.create(
+            model=self.settings.openai_model,
+            input=texts,
+            encoding_format="base64"
+        )
         
-        raise Exception(f"Failed to generate embeddings after {self.settings.openai_max_retries} retries")
+        # Decode little-endian float32 payloads straight into one array
+        embeddings = np.stack([
+            np.frombuffer(base64.b64decode(item.embedding), dtype="<f4")
+            for item in response.data
+        ]).astype(np.float32, copy=False)
+        return embeddings
     
     def get_embedding_dimension(self) -> int:
         """Get embedding dimension for the current model."""
@@ -104,8 +95,14 @@ class OpenAIEmbedder:
         }
         return model_dimensions.get(self.settings.openai_model, 1536)
     
+    def get_request_stats(self) -> Dict[str, Any]:
+        """Get request latency histogram and retry counters."""
+        return self.fanout.stats() if self.fanout else {}
+    
     async def cleanup(self):
         """Clean up resources."""
         if self.client:
-            await self.client.close()
+            # The HTTP client is shared, so release it rather than closing this client
+            await release_http_client()
+            self.client = None
         logger.info("OpenAI embedder cleaned up")
\ No newline at end of file
@@ -0,0 +1,215 @@
+"""Multi-process CPU embedding provider built on LocalEmbedder replicas."""
+
+import asyncio
+import os
+import multiprocessing as mp
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Dict, Any, Optional
+import numpy as np
+from loguru import logger
+
+from config import Settings
+
+
+def _core_slices(workers: int) -> List[List[int]]:
+    """Split the CPUs this process may use into one contiguous slice per worker."""
+    if hasattr(os, "sched_getaffinity"):
+        cores = sorted(os.sched_getaffinity(0))
+    else:
+        cores = list(range(os.cpu_count() or 1))
+    
+    # More workers than cores wraps around and shares cores
+    per_worker = max(1, len(cores) // workers)
+    return [cores[(i * per_worker) % len(cores):][:per_worker] for i in range(workers)]
+
+
+def _worker_main(settings_data: Dict[str, Any], cores: List[int], conn: Connection):
+    """Replica process: load the model once, then serve encode requests.
+    
+    Embeddings are written into a shared float32 buffer owned by this process;
+    only the row count goes back over the pipe.
+    """
+    import torch
+    from .local_embedder import LocalEmbedder
+    
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    torch.set_num_threads(max(1, len(cores)))
+    
+    settings = Settings(**settings_data)
+    embedder = LocalEmbedder(settings)
+    embedder.device = "cpu"
+    embedder.model = embedder._load_model()
+    
+    dim = embedder.get_embedding_dimension()
+    capacity = settings.local_pool_max_rows
+    shm = SharedMemory(create=True, size=capacity * dim * 4)
+    output = np.ndarray((capacity, dim), dtype=np.float32, buffer=shm.buf)
+    conn.send(("ready", shm.name, dim))
+    
+    try:
+        while True:
+            texts = conn.recv()
+            if texts is None:
+                break
+            try:
+                embeddings = embedder._generate_embeddings_sync(texts)
+                output[:len(texts)] = embeddings.numpy()
+                conn.send(("ok", len(texts)))
+            except Exception as e:
+                conn.send(("error", str(e)))
+    finally:
+        del output
+        shm.close()
+        shm.unlink()
+        conn.close()
+
+
+class _Replica:
+    """Parent-side handle on one worker process and its output buffer."""
+    
+    def __init__(self, process: mp.Process, conn: Connection):
+        self.process = process
+        self.conn = conn
+        self.lock = asyncio.Lock()
+        self.shm: Optional[SharedMemory] = None
+        self.output: Optional[np.ndarray] = None
+    
+    def attach(self, shm_name: str, dim: int, capacity: int):
+        """Map the worker's output buffer into this process."""
+        self.shm = SharedMemory(name=shm_name)
+        self.output = np.ndarray((capacity, dim), dtype=np.float32, buffer=self.shm.buf)
+    
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Send texts to the worker and copy the result rows out of shared memory."""
+        self.conn.send(texts)
+        status, value = self.conn.recv()
+        if status != "ok":
+            raise RuntimeError(f"Embedding worker {self.process.pid} failed: {value}")
+        return self.output[:value].copy()
+
+
+class ProcessPoolEmbedder:
+    """Runs several sentence-transformers replicas in separate processes.
+    
+    Each replica is pinned to its own slice of cores, so the CPU nodes are not
+    limited by the GIL or by torch's intra-op threading in one process.
+    Texts are sorted by length and dealt across replicas so every replica
+    gets a similar mix of work.
+    """
+    
+    provider_name = "local"
+    
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.model_name = settings.local_model_name
+        self.replicas: List[_Replica] = []
+        self.dimension: Optional[int] = None
+    
+    async def initialize(self):
+        """Start the worker processes and wait for their models to load."""
+        workers = max(1, self.settings.local_pool_workers)
+        logger.info(f"Starting {workers} embedding worker processes for {self.settings.local_model_name}")
+        
+        # spawn, not fork: torch and its thread pools do not survive fork safely
+        ctx = mp.get_context("spawn")
+        settings_data = self.settings.model_dump()
+        
+        for cores in _core_slices(workers):
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker_main,
+                args=(settings_data, cores, child_conn),
+                daemon=True
+            )
+            process.start()
+            child_conn.close()
+            self.replicas.append(_Replica(process, parent_conn))
+        
+        loop = asyncio.get_event_loop()
+        for replica in self.replicas:
+            try:
+                status, shm_name, dim = await loop.run_in_executor(None, replica.conn.recv)
+            except EOFError:
+                await self.cleanup()
+                raise RuntimeError("Embedding worker exited while loading the model")
+            replica.attach(shm_name, dim, self.settings.local_pool_max_rows)
+            self.dimension = dim
+        
+        logger.info(f"Embedding worker pool ready ({workers} replicas, dim={self.dimension})")
+    
+    async def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings across the worker pool.
+        
+        Args:
+            texts: List of text strings to embed
+        
+        Returns:
+            float32 array of shape (len(texts), dim) in input order
+        """
+        if not texts:
+            return np.empty((0, self.get_embedding_dimension()), dtype=np.float32)
+        
+        if not self.replicas:
+            raise RuntimeError("Embedding worker pool not initialized")
+        
+        # Deal length-sorted texts round-robin so replicas get balanced work
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        shards = [order[i::len(self.replicas)] for i in range(len(self.replicas))]
+        
+        results = await asyncio.gather(*[
+            self._encode_shard(replica, [texts[i] for i in shard])
+            for replica, shard in zip(self.replicas, shards)
+            if shard
+        ])
+        
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for shard, shard_embeddings in zip((s for s in shards if s), results):
+            embeddings[shard] = shard_embeddings
+        
+        return embeddings
+    
+    async def _encode_shard(self, replica: _Replica, texts: List[str]) -> np.ndarray:
+        """Encode one replica's texts in chunks that fit its output buffer."""
+        loop = asyncio.get_event_loop()
+        capacity = self.settings.local_pool_max_rows
+        chunks = []
+        
+        async with replica.lock:
+            for i in range(0, len(texts), capacity):
+                chunks.append(await loop.run_in_executor(None, replica.encode, texts[i:i + capacity]))
+        
+        return np.concatenate(chunks, axis=0)
+    
+    def get_embedding_dimension(self) -> int:
+        """Get embedding dimension for the current model."""
+        if self.dimension:
+            return self.dimension
+        
+        model_dimensions = {
+            "all-MiniLM-L6-v2": 384,
+            "all-mpnet-base-v2": 768,
+            "all-MiniLM-L12-v2": 384
+        }
+        return model_dimensions.get(self.settings.local_model_name, 384)
+    
+    async def cleanup(self):
+        """Stop the worker processes and release shared memory."""
+        for replica in self.replicas:
+            try:
+                replica.conn.send(None)
+            except Exception:
+                pass
+            replica.output = None
+            if replica.shm:
+                replica.shm.close()
+        
+        loop = asyncio.get_event_loop()
+        for replica in self.replicas:
+            await loop.run_in_executor(None, replica.process.join, 10)
+            if replica.process.is_alive():
+                replica.process.terminate()
+        
+        self.replicas = []
+        logger.info("Embedding worker pool cleaned up")
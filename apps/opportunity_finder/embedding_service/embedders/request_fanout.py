@@ -0,0 +1,194 @@
+"""Bounded-concurrency, rate-limited request fan-out for remote embedders."""
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+import httpx
+import openai
+from loguru import logger
+
+from config import Settings
+from metrics import StageMetrics
+
+
+T = TypeVar("T")
+
+# Process-wide keep-alive client shared by every remote embedder
+_shared_http_client: Optional[httpx.AsyncClient] = None
+_shared_http_client_users = 0
+
+
+def acquire_http_client(settings: Settings) -> httpx.AsyncClient:
+    """Return the shared keep-alive HTTP client, creating it on first use."""
+    global _shared_http_client, _shared_http_client_users
+    
+    if _shared_http_client is None or _shared_http_client.is_closed:
+        _shared_http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_connections,
+                keepalive_expiry=settings.http_keepalive_expiry
+            ),
+            timeout=None  # Each OpenAI client passes its own per-request timeout
+        )
+        _shared_http_client_users = 0
+    
+    _shared_http_client_users += 1
+    return _shared_http_client
+
+
+async def release_http_client():
+    """Drop one reference to the shared client and close it after the last one."""
+    global _shared_http_client, _shared_http_client_users
+    
+    _shared_http_client_users = max(0, _shared_http_client_users - 1)
+    if _shared_http_client is not None and _shared_http_client_users == 0:
+        await _shared_http_client.aclose()
+        _shared_http_client = None
+
+
+def estimate_tokens(texts: List[str]) -> int:
+    """Rough token count (about 4 characters per token) used for rate limiting."""
+    return sum(len(text) // 4 + 1 for text in texts)
+
+
+class TokenBucket:
+    """Requests-per-minute and tokens-per-minute limiter.
+    
+    Both buckets start full and refill continuously. A limit of 0 disables
+    that bucket. Waiters are served in arrival order.
+    """
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int = 0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.requests = float(requests_per_minute)
+        self.tokens = float(tokens_per_minute)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.updated
+        self.updated = now
+        self.requests = min(self.requests_per_minute, self.requests + elapsed * self.requests_per_minute / 60)
+        self.tokens = min(self.tokens_per_minute, self.tokens + elapsed * self.tokens_per_minute / 60)
+    
+    async def acquire(self, tokens: int = 0):
+        """Wait until one request and ``tokens`` tokens are available, then take them."""
+        async with self.lock:
+            # A single request larger than the whole budget waits for a full bucket
+            if self.tokens_per_minute:
+                tokens = min(tokens, self.tokens_per_minute)
+            
+            while True:
+                self._refill()
+                wait = 0.0
+                if self.requests_per_minute and self.requests < 1:
+                    wait = (1 - self.requests) * 60 / self.requests_per_minute
+                if self.tokens_per_minute and self.tokens < tokens:
+                    wait = max(wait, (tokens - self.tokens) * 60 / self.tokens_per_minute)
+                
+                if wait <= 0:
+                    if self.requests_per_minute:
+                        self.requests -= 1
+                    if self.tokens_per_minute:
+                        self.tokens -= tokens
+                    return
+                
+                await asyncio.sleep(wait)
+
+
+class RequestFanout:
+    """Runs one provider's sub-batch requests concurrently under its quota.
+    
+    At most ``max_concurrency`` requests are in flight, each waits on the
+    token bucket before it is sent, and 429/5xx/connection errors are retried
+    with full-jitter exponential backoff. Results come back in input order.
+    """
+    
+    def __init__(
+        self,
+        provider: str,
+        max_concurrency: int,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_retries: int,
+        max_backoff: float
+    ):
+        self.provider = provider
+        self.semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self.limiter = TokenBucket(requests_per_minute, tokens_per_minute)
+        self.max_retries = max_retries
+        self.max_backoff = max_backoff
+        self.metrics = StageMetrics(provider)
+        self.in_flight = 0
+        self.retries = 0
+        self.rate_limited = 0
+    
+    async def map(
+        self,
+        batches: List[List[str]],
+        request: Callable[[List[str]], Awaitable[T]]
+    ) -> List[T]:
+        """Send every batch through ``request`` and return results in batch order."""
+        return await asyncio.gather(*[self._call(batch, request) for batch in batches])
+    
+    async def _call(self, texts: List[str], request: Callable[[List[str]], Awaitable[T]]) -> T:
+        """Send one batch, retrying transient failures."""
+        attempt = 0
+        
+        while True:
+            async with self.semaphore:
+                await self.limiter.acquire(estimate_tokens(texts))
+                self.in_flight += 1
+                start = time.perf_counter()
+                try:
+                    result = await request(texts)
+                    self.metrics.observe(time.perf_counter() - start, len(texts))
+                    return result
+                except (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError) as e:
+                    error = e
+                finally:
+                    self.in_flight -= 1
+            
+            if isinstance(error, openai.RateLimitError):
+                self.rate_limited += 1
+            
+            attempt += 1
+            if attempt > self.max_retries:
+                logger.error(f"{self.provider} request failed after {self.max_retries} retries: {error}")
+                raise error
+            self.retries += 1
+            
+            wait_time = self._backoff(attempt, error)
+            logger.warning(
+                f"{self.provider} request failed ({type(error).__name__}), "
+                f"retrying in {wait_time:.1f}s (retry {attempt}/{self.max_retries})"
+            )
+            await asyncio.sleep(wait_time)
+    
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter backoff, never shorter than the server's Retry-After."""
+        wait_time = random.uniform(0, min(self.max_backoff, 2 ** attempt))
+        
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                wait_time = max(wait_time, min(self.max_backoff, float(retry_after)))
+            except ValueError:
+                pass
+        
+        return wait_time
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return request latency histogram and retry counters."""
+        return {
+            'in_flight': self.in_flight,
+            'retries': self.retries,
+            'rate_limited': self.rate_limited,
+            **self.metrics.snapshot(),
+        }
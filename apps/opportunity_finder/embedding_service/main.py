@@ -63,7 +63,8 @@ async def main():
     # Setup signal handlers
     def signal_handler(signum, frame):
         logger.info(f"Received signal {signum}, initiating shutdown...")
-        asyncio.create_task(service.shutdown())
+        # Stop polling only; start() drains in-flight batches, then shuts down
+        service.kafka_consumer.stop()
     
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
@@ -0,0 +1,55 @@
+"""Latency metrics shared by the consumer pipeline and the remote embedders."""
+
+from bisect import bisect_left
+from typing import Any, Dict
+
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float('inf'))
+
+
+class StageMetrics:
+    """Batch counts and a latency histogram for one pipeline stage or remote provider."""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.batches = 0
+        self.items = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+    
+    def observe(self, seconds: float, items: int):
+        """Record one processed batch."""
+        self.batches += 1
+        self.items += items
+        self.latency_sum += seconds
+        self.latency_max = max(self.latency_max, seconds)
+        self.bucket_counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+    
+    def quantile(self, q: float) -> float:
+        """Estimate a latency quantile from the histogram bucket bounds."""
+        if not self.batches:
+            return 0.0
+        rank = q * self.batches
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.bucket_counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.latency_max)
+        return self.latency_max
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the metrics as a plain dict."""
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'latency_avg': self.latency_sum / self.batches if self.batches else 0.0,
+            'latency_p50': self.quantile(0.5),
+            'latency_p95': self.quantile(0.95),
+            'latency_max': self.latency_max,
+            'histogram': {
+                ('+Inf' if bound == float('inf') else str(bound)): count
+                for bound, count in zip(LATENCY_BUCKETS, self.bucket_counts)
+            },
+        }
@@ -0,0 +1,39 @@
+"""ANN index parameters derived from collection size."""
+
+import math
+from typing import Dict
+
+
+def derive_index_params(index_type: str, row_count: int) -> Dict[str, int]:
+    """Choose build parameters for an ANN index over ``row_count`` vectors.
+    
+    ivfflat follows the pgvector guidance of rows / 1000 lists up to 1M rows
+    and sqrt(rows) beyond that. HNSW keeps the library defaults for small
+    collections and raises graph degree and build effort for large ones,
+    where recall at a fixed ef_search otherwise drops.
+    """
+    if index_type == "ivfflat":
+        if row_count <= 1_000_000:
+            lists = row_count // 1000
+        else:
+            lists = int(math.sqrt(row_count))
+        return {'lists': max(1, lists)}
+    
+    if index_type == "hnsw":
+        if row_count < 1_000_000:
+            return {'m': 16, 'ef_construction': 64}
+        return {'m': 24, 'ef_construction': 128}
+    
+    raise ValueError(f"Unsupported index type: {index_type}")
+
+
+def default_search_params(index_type: str, build_params: Dict[str, int], limit: int, ef_search: int) -> Dict[str, int]:
+    """Per-query search effort for an index built with ``build_params``.
+    
+    ivfflat probes default to sqrt(lists). HNSW ef_search is never below the
+    requested limit, since the graph search cannot return more candidates
+    than ef_search.
+    """
+    if index_type == "ivfflat":
+        return {'probes': max(1, round(math.sqrt(build_params.get('lists', 1))))}
+    return {'ef_search': max(ef_search, limit)}
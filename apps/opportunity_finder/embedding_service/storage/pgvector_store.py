@@ -1,13 +1,34 @@
 """PostgreSQL with pgvector extension store implementation."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
+from contextlib import contextmanager
 import asyncio
+import io
+import struct
+import numpy as np
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
 import json
 from loguru import logger
 
 from config import Settings
+from .index_params import derive_index_params, default_search_params
+
+# COPY ... WITH (FORMAT BINARY) stream header and trailer
+_PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_PGCOPY_TRAILER = struct.pack(">h", -1)
+
+# Big-endian element type of each pgvector storage type's binary format
+_STORAGE_DTYPES = {
+    "vector": np.dtype(">f4"),
+    "halfvec": np.dtype(">f2"),
+}
+
+
+def _to_vector_literal(embedding: Union[List[float], np.ndarray]) -> str:
+    """Format a query vector as a pgvector text literal."""
+    return "[" + ",".join(map(str, np.asarray(embedding, dtype=np.float32).tolist())) + "]"
 
 
 class PgVectorStore:
@@ -15,8 +36,12 @@ class PgVectorStore:
     
     def __init__(self, settings: Settings):
         self.settings = settings
-        self.connection = None
-        
+        self.pool: Optional[ThreadedConnectionPool] = None
+        # Replaced by the existing column's type in initialize
+        self.storage_type = settings.pgvector_storage_type
+        self.index_type: Optional[str] = None
+        self.index_params: Dict[str, int] = {}
+    
     async def initialize(self):
         """Initialize PostgreSQL connection and create tables if needed."""
         # Run in executor since psycopg2 is synchronous
@@ -24,43 +49,194 @@ class PgVectorStore:
         await loop.run_in_executor(None, self._initialize_sync)
     
     def _initialize_sync(self):
-        """Initialize PostgreSQL connection synchronously."""
+        """Initialize PostgreSQL connection pool synchronously."""
         try:
-            self.connection = psycopg2.connect(
+            self.pool = ThreadedConnectionPool(
+                self.settings.pgvector_pool_min_size,
+                self.settings.pgvector_pool_max_size,
                 self.settings.database_url,
                 cursor_factory=RealDictCursor
             )
             
             # Create embeddings table if it doesn't exist
-            with self.connection.cursor() as cursor:
+            with self._connection() as connection, connection.cursor() as cursor:
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS opportunity_embeddings (
                         id TEXT PRIMARY KEY,
-                        embedding VECTOR(1536),
+                        embedding {storage_type}(1536),
                         payload JSONB,
                         created_at TIMESTAMP DEFAULT NOW()
                     );
-                """)
+                """.format(storage_type=self.storage_type))
                 
-                # Create index for vector similarity search
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS opportunity_embeddings_embedding_idx 
-                    ON opportunity_embeddings USING ivfflat (embedding vector_cosine_ops)
-                    WITH (lists = 100);
-                """)
+                connection.commit()
                 
-                self.connection.commit()
+                self._load_storage_type(cursor)
                 
-            logger.info("PostgreSQL pgvector store initialized")
+                # Create index for vector similarity search; rebuild with
+                # build_index once the table holds representative data
+                self._load_index_info(cursor)
+                if self.index_type is None:
+                    cursor.execute("SELECT COUNT(*) AS count FROM opportunity_embeddings")
+                    row_count = cursor.fetchone()['count']
+                    cursor.execute(self._create_index_sql(
+                        "opportunity_embeddings_embedding_idx",
+                        self.settings.pgvector_index_type,
+                        derive_index_params(self.settings.pgvector_index_type, row_count)
+                    ))
+                    connection.commit()
+                    self._load_index_info(cursor)
+                
+                logger.info(f"pgvector index: {self.index_type} {self.index_params}")
             
+            logger.info("PostgreSQL pgvector store initialized")
+        
         except Exception as e:
             logger.error(f"Error initializing PostgreSQL pgvector store: {e}")
             raise
     
+    def _load_storage_type(self, cursor):
+        """Use the embedding column's actual type for casts, staging and index opclass.
+        
+        CREATE TABLE IF NOT EXISTS leaves an existing table as it is, so the
+        column may not match pgvector_storage_type; converting it is a
+        manual migration (ALTER COLUMN ... TYPE halfvec(1536)).
+        """
+        cursor.execute("""
+            SELECT format_type(atttypid, atttypmod) AS column_type
+            FROM pg_attribute
+            WHERE attrelid = 'opportunity_embeddings'::regclass AND attname = 'embedding'
+        """)
+        column_type = cursor.fetchone()['column_type']
+        storage_type = column_type.split("(", 1)[0]
+        
+        if storage_type not in _STORAGE_DTYPES:
+            raise ValueError(f"opportunity_embeddings.embedding is {column_type}, expected vector or halfvec")
+        if storage_type != self.settings.pgvector_storage_type:
+            logger.warning(
+                f"opportunity_embeddings.embedding is {column_type} but pgvector_storage_type is "
+                f"{self.settings.pgvector_storage_type}; using {storage_type} until the column is migrated"
+            )
+        self.storage_type = storage_type
+    
+    def _create_index_sql(self, index_name: str, index_type: str, params: Dict[str, int], concurrently: bool = False) -> str:
+        """Build the CREATE INDEX statement for the embedding column."""
+        options = ", ".join(f"{key} = {int(value)}" for key, value in params.items())
+        return """
+            CREATE INDEX {concurrently} IF NOT EXISTS {index_name}
+            ON opportunity_embeddings USING {index_type} (embedding {storage_type}_cosine_ops)
+            WITH ({options})
+        """.format(
+            concurrently="CONCURRENTLY" if concurrently else "",
+            index_name=index_name,
+            index_type=index_type,
+            storage_type=self.storage_type,
+            options=options
+        )
+    
+    def _load_index_info(self, cursor):
+        """Read the access method and build options of the embedding index."""
+        cursor.execute("""
+            SELECT am.amname, c.reloptions
+            FROM pg_class c
+            JOIN pg_am am ON am.oid = c.relam
+            WHERE c.relname = 'opportunity_embeddings_embedding_idx'
+        """)
+        row = cursor.fetchone()
+        
+        if row is None:
+            self.index_type, self.index_params = None, {}
+            return
+        
+        self.index_type = row['amname']
+        self.index_params = {
+            key: int(value)
+            for key, value in (option.split("=", 1) for option in row['reloptions'] or [])
+        }
+    
+    async def build_index(self, index_type: Optional[str] = None) -> Dict[str, Any]:
+        """(Re)build the ANN index with parameters derived from the row count.
+        
+        The new index is built concurrently under a temporary name and swapped
+        in, so searches and writes continue during the rebuild.
+        
+        Args:
+            index_type: "hnsw" or "ivfflat"; defaults to pgvector_index_type
+        
+        Returns:
+            Index type, row count and build parameters used
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None,
+            self._build_index_sync,
+            index_type or self.settings.pgvector_index_type
+        )
+    
+    def _build_index_sync(self, index_type: str) -> Dict[str, Any]:
+        """Rebuild the ANN index synchronously."""
+        with self._connection() as connection:
+            # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+            connection.autocommit = True
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT COUNT(*) AS count FROM opportunity_embeddings")
+                    row_count = cursor.fetchone()['count']
+                    if index_type == "ivfflat" and row_count == 0:
+                        raise ValueError("ivfflat lists are trained on existing rows; load data before building")
+                    
+                    params = derive_index_params(index_type, row_count)
+                    logger.info(f"Building {index_type} index over {row_count} rows with {params}")
+                    
+                    cursor.execute("DROP INDEX CONCURRENTLY IF EXISTS opportunity_embeddings_embedding_idx_new")
+                    cursor.execute(self._create_index_sql(
+                        "opportunity_embeddings_embedding_idx_new", index_type, params, concurrently=True
+                    ))
+                    cursor.execute("DROP INDEX CONCURRENTLY IF EXISTS opportunity_embeddings_embedding_idx")
+                    cursor.execute(
+                        "ALTER INDEX opportunity_embeddings_embedding_idx_new "
+                        "RENAME TO opportunity_embeddings_embedding_idx"
+                    )
+                    self._load_index_info(cursor)
+            finally:
+                connection.autocommit = False
+        
+        return {'index_type': self.index_type, 'row_count': row_count, **self.index_params}
+    
+    def _set_search_params(
+        self,
+        cursor,
+        limit: int,
+        ef_search: Optional[int],
+        probes: Optional[int]
+    ):
+        """Set the index search effort for the current transaction only."""
+        defaults = default_search_params(
+            self.index_type, self.index_params, limit, self.settings.pgvector_hnsw_ef_search
+        )
+        
+        if self.index_type == "ivfflat":
+            probes = probes or self.settings.pgvector_ivfflat_probes or defaults['probes']
+            cursor.execute("SET LOCAL ivfflat.probes = %s", (probes,))
+        elif self.index_type == "hnsw":
+            cursor.execute("SET LOCAL hnsw.ef_search = %s", (ef_search or defaults['ef_search'],))
+    
+    @contextmanager
+    def _connection(self):
+        """Borrow a connection from the pool, rolling back on error."""
+        connection = self.pool.getconn()
+        try:
+            yield connection
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            self.pool.putconn(connection)
+    
     async def store_embedding(
         self,
         vector_id: str,
-        embedding: List[float],
+        embedding: Union[List[float], np.ndarray],
         payload: Dict[str, Any]
     ) -> bool:
         """Store an embedding in PostgreSQL.
@@ -69,7 +245,7 @@ class PgVectorStore:
             vector_id: Unique identifier for the vector
             embedding: Vector embedding
             payload: Metadata to store with the vector
-            
+        
         Returns:
             True if successful, False otherwise
         """
@@ -83,34 +259,128 @@ class PgVectorStore:
     def _store_embedding_sync(
         self, 
         vector_id: str, 
-        embedding: List[float], 
+        embedding: Union[List[float], np.ndarray], 
         payload: Dict[str, Any]
     ) -> bool:
         """Store embedding synchronously."""
+        embeddings = np.asarray(embedding, dtype=np.float32).reshape(1, -1)
+        return self._store_embeddings_batch_sync([vector_id], embeddings, [payload])
+    
+    async def store_embeddings_batch(
+        self,
+        vector_ids: List[str],
+        embeddings: np.ndarray,
+        payloads: List[Dict[str, Any]]
+    ) -> bool:
+        """Store a batch of embeddings in PostgreSQL with a single upsert.
+        
+        Args:
+            vector_ids: Unique identifiers for the vectors
+            embeddings: float32 array of shape (len(vector_ids), dim)
+            payloads: Metadata to store with each vector, aligned with vector_ids
+        
+        Returns:
+            True if the whole batch was committed, False otherwise
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None,
+            self._store_embeddings_batch_sync,
+            vector_ids, embeddings, payloads
+        )
+    
+    def _store_embeddings_batch_sync(
+        self,
+        vector_ids: List[str],
+        embeddings: np.ndarray,
+        payloads: List[Dict[str, Any]]
+    ) -> bool:
+        """Store a batch of embeddings synchronously in one transaction.
+        
+        Rows are streamed into a temporary staging table with binary COPY,
+        then upserted into opportunity_embeddings with one statement.
+        """
+        # ON CONFLICT cannot touch the same row twice in one statement,
+        # so keep only the last occurrence of each id.
+        latest = {vector_id: i for i, vector_id in enumerate(vector_ids) if vector_id is not None}
+        if not latest:
+            return True
+        
         try:
-            with self.connection.cursor() as cursor:
+            copy_data = self._encode_copy_rows(
+                list(latest), np.asarray(embeddings)[list(latest.values())], [payloads[i] for i in latest.values()]
+            )
+            
+            with self._connection() as connection, connection.cursor() as cursor:
+                cursor.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS opportunity_embeddings_staging (
+                        id TEXT,
+                        embedding {storage_type},
+                        payload JSONB
+                    ) ON COMMIT DELETE ROWS
+                """.format(storage_type=self.storage_type))
+                
+                cursor.copy_expert(
+                    "COPY opportunity_embeddings_staging (id, embedding, payload) FROM STDIN WITH (FORMAT BINARY)",
+                    io.BytesIO(copy_data)
+                )
+                
                 cursor.execute("""
                     INSERT INTO opportunity_embeddings (id, embedding, payload)
-                    VALUES (%s, %s, %s)
+                    SELECT id, embedding, payload FROM opportunity_embeddings_staging
                     ON CONFLICT (id) DO UPDATE SET
                         embedding = EXCLUDED.embedding,
                         payload = EXCLUDED.payload,
                         created_at = NOW()
-                """, (vector_id, embedding, json.dumps(payload)))
+                """)
                 
-                self.connection.commit()
+                connection.commit()
                 return True
-                
+        
         except Exception as e:
-            logger.error(f"Error storing embedding in PostgreSQL: {e}")
-            self.connection.rollback()
+            logger.error(f"Error storing {len(latest)} embeddings in PostgreSQL: {e}")
             return False
     
+    def _encode_copy_rows(
+        self,
+        vector_ids: List[str],
+        embeddings: np.ndarray,
+        payloads: List[Dict[str, Any]]
+    ) -> bytes:
+        """Encode rows in PostgreSQL binary COPY format.
+        
+        Each vector is sent as pgvector's binary representation (int16 dim,
+        int16 unused, big-endian elements), so no per-element text
+        formatting or Python float boxing happens on the way to the server.
+        """
+        # One vectorised byte-order conversion for the whole batch
+        vectors = np.ascontiguousarray(embeddings, dtype=_STORAGE_DTYPES[self.storage_type])
+        dim = vectors.shape[1]
+        vector_field = struct.pack(">iHH", 4 + vectors.itemsize * dim, dim, 0)
+        
+        buffer = bytearray(_PGCOPY_HEADER)
+        for vector_id, vector, payload in zip(vector_ids, vectors, payloads):
+            id_bytes = str(vector_id).encode('utf-8')
+            # jsonb binary format is a version byte followed by the JSON text
+            payload_bytes = b"\x01" + json.dumps(payload).encode('utf-8')
+            
+            buffer += struct.pack(">hi", 3, len(id_bytes))
+            buffer += id_bytes
+            buffer += vector_field
+            buffer += vector.tobytes()
+            buffer += struct.pack(">i", len(payload_bytes))
+            buffer += payload_bytes
+        
+        buffer += _PGCOPY_TRAILER
+        return bytes(buffer)
+    
     async def search_similar(
         self,
-        query_embedding: List[float],
+        query_embedding: Union[List[float], np.ndarray],
         limit: int = 10,
-        score_threshold: Optional[float] = None
+        score_threshold: Optional[float] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """Search for similar vectors in PostgreSQL.
         
@@ -118,54 +388,101 @@ class PgVectorStore:
             query_embedding: Query vector
             limit: Maximum number of results
             score_threshold: Minimum similarity score
-            
+            ef_search: HNSW search effort for this query
+            probes: ivfflat lists probed for this query
+        
         Returns:
             List of similar vectors with metadata and scores
         """
+        results = await self.search_similar_batch(
+            np.asarray(query_embedding, dtype=np.float32).reshape(1, -1),
+            limit, score_threshold, ef_search, probes
+        )
+        return results[0]
+    
+    async def search_similar_batch(
+        self,
+        query_embeddings: np.ndarray,
+        limit: int = 10,
+        score_threshold: Optional[float] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for the neighbours of many query vectors in one round trip.
+        
+        Args:
+            query_embeddings: float32 array of shape (num_queries, dim)
+            limit: Maximum number of results per query
+            score_threshold: Minimum similarity score
+            ef_search: HNSW search effort for these queries
+            probes: ivfflat lists probed for these queries
+        
+        Returns:
+            One result list per query, in query order
+        """
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(
             None,
-            self._search_similar_sync,
-            query_embedding, limit, score_threshold
+            self._search_similar_batch_sync,
+            query_embeddings, limit, score_threshold, ef_search, probes
         )
     
-    def _search_similar_sync(
+    def _search_similar_batch_sync(
         self,
-        query_embedding: List[float],
+        query_embeddings: np.ndarray,
         limit: int,
-        score_threshold: Optional[float]
-    ) -> List[Dict[str, Any]]:
+        score_threshold: Optional[float],
+        ef_search: Optional[int],
+        probes: Optional[int]
+    ) -> List[List[Dict[str, Any]]]:
         """Search for similar vectors synchronously."""
+        results: List[List[Dict[str, Any]]] = [[] for _ in range(len(query_embeddings))]
+        if not results:
+            return results
+        
         try:
-            with self.connection.cursor() as cursor:
-                # Use cosine similarity for search
-                query = """
-                    SELECT id, payload, 1 - (embedding <=> %s) as score
-                    FROM opportunity_embeddings
-                    ORDER BY embedding <=> %s
-                    LIMIT %s
-                """
+            with self._connection() as connection, connection.cursor() as cursor:
+                self._set_search_params(cursor, limit, ef_search, probes)
                 
-                cursor.execute(query, (query_embedding, query_embedding, limit))
-                results = cursor.fetchall()
+                # Use cosine similarity for search; the LATERAL subquery runs
+                # one index scan per query vector inside a single statement
+                query = """
+                    SELECT q.ord - 1 AS query_index, m.id, m.payload, m.score
+                    FROM unnest(%s::text[]) WITH ORDINALITY AS q(vec, ord)
+                    CROSS JOIN LATERAL (
+                        SELECT id, payload, 1 - (embedding <=> q.vec::{storage_type}) AS score
+                        FROM opportunity_embeddings
+                        ORDER BY embedding <=> q.vec::{storage_type}
+                        LIMIT %s
+                    ) m
+                    ORDER BY q.ord, m.score DESC
+                """.format(storage_type=self.storage_type)
                 
-                # Filter by score threshold if provided
-                if score_threshold is not None:
-                    results = [r for r in results if r['score'] >= score_threshold]
+                vector_literals = [_to_vector_literal(query) for query in query_embeddings]
+                cursor.execute(query, (vector_literals, limit))
                 
-                # Convert to list of dicts
-                return [dict(result) for result in results]
+                for row in cursor.fetchall():
+                    # Filter by score threshold if provided
+                    if score_threshold is not None and row['score'] < score_threshold:
+                        continue
+                    results[row['query_index']].append({
+                        'id': row['id'],
+                        'payload': row['payload'],
+                        'score': row['score']
+                    })
                 
+                return results
+        
         except Exception as e:
             logger.error(f"Error searching similar vectors in PostgreSQL: {e}")
-            return []
+            return [[] for _ in range(len(query_embeddings))]
     
     async def get_embedding(self, vector_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific embedding by ID.
         
         Args:
             vector_id: Vector identifier
-            
+        
         Returns:
             Vector data with metadata or None if not found
         """
@@ -175,7 +492,7 @@ class PgVectorStore:
     def _get_embedding_sync(self, vector_id: str) -> Optional[Dict[str, Any]]:
         """Get embedding synchronously."""
         try:
-            with self.connection.cursor() as cursor:
+            with self._connection() as connection, connection.cursor() as cursor:
                 cursor.execute("""
                     SELECT id, embedding, payload, created_at
                     FROM opportunity_embeddings
@@ -184,7 +501,7 @@ class PgVectorStore:
                 
                 result = cursor.fetchone()
                 return dict(result) if result else None
-                
+        
         except Exception as e:
             logger.error(f"Error getting embedding from PostgreSQL: {e}")
             return None
@@ -194,7 +511,7 @@ class PgVectorStore:
         
         Args:
             vector_id: Vector identifier
-            
+        
         Returns:
             True if successful, False otherwise
         """
@@ -204,17 +521,16 @@ class PgVectorStore:
     def _delete_embedding_sync(self, vector_id: str) -> bool:
         """Delete embedding synchronously."""
         try:
-            with self.connection.cursor() as cursor:
+            with self._connection() as connection, connection.cursor() as cursor:
                 cursor.execute("""
                     DELETE FROM opportunity_embeddings WHERE id = %s
                 """, (vector_id,))
                 
-                self.connection.commit()
+                connection.commit()
                 return cursor.rowcount > 0
-                
+        
         except Exception as e:
             logger.error(f"Error deleting embedding from PostgreSQL: {e}")
-            self.connection.rollback()
             return False
     
     async def get_collection_info(self) -> Dict[str, Any]:
@@ -229,7 +545,7 @@ class PgVectorStore:
     def _get_collection_info_sync(self) -> Dict[str, Any]:
         """Get collection info synchronously."""
         try:
-            with self.connection.cursor() as cursor:
+            with self._connection() as connection, connection.cursor() as cursor:
                 cursor.execute("""
                     SELECT COUNT(*) as count, 
                            MIN(created_at) as oldest,
@@ -239,13 +555,13 @@ class PgVectorStore:
                 
                 result = cursor.fetchone()
                 return dict(result) if result else {}
-                
+        
         except Exception as e:
             logger.error(f"Error getting PostgreSQL collection info: {e}")
             return {}
     
     async def close(self):
-        """Close the PostgreSQL connection."""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
\ No newline at end of file
+        """Close all pooled PostgreSQL connections."""
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
\ No newline at end of file
@@ -1,12 +1,18 @@
 """Qdrant vector store implementation."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 import uuid
+import numpy as np
 from qdrant_client import AsyncQdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct, Filter
+from qdrant_client.models import (
+    Distance, VectorParams, PointStruct, Filter, Batch,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    SearchRequest, SearchParams, HnswConfigDiff
+)
 from loguru import logger
 
 from config import Settings
+from .index_params import derive_index_params, default_search_params
 
 
 class QdrantStore:
@@ -26,12 +32,21 @@ class QdrantStore:
             collection_names = [col.name for col in collections.collections]
             
             if self.settings.qdrant_collection_name not in collection_names:
+                quantization_config = None
+                if self.settings.qdrant_quantization == "int8":
+                    # Keep int8 copies in RAM for search; originals stay on disk for rescoring
+                    quantization_config = ScalarQuantization(
+                        scalar=ScalarQuantizationConfig(type=ScalarType.INT8, always_ram=True)
+                    )
+                
                 await self.client.create_collection(
                     collection_name=self.settings.qdrant_collection_name,
                     vectors_config=VectorParams(
                         size=self.settings.qdrant_vector_size,
-                        distance=Distance.COSINE
-                    )
+                        distance=Distance.COSINE,
+                        on_disk=quantization_config is not None
+                    ),
+                    quantization_config=quantization_config
                 )
                 logger.info(f"Created Qdrant collection: {self.settings.qdrant_collection_name}")
             else:
@@ -44,7 +59,7 @@ class QdrantStore:
     async def store_embedding(
         self,
         vector_id: str,
-        embedding: List[float],
+        embedding: Union[List[float], np.ndarray],
         payload: Dict[str, Any]
     ) -> bool:
         """Store an embedding in Qdrant.
@@ -60,7 +75,7 @@ class QdrantStore:
         try:
             point = PointStruct(
                 id=vector_id,
-                vector=embedding,
+                vector=np.asarray(embedding, dtype=np.float32).tolist(),
                 payload=payload
             )
             
@@ -75,11 +90,57 @@ class QdrantStore:
             logger.error(f"Error storing embedding in Qdrant: {e}")
             return False
     
+    async def store_embeddings_batch(
+        self,
+        vector_ids: List[str],
+        embeddings: np.ndarray,
+        payloads: List[Dict[str, Any]]
+    ) -> bool:
+        """Store a batch of embeddings in Qdrant with a single upsert.
+        
+        Args:
+            vector_ids: Unique identifiers for the vectors
+            embeddings: float32 array of shape (len(vector_ids), dim)
+            payloads: Metadata to store with each vector, aligned with vector_ids
+            
+        Returns:
+            True if the whole batch was written, False otherwise
+        """
+        if not vector_ids:
+            return True
+        
+        try:
+            # Columnar batch; the REST client needs plain lists at this boundary
+            points = Batch(
+                ids=list(vector_ids),
+                vectors=np.asarray(embeddings, dtype=np.float32).tolist(),
+                payloads=list(payloads)
+            )
+            
+            await self.client.upsert(
+                collection_name=self.settings.qdrant_collection_name,
+                points=points,
+                wait=True
+            )
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error storing {len(vector_ids)} embeddings in Qdrant: {e}")
+            return False
+    
+    def _search_params(self, limit: int, ef_search: Optional[int]) -> Optional[SearchParams]:
+        """Per-query HNSW search effort, or None for the collection default."""
+        if ef_search is None and self.settings.qdrant_hnsw_ef:
+            ef_search = default_search_params("hnsw", {}, limit, self.settings.qdrant_hnsw_ef)['ef_search']
+        return SearchParams(hnsw_ef=ef_search) if ef_search else None
+    
     async def search_similar(
         self,
-        query_embedding: List[float],
+        query_embedding: Union[List[float], np.ndarray],
         limit: int = 10,
-        score_threshold: Optional[float] = None
+        score_threshold: Optional[float] = None,
+        ef_search: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """Search for similar vectors in Qdrant.
         
@@ -87,6 +148,7 @@ class QdrantStore:
             query_embedding: Query vector
             limit: Maximum number of results
             score_threshold: Minimum similarity score
+            ef_search: HNSW search effort for this query
             
         Returns:
             List of similar vectors with metadata and scores
@@ -94,9 +156,10 @@ class QdrantStore:
         try:
             search_result = await self.client.search(
                 collection_name=self.settings.qdrant_collection_name,
-                query_vector=query_embedding,
+                query_vector=np.asarray(query_embedding, dtype=np.float32).tolist(),
                 limit=limit,
-                score_threshold=score_threshold
+                score_threshold=score_threshold,
+                search_params=self._search_params(limit, ef_search)
             )
             
             results = []
@@ -114,6 +177,83 @@ class QdrantStore:
             logger.error(f"Error searching similar vectors in Qdrant: {e}")
             return []
     
+    async def search_similar_batch(
+        self,
+        query_embeddings: np.ndarray,
+        limit: int = 10,
+        score_threshold: Optional[float] = None,
+        ef_search: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for the neighbours of many query vectors in one request.
+        
+        Args:
+            query_embeddings: float32 array of shape (num_queries, dim)
+            limit: Maximum number of results per query
+            score_threshold: Minimum similarity score
+            ef_search: HNSW search effort for these queries
+            
+        Returns:
+            One result list per query, in query order
+        """
+        if len(query_embeddings) == 0:
+            return []
+        
+        try:
+            params = self._search_params(limit, ef_search)
+            requests = [
+                SearchRequest(
+                    vector=vector,
+                    limit=limit,
+                    score_threshold=score_threshold,
+                    params=params,
+                    with_payload=True
+                )
+                for vector in np.asarray(query_embeddings, dtype=np.float32).tolist()
+            ]
+            
+            batch_result = await self.client.search_batch(
+                collection_name=self.settings.qdrant_collection_name,
+                requests=requests
+            )
+            
+            return [
+                [{'id': hit.id, 'score': hit.score, 'payload': hit.payload} for hit in hits]
+                for hits in batch_result
+            ]
+            
+        except Exception as e:
+            logger.error(f"Error batch searching {len(query_embeddings)} vectors in Qdrant: {e}")
+            return [[] for _ in range(len(query_embeddings))]
+    
+    async def build_index(self, index_type: Optional[str] = None) -> Dict[str, Any]:
+        """Retune the collection's HNSW graph for its current size.
+        
+        Qdrant only offers HNSW; changing the config makes Qdrant rebuild
+        the graph in the background while the collection stays searchable.
+        
+        Args:
+            index_type: Must be "hnsw" (or None)
+            
+        Returns:
+            Index type, point count and build parameters used
+        """
+        if index_type not in (None, "hnsw"):
+            raise ValueError(f"Qdrant only supports hnsw indexes, not {index_type}")
+        
+        count = await self.client.count(
+            collection_name=self.settings.qdrant_collection_name,
+            exact=True
+        )
+        params = derive_index_params("hnsw", count.count)
+        
+        await self.client.update_collection(
+            collection_name=self.settings.qdrant_collection_name,
+            hnsw_config=HnswConfigDiff(m=params['m'], ef_construct=params['ef_construction'])
+        )
+        logger.info(f"Updated Qdrant HNSW config for {count.count} points: {params}")
+        
+        return {'index_type': "hnsw", 'row_count': count.count, **params}
+    
     async def get_embedding(self, vector_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific embedding by ID.
         
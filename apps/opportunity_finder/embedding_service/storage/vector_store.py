@@ -1,6 +1,7 @@
 """Vector store abstraction supporting Qdrant and pgvector."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
+import numpy as np
 from loguru import logger
 
 from config import Settings
@@ -30,7 +31,7 @@ class VectorStore:
     async def store_embedding(
         self,
         vector_id: str,
-        embedding: List[float],
+        embedding: Union[List[float], np.ndarray],
         payload: Dict[str, Any]
     ) -> bool:
         """Store an embedding with metadata.
@@ -49,11 +50,39 @@ class VectorStore:
             logger.error(f"Error storing embedding {vector_id}: {e}")
             return False
     
+    async def store_embeddings_batch(
+        self,
+        vector_ids: List[str],
+        embeddings: np.ndarray,
+        payloads: List[Dict[str, Any]]
+    ) -> bool:
+        """Store a batch of embeddings with metadata in one write.
+        
+        Args:
+            vector_ids: Unique identifiers for the vectors
+            embeddings: float32 array of shape (len(vector_ids), dim)
+            payloads: Metadata to store with each vector, aligned with vector_ids
+            
+        Returns:
+            True if the whole batch was stored, False otherwise
+        """
+        try:
+            if not (len(vector_ids) == len(embeddings) == len(payloads)):
+                raise ValueError(
+                    f"Batch length mismatch: {len(vector_ids)} ids, "
+                    f"{len(embeddings)} embeddings, {len(payloads)} payloads"
+                )
+            return await self.store.store_embeddings_batch(vector_ids, embeddings, payloads)
+        except Exception as e:
+            logger.error(f"Error storing batch of {len(vector_ids)} embeddings: {e}")
+            return False
+    
     async def search_similar(
         self,
-        query_embedding: List[float],
+        query_embedding: Union[List[float], np.ndarray],
         limit: int = 10,
-        score_threshold: Optional[float] = None
+        score_threshold: Optional[float] = None,
+        **search_params
     ) -> List[Dict[str, Any]]:
         """Search for similar vectors.
         
@@ -61,16 +90,52 @@ class VectorStore:
             query_embedding: Query vector
             limit: Maximum number of results
             score_threshold: Minimum similarity score
+            **search_params: Per-query index effort (ef_search; probes on pgvector)
             
         Returns:
             List of similar vectors with metadata and scores
         """
         try:
-            return await self.store.search_similar(query_embedding, limit, score_threshold)
+            return await self.store.search_similar(query_embedding, limit, score_threshold, **search_params)
         except Exception as e:
             logger.error(f"Error searching similar vectors: {e}")
             return []
     
+    async def search_similar_batch(
+        self,
+        query_embeddings: np.ndarray,
+        limit: int = 10,
+        score_threshold: Optional[float] = None,
+        **search_params
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for the neighbours of many query vectors in one round trip.
+        
+        Args:
+            query_embeddings: float32 array of shape (num_queries, dim)
+            limit: Maximum number of results per query
+            score_threshold: Minimum similarity score
+            **search_params: Per-query index effort (ef_search; probes on pgvector)
+            
+        Returns:
+            One result list per query, in query order
+        """
+        try:
+            return await self.store.search_similar_batch(query_embeddings, limit, score_threshold, **search_params)
+        except Exception as e:
+            logger.error(f"Error batch searching {len(query_embeddings)} vectors: {e}")
+            return [[] for _ in range(len(query_embeddings))]
+    
+    async def build_index(self, index_type: Optional[str] = None) -> Dict[str, Any]:
+        """(Re)build the ANN index with parameters derived from the collection size.
+        
+        Args:
+            index_type: "hnsw" or "ivfflat" (pgvector only); None uses the configured type
+            
+        Returns:
+            Index type, row count and build parameters used
+        """
+        return await self.store.build_index(index_type)
+    
     async def get_embedding(self, vector_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific embedding by ID.
         
@@ -0,0 +1,110 @@
+"""Cycle-time benchmark of the visual and production browser profiles.
+
+Crawls a Hacker News front page served from a local fixture through
+Playwright route interception, so no network is involved. Images, the web
+font and the analytics script the page references are answered after an
+emulated network latency, unless the production profile blocks them.
+"before" is the visual profile with the browser relaunched every cycle, as
+scrape_batch used to do; "after" is the production profile reusing one
+browser.
+
+    python benchmark_browser_profile.py --cycles 3 --stories 30
+    python benchmark_browser_profile.py --fixture saved_hn_front_page.html
+
+Without --headed the visual profile also runs headless, since servers have
+no display; its slow_mo, which dominates, still applies.
+"""
+
+import argparse
+import asyncio
+import time
+
+from config import Settings
+from scrapers.browser_scraper import BrowserScraper, is_blocked_request
+
+HN_URL = "https://news.ycombinator.com/"
+
+# Emulated response latency (seconds) of the requests the fixture page makes
+LATENCY = {"image": 0.05, "font": 0.1, "script": 0.3}
+
+
+def make_fixture(stories: int) -> str:
+    rows = "".join(
+        f'<tr class="athing" id="{40000000 + i}"><td><img src="{HN_URL}s{i}.gif" width="10"></td>'
+        f'<td class="title"><span class="titleline"><a href="https://example.com/{i}">'
+        f'Show HN: An AI tool that automates invoice matching for small teams #{i}</a></span></td></tr>'
+        f'<tr><td class="subtext"><span class="score" id="score_{40000000 + i}">{i * 7} points</span></td></tr>'
+        for i in range(stories)
+    )
+    return (
+        '<html><head><style>@font-face {font-family: v; src: url(https://fonts.gstatic.com/v.woff2);}'
+        ' body {font-family: v;}</style>'
+        '<script src="https://www.google-analytics.com/analytics.js"></script></head>'
+        f'<body><table>{rows}</table></body></html>'
+    )
+
+
+class _NoProducer:
+    """scrape_batch is not called, so nothing is published."""
+
+
+async def run_cycles(profile: str, reuse_browser: bool, cycles: int, html: str, headed: bool) -> list:
+    settings = Settings(browser_profile=profile)
+    scraper = BrowserScraper(_NoProducer(), settings)
+    if not headed:
+        scraper.profile = {**scraper.profile, "headless": True}
+    
+    async def serve(route):
+        request = route.request
+        if request.url == HN_URL:
+            await route.fulfill(status=200, content_type="text/html", body=html)
+        elif scraper.profile["block_requests"] and is_blocked_request(request.resource_type, request.url):
+            # The profile's own route, registered first, aborts it
+            await route.fallback()
+        else:
+            await asyncio.sleep(LATENCY.get(request.resource_type, 0.05))
+            await route.fulfill(status=200, body=b"")
+    
+    timings = []
+    try:
+        for _ in range(cycles):
+            start = time.perf_counter()
+            context = await scraper._create_stealth_context()
+            await context.route("**/*", serve)
+            items = await scraper._scrape_hackernews_optimized(context)
+            await context.close()
+            if not reuse_browser:
+                await scraper.cleanup()
+            timings.append((time.perf_counter() - start, len(items)))
+    finally:
+        await scraper.cleanup()
+    return timings
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--stories", type=int, default=30)
+    parser.add_argument("--fixture", help="Saved Hacker News front page to serve instead of the generated one")
+    parser.add_argument("--headed", action="store_true", help="Show the visual profile's window")
+    args = parser.parse_args()
+    
+    if args.fixture:
+        with open(args.fixture, encoding="utf-8") as f:
+            html = f.read()
+    else:
+        html = make_fixture(args.stories)
+    
+    before = await run_cycles("visual", False, args.cycles, html, args.headed)
+    after = await run_cycles("production", True, args.cycles, html, args.headed)
+    
+    for name, timings in (("before (visual, relaunched)", before), ("after (production, reused)", after)):
+        cycle_times = ", ".join(f"{seconds:.1f}s" for seconds, _ in timings)
+        print(f"{name:<28}: {cycle_times} ({timings[-1][1]} items per cycle)")
+    mean_before = sum(seconds for seconds, _ in before) / len(before)
+    mean_after = sum(seconds for seconds, _ in after) / len(after)
+    print(f"mean cycle {mean_before:.1f}s -> {mean_after:.1f}s ({mean_before / mean_after:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,222 @@
+"""Publish throughput of per-item blocking sends versus batched publishing.
+
+Runs a stand-in broker on localhost that speaks just enough of the Kafka
+protocol for kafka-python's producer (ApiVersions, Metadata, Produce),
+acknowledging each produce request after an emulated broker latency and
+counting the records and compression codec of every batch it receives.
+"before" is the old path: publish_raw_item's send() and future.get() per
+item with the previous 100-byte batch_size and no compression. "after" is
+KafkaProducer.publish_raw_items with the current settings, one call per
+scrape cycle.
+
+    python benchmark_kafka_publish.py --items 2000 --cycle-size 100
+    python benchmark_kafka_publish.py --compression gzip --broker-latency-ms 5
+
+The default codec is lz4, which needs the lz4 package.
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import struct
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+
+from kafka import KafkaProducer as Producer
+from kafka.protocol.admin import ApiVersionResponse
+from kafka.protocol.metadata import MetadataRequest, MetadataResponse
+from kafka.protocol.produce import ProduceRequest, ProduceResponse
+
+from config import Settings
+from producers.kafka_producer import KafkaProducer
+
+API_PRODUCE, API_METADATA, API_VERSIONS = 0, 3, 18
+CODECS = {0: "none", 1: "gzip", 2: "snappy", 3: "lz4", 4: "zstd"}
+PARTITIONS = 3
+
+
+class StandInBroker:
+    """Single-node broker that acknowledges every produce request."""
+    
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.records = 0
+        self.requests = 0
+        self.codecs = Counter()
+        self.server = None
+        self.port = None
+        self.ready = threading.Event()
+    
+    def start(self):
+        threading.Thread(target=asyncio.run, args=(self._serve(),), daemon=True).start()
+        self.ready.wait()
+    
+    def reset(self):
+        self.records, self.requests = 0, 0
+        self.codecs.clear()
+    
+    async def _serve(self):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        self.port = sock.getsockname()[1]
+        self.server = await asyncio.start_server(self._handle, sock=sock)
+        self.ready.set()
+        await self.server.serve_forever()
+    
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                size, = struct.unpack(">i", await reader.readexactly(4))
+                frame = await reader.readexactly(size)
+                api_key, api_version, correlation_id, client_id_length = struct.unpack(">hhih", frame[:10])
+                body = frame[10 + max(client_id_length, 0):]
+                response = await self._respond(api_key, api_version, body)
+                payload = struct.pack(">i", correlation_id) + response.encode()
+                writer.write(struct.pack(">i", len(payload)) + payload)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+    
+    async def _respond(self, api_key: int, api_version: int, body: bytes):
+        if api_key == API_VERSIONS:
+            # Advertising Produce v8 makes the client infer a 2.4 broker, which allows zstd
+            return ApiVersionResponse[0](error_code=0, api_versions=[
+                (API_PRODUCE, 0, 8), (API_METADATA, 0, 1), (API_VERSIONS, 0, 0),
+            ])
+        
+        if api_key == API_METADATA:
+            request = MetadataRequest[api_version].decode(body)
+            topics = request.topics or []
+            partitions = [(0, p, 0, [0], [0]) for p in range(PARTITIONS)]
+            if api_version == 0:
+                return MetadataResponse[0](
+                    brokers=[(0, "127.0.0.1", self.port)],
+                    topics=[(0, topic, partitions) for topic in topics]
+                )
+            return MetadataResponse[1](
+                brokers=[(0, "127.0.0.1", self.port, None)],
+                controller_id=0,
+                topics=[(0, topic, False, partitions) for topic in topics]
+            )
+        
+        if api_key == API_PRODUCE:
+            request = ProduceRequest[api_version].decode(body)
+            await asyncio.sleep(self.latency)
+            self.requests += 1
+            acks = []
+            for topic, partitions in request.topics:
+                for partition, records in partitions:
+                    self._count(records)
+                    acks.append((partition, 0, self.records, -1, 0))
+            return ProduceResponse[api_version](
+                topics=[(topic, acks) for topic, _ in request.topics],
+                throttle_time_ms=0
+            )
+        
+        raise ConnectionError(f"Unsupported API {api_key}")
+    
+    def _count(self, records: bytes):
+        # Record batches (message format v2): records count at byte 57, attributes at 21
+        offset = 0
+        while offset + 61 <= len(records):
+            batch_length, = struct.unpack_from(">i", records, offset + 8)
+            attributes, = struct.unpack_from(">h", records, offset + 21)
+            count, = struct.unpack_from(">i", records, offset + 57)
+            self.records += count
+            self.codecs[CODECS.get(attributes & 0x07, "unknown")] += 1
+            offset += 12 + batch_length
+
+
+def make_items(count: int) -> list:
+    return [
+        {
+            "id": str(40000000 + i),
+            "item_key": str(uuid.uuid4()),
+            "title": f"Show HN: An AI tool that automates invoice matching for small teams #{i}",
+            "url": f"https://example.com/launch/{i}",
+            "score": i % 500,
+            "platform": "hackernews",
+            "scraped_at": datetime.now().isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+def publish_one_by_one(settings: Settings, items: list) -> int:
+    """The previous publish_raw_item loop, with its producer settings."""
+    producer = Producer(
+        bootstrap_servers=settings.kafka_bootstrap_servers.split(','),
+        value_serializer=lambda v: json.dumps(v).encode('utf-8'),
+        key_serializer=lambda k: k.encode('utf-8') if k else None,
+        batch_size=100,
+        linger_ms=settings.kafka_linger_ms,
+        retries=3,
+        acks='all'
+    )
+    published = 0
+    try:
+        for item in items:
+            message = {
+                "id": str(uuid.uuid4()),
+                "source_type": "hackernews",
+                "scraped_at": datetime.utcnow().isoformat(),
+                "raw_data": item
+            }
+            producer.send(settings.kafka_topic_raw_items, key="hackernews", value=message).get(timeout=10)
+            published += 1
+    finally:
+        producer.close()
+    return published
+
+
+async def publish_in_batches(settings: Settings, items: list, cycle_size: int) -> int:
+    producer = KafkaProducer(settings)
+    failed = 0
+    try:
+        for start in range(0, len(items), cycle_size):
+            failed += len(await producer.publish_raw_items("hackernews", items[start:start + cycle_size]))
+    finally:
+        producer.close()
+    return len(items) - failed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--cycle-size", type=int, default=100, help="Items per publish_raw_items call")
+    parser.add_argument("--compression", default="lz4", choices=["none", "gzip", "snappy", "lz4", "zstd"])
+    parser.add_argument("--broker-latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    
+    broker = StandInBroker(args.broker_latency_ms / 1000)
+    broker.start()
+    settings = Settings(
+        kafka_bootstrap_servers=f"127.0.0.1:{broker.port}",
+        kafka_compression_type=None if args.compression == "none" else args.compression
+    )
+    items = make_items(args.items)
+    
+    results = []
+    for name, publish in (
+        ("before (send + get per item)", lambda: asyncio.to_thread(publish_one_by_one, settings, items)),
+        ("after (publish_raw_items)", lambda: publish_in_batches(settings, items, args.cycle_size)),
+    ):
+        broker.reset()
+        start = time.perf_counter()
+        published = await publish()
+        seconds = time.perf_counter() - start
+        codecs = ", ".join(f"{codec} x{count}" for codec, count in broker.codecs.most_common())
+        print(
+            f"{name:<30}: {published / seconds:8.0f} items/s, {broker.records}/{len(items)} records received "
+            f"in {broker.requests} produce requests ({codecs})"
+        )
+        results.append(published / seconds)
+    print(f"throughput {results[1] / results[0]:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""Extraction-time benchmark of per-element handles versus one page.evaluate.
+
+Loads a Hacker News front page fixture (see benchmark_browser_profile) into
+a headless page and extracts its stories both ways: "before" walks element
+handles as _scrape_hackernews_optimized used to, one browser round trip per
+text, attribute and lookup; "after" is extract_rows with HACKERNEWS_SPEC.
+Both results are compared field by field before timings are printed.
+
+    python benchmark_page_extraction.py --runs 20 --stories 30
+    python benchmark_page_extraction.py --fixture saved_hn_front_page.html
+"""
+
+import argparse
+import asyncio
+import time
+
+from playwright.async_api import async_playwright
+
+from benchmark_browser_profile import make_fixture
+from scrapers.browser_scraper import HACKERNEWS_SPEC
+from scrapers.page_extraction import extract_rows
+
+
+async def extract_with_handles(page) -> list:
+    rows = []
+    for story in (await page.query_selector_all('span.titleline > a'))[:HACKERNEWS_SPEC["limit"]]:
+        title = await story.text_content()
+        href = await story.get_attribute('href')
+        story_row = await story.evaluate_handle('el => el.closest("tr")')
+        story_id = await story_row.get_attribute('id') if story_row else None
+        score_element = await page.query_selector(f'#score_{story_id}')
+        score = await score_element.text_content() if score_element else None
+        rows.append({"title": title, "url": href, "story_id": story_id, "score": score})
+    return rows
+
+
+async def time_runs(extract, page, runs: int) -> tuple:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        rows = await extract(page)
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2], rows
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--stories", type=int, default=30)
+    parser.add_argument("--fixture", help="Saved Hacker News front page to load instead of the generated one")
+    args = parser.parse_args()
+    
+    if args.fixture:
+        with open(args.fixture, encoding="utf-8") as f:
+            html = f.read()
+    else:
+        html = make_fixture(args.stories)
+    
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(html, wait_until="domcontentloaded")
+        
+        before, handle_rows = await time_runs(extract_with_handles, page, args.runs)
+        after, evaluate_rows = await time_runs(lambda p: extract_rows(p, HACKERNEWS_SPEC), page, args.runs)
+        await browser.close()
+    
+    mismatches = sum(a != b for a, b in zip(handle_rows, evaluate_rows)) + abs(len(handle_rows) - len(evaluate_rows))
+    print(f"{len(evaluate_rows)} stories, {mismatches} mismatching rows")
+    print(f"median extraction {before * 1000:.1f}ms -> {after * 1000:.1f}ms ({before / after:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
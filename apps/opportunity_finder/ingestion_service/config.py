@@ -1,7 +1,7 @@
 """Configuration settings for the ingestion service."""
 
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -10,8 +10,10 @@ class Settings(BaseSettings):
     # Kafka Configuration
     kafka_bootstrap_servers: str = "localhost:9092"
     kafka_topic_raw_items: str = "raw_opportunities"
-    kafka_batch_size: int = 100
+    kafka_batch_size: int = 65536  # Bytes per partition batch (kafka-python counts bytes, not records)
     kafka_linger_ms: int = 1000
+    kafka_compression_type: Optional[Literal["gzip", "snappy", "lz4", "zstd"]] = "lz4"  # zstd needs brokers >= 2.1
+    kafka_publish_timeout_seconds: float = 30.0  # Items not acknowledged by then are reported as failed
     
     # Redis Configuration (for caching and rate limiting)
     redis_url: str = "redis://localhost:6379/0"
@@ -21,6 +23,18 @@ class Settings(BaseSettings):
     max_items_per_run: int = 1000
     request_delay_seconds: float = 2.0
     
+    # Deduplication
+    dedup_ttl_days: int = 7  # A published item is dropped as a duplicate for this long
+    
+    # Browser automation
+    browser_profile: Literal["production", "visual"] = "production"  # visual shows the browser and slows each action for demos
+    
+    # Browser crawl scheduling
+    crawl_concurrency: int = 4  # Targets crawled at once, each worker holding one browser context
+    crawl_domain_delay_seconds: float = 5.0  # Minimum gap between visits to the same domain
+    crawl_target_timeout_seconds: float = 90.0  # A target still running after this is abandoned for the cycle
+    crawl_cycle_timeout_seconds: float = 300.0  # Targets not started by then are skipped and move up next cycle
+    
     # Reddit API (if available)
     reddit_client_id: Optional[str] = None
     reddit_client_secret: Optional[str] = None
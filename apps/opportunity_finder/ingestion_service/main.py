@@ -67,6 +67,11 @@ class IngestionOrchestrator:
             await asyncio.gather(*tasks)
         except asyncio.CancelledError:
             logger.info("Scraping tasks cancelled")
+        finally:
+            # The browser process is kept across scrape cycles
+            for scraper in self.scrapers:
+                if isinstance(scraper, BrowserScraper):
+                    await scraper.cleanup()
             
     def shutdown(self):
         """Graceful shutdown."""
@@ -1,10 +1,12 @@
 """Kafka producer for publishing raw opportunity data."""
 
+import asyncio
 import json
 import uuid
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from kafka import KafkaProducer as Producer
+from kafka.errors import KafkaTimeoutError
 from loguru import logger
 
 from config import Settings
@@ -21,49 +23,81 @@ class KafkaProducer:
             key_serializer=lambda k: k.encode('utf-8') if k else None,
             batch_size=settings.kafka_batch_size,
             linger_ms=settings.kafka_linger_ms,
+            compression_type=settings.kafka_compression_type,
             retries=3,
             acks='all'
         )
         logger.info(f"Kafka producer initialized for {settings.kafka_bootstrap_servers}")
     
-    def publish_raw_item(self, source_type: str, item_data: Dict[str, Any]) -> bool:
-        """Publish a raw opportunity item to Kafka.
+    async def publish_raw_items(
+        self, source_type: str, items: List[Dict[str, Any]]
+    ) -> List[Tuple[Dict[str, Any], Exception]]:
+        """Publish raw opportunity items to Kafka as one batch.
+        
+        All items are handed to the producer before any delivery is awaited,
+        so they travel in compressed per-partition batches rather than one
+        request each. The sends and the wait for their delivery reports run
+        in a worker thread, keeping the event loop free.
         
         Args:
             source_type: Type of source (reddit, hackernews, g2, etc.)
-            item_data: Raw item data from scraper
-            
+            items: Raw items from one scrape cycle
+        
         Returns:
-            True if successfully published, False otherwise
+            (item, error) for every item that was not delivered
         """
+        if not items:
+            return []
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._send_and_wait, source_type, items)
+    
+    def _send_and_wait(
+        self, source_type: str, items: List[Dict[str, Any]]
+    ) -> List[Tuple[Dict[str, Any], Exception]]:
+        failed = []
+        pending = []
+        for item_data in items:
+            try:
+                # Use source_type as partition key for even distribution
+                future = self.producer.send(
+                    self.settings.kafka_topic_raw_items,
+                    key=source_type,
+                    value=self._create_message(source_type, item_data)
+                )
+                pending.append((item_data, future))
+            except Exception as e:
+                failed.append((item_data, e))
+        
         try:
-            # Create standardized message format
-            message = {
-                "id": str(uuid.uuid4()),
-                "source_type": source_type,
-                "scraped_at": datetime.utcnow().isoformat(),
-                "raw_data": item_data
-            }
-            
-            # Use source_type as partition key for even distribution
-            future = self.producer.send(
-                self.settings.kafka_topic_raw_items,
-                key=source_type,
-                value=message
-            )
-            
-            # Wait for send to complete (with timeout)
-            record_metadata = future.get(timeout=10)
-            
-            logger.debug(
-                f"Published {source_type} item to {record_metadata.topic} "
-                f"partition {record_metadata.partition} offset {record_metadata.offset}"
-            )
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to publish {source_type} item: {e}")
-            return False
+            # Nothing else is coming for this batch, so send it now instead of after linger_ms
+            self.producer.flush(timeout=self.settings.kafka_publish_timeout_seconds)
+        except KafkaTimeoutError:
+            pass  # The undelivered items are reported below
+        
+        for item_data, future in pending:
+            if not future.is_done:
+                failed.append((item_data, KafkaTimeoutError(
+                    f"not acknowledged within {self.settings.kafka_publish_timeout_seconds:.0f}s"
+                )))
+            elif future.failed():
+                failed.append((item_data, future.exception))
+        
+        logger.debug(
+            f"Published {len(items) - len(failed)} of {len(items)} {source_type} items "
+            f"to {self.settings.kafka_topic_raw_items}"
+        )
+        return failed
+    
+    @staticmethod
+    def _create_message(source_type: str, item_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Wrap a raw item in the standardized message format."""
+        return {
+            # The item's canonical identity, so downstream sees the same ID every cycle
+            "id": item_data.get("item_key") or str(uuid.uuid4()),
+            "source_type": source_type,
+            "scraped_at": datetime.utcnow().isoformat(),
+            "raw_data": item_data
+        }
     
     def flush(self):
         """Flush any pending messages."""
@@ -9,6 +9,7 @@ from loguru import logger
 
 from config import Settings
 from producers.kafka_producer import KafkaProducer
+from .item_identity import item_key
 
 
 class BaseScraper(ABC):
@@ -19,7 +20,7 @@ class BaseScraper(ABC):
         self.settings = settings
         self.redis_client = redis.from_url(settings.redis_url)
         self.source_type = self.get_source_type()
-        
+    
     @abstractmethod
     def get_source_type(self) -> str:
         """Return the source type identifier."""
@@ -45,11 +46,7 @@ class BaseScraper(ABC):
                 items = await self.scrape_batch()
                 
                 if items:
-                    # Publish each item to Kafka
-                    published_count = 0
-                    for item in items:
-                        if self.kafka_producer.publish_raw_item(self.source_type, item):
-                            published_count += 1
+                    published_count = await self.publish(items)
                     
                     logger.info(
                         f"{self.source_type}: scraped {len(items)} items, "
@@ -63,7 +60,7 @@ class BaseScraper(ABC):
                 
                 # Wait before next scrape
                 await asyncio.sleep(self.settings.scrape_interval_minutes * 60)
-                
+            
             except Exception as e:
                 logger.error(f"Error in {self.source_type} scraper: {e}")
                 await asyncio.sleep(300)  # Wait 5 minutes on error
@@ -90,12 +87,118 @@ class BaseScraper(ABC):
             ex=3600  # Expire after 1 hour
         )
     
-    def _is_duplicate(self, item_id: str) -> bool:
-        """Check if an item has already been scraped."""
-        dup_key = f"scraped:{self.source_type}:{item_id}"
-        return self.redis_client.exists(dup_key)
+    async def publish(self, items: List[Dict[str, Any]]) -> int:
+        """Publish the new items of a scrape cycle to Kafka in one batch.
+        
+        Args:
+            items: Items returned by scrape_batch
+        
+        Returns:
+            Number of items published
+        """
+        items = self._drop_duplicates(items)
+        if not items:
+            return 0
+        
+        failed = await self.kafka_producer.publish_raw_items(self.source_type, items)
+        if failed:
+            logger.error(f"{self.source_type}: failed to publish {len(failed)} of {len(items)} items: {failed[0][1]}")
+            for item, error in failed:
+                logger.debug(f"{self.source_type}: item {item.get('id')} not published: {error}")
+            # Let the next cycle retry what could not be published
+            self._unmark_seen([item for item, _ in failed])
+        
+        return len(items) - len(failed)
+    
+    def get_item_key(self, item: Dict[str, Any]) -> str:
+        """Canonical identity of an item; see item_identity.item_key."""
+        return item_key(
+            item.get('platform') or self.source_type,
+            item.get('id'),
+            item.get('url') or item.get('link')
+        )
+    
+    def _drop_duplicates(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep the items not seen before and mark them seen, in one Redis round trip.
+        
+        Each kept item gets its identity as ``item_key``. SET NX checks and
+        marks a key atomically, so concurrent scrapers never both keep an
+        item. Per-platform scraped and duplicate counts are accumulated in
+        ``dedup_stats:<platform>`` and the duplicate rates logged.
+        
+        Args:
+            items: Items from one scrape cycle
+        
+        Returns:
+            The items to publish, in scrape order
+        """
+        for item in items:
+            try:
+                item['item_key'] = self.get_item_key(item)
+            except ValueError as e:
+                logger.debug(f"{self.source_type}: publishing item without identity: {e}")
+                item['item_key'] = None
+        
+        ttl = self.settings.dedup_ttl_days * 86400
+        pipe = self.redis_client.pipeline(transaction=False)
+        for item in items:
+            if item['item_key']:
+                pipe.set(f"seen:{item['item_key']}", self.source_type, nx=True, ex=ttl)
+        try:
+            results = iter(pipe.execute())
+        except redis.RedisError as e:
+            logger.warning(f"{self.source_type}: dedup unavailable, publishing all {len(items)} items: {e}")
+            return items
+        
+        new_items = []
+        counts: Dict[str, List[int]] = {}
+        for item in items:
+            is_new = not item['item_key'] or bool(next(results))
+            platform = item.get('platform') or self.source_type
+            count = counts.setdefault(platform, [0, 0])
+            count[0] += 1
+            if is_new:
+                new_items.append(item)
+            else:
+                count[1] += 1
+        
+        self._record_dedup_stats(counts)
+        return new_items
+    
+    def _record_dedup_stats(self, counts: Dict[str, List[int]]):
+        """Accumulate and log per-platform [scraped, duplicates] counts of one cycle."""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for platform, (scraped, duplicates) in counts.items():
+            pipe.hincrby(f"dedup_stats:{platform}", "scraped", scraped)
+            pipe.hincrby(f"dedup_stats:{platform}", "duplicates", duplicates)
+        try:
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.debug(f"{self.source_type}: could not record dedup stats: {e}")
+        
+        summary = ", ".join(
+            f"{platform} {duplicates}/{scraped} ({duplicates / scraped:.0%})"
+            for platform, (scraped, duplicates) in sorted(counts.items())
+        )
+        logger.info(f"{self.source_type}: duplicate rate {summary}")
+    
+    def _unmark_seen(self, items: List[Dict[str, Any]]):
+        """Forget items so a later cycle publishes them again."""
+        keys = [f"seen:{item['item_key']}" for item in items if item.get('item_key')]
+        if not keys:
+            return
+        try:
+            self.redis_client.delete(*keys)
+        except redis.RedisError as e:
+            logger.warning(f"{self.source_type}: could not unmark {len(keys)} unpublished items: {e}")
     
-    def _mark_as_scraped(self, item_id: str):
-        """Mark an item as already scraped."""
-        dup_key = f"scraped:{self.source_type}:{item_id}"
-        self.redis_client.set(dup_key, "1", ex=86400 * 7)  # Keep for 7 days
\ No newline at end of file
+    def _seen(self, keys: List[str]) -> List[bool]:
+        """Whether each item key was already published, in one Redis round trip."""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.exists(f"seen:{key}")
+        try:
+            return [bool(exists) for exists in pipe.execute()]
+        except redis.RedisError as e:
+            logger.warning(f"{self.source_type}: dedup unavailable, treating {len(keys)} items as new: {e}")
+            return [False] * len(keys)
@@ -0,0 +1,166 @@
+"""Concurrent crawl scheduling over a pool of browser contexts."""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from config import Settings
+
+
+@dataclass
+class CrawlTarget:
+    """One site or listing crawled once per cycle."""
+    name: str
+    domain: str  # Politeness is enforced per domain, so targets on one site never overlap
+    scrape: Callable[[Any], Awaitable[List[Dict[str, Any]]]]  # Called with a browser context
+    priority: int = 3  # 1 is crawled first
+
+
+@dataclass
+class TargetResult:
+    """Outcome of one target in a cycle."""
+    name: str
+    status: str  # ok, timeout, error or skipped
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+@dataclass
+class CycleReport:
+    """Per-target results and throughput of one crawl cycle."""
+    results: List[TargetResult]
+    seconds: float
+    
+    @property
+    def items(self) -> List[Dict[str, Any]]:
+        return [item for result in self.results for item in result.items]
+    
+    @property
+    def items_per_minute(self) -> float:
+        return len(self.items) * 60 / self.seconds if self.seconds else 0.0
+
+
+class CrawlScheduler:
+    """Crawls every target of a cycle concurrently within a bounded time.
+    
+    Up to ``crawl_concurrency`` workers each hold one browser context and
+    repeatedly take the highest-priority target whose domain is idle and
+    was last visited at least ``crawl_domain_delay_seconds`` ago, so a
+    domain waiting out its delay never blocks other sites. A target running
+    longer than ``crawl_target_timeout_seconds`` is abandoned. Targets not
+    started within ``crawl_cycle_timeout_seconds`` are skipped, and each
+    skip moves that target one priority level up in later cycles until it
+    runs, so low-priority sources are delayed but never starved.
+    """
+    
+    def __init__(self, settings: Settings, new_context: Callable[[], Awaitable[Any]]):
+        self.settings = settings
+        self.new_context = new_context
+        # Consecutive cycles each target was skipped for lack of time
+        self.skips: Dict[str, int] = {}
+    
+    async def run_cycle(self, targets: List[CrawlTarget]) -> CycleReport:
+        """Crawl targets and return their results in the order given."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + self.settings.crawl_cycle_timeout_seconds
+        
+        pending = sorted(targets, key=lambda target: target.priority - self.skips.get(target.name, 0))
+        busy_domains = set()
+        next_visit: Dict[str, float] = {}
+        results: Dict[str, TargetResult] = {}
+        changed = asyncio.Condition()
+        
+        async def next_target() -> Optional[CrawlTarget]:
+            async with changed:
+                while pending:
+                    now = loop.time()
+                    if now >= deadline:
+                        for target in pending:
+                            results[target.name] = TargetResult(target.name, "skipped")
+                        pending.clear()
+                        changed.notify_all()
+                        break
+                    
+                    for target in pending:
+                        if target.domain not in busy_domains and next_visit.get(target.domain, 0.0) <= now:
+                            pending.remove(target)
+                            busy_domains.add(target.domain)
+                            return target
+                    
+                    # Sleep until a politeness delay expires or a running target finishes
+                    wake = min(
+                        (next_visit[target.domain] for target in pending
+                         if target.domain not in busy_domains and target.domain in next_visit),
+                        default=deadline
+                    )
+                    try:
+                        await asyncio.wait_for(changed.wait(), timeout=max(0.0, min(wake, deadline) - now))
+                    except asyncio.TimeoutError:
+                        pass
+                return None
+        
+        async def worker():
+            context = None
+            try:
+                while True:
+                    target = await next_target()
+                    if target is None:
+                        return
+                    try:
+                        if context is None:
+                            context = await self.new_context()
+                        results[target.name] = await self._run_target(target, context)
+                    except Exception as e:
+                        logger.error(f"Could not open a browser context for {target.name}: {e}")
+                        results[target.name] = TargetResult(target.name, "error")
+                    
+                    async with changed:
+                        busy_domains.discard(target.domain)
+                        next_visit[target.domain] = loop.time() + self.settings.crawl_domain_delay_seconds
+                        changed.notify_all()
+            finally:
+                if context is not None:
+                    await context.close()
+        
+        workers = max(1, min(self.settings.crawl_concurrency, len(targets)))
+        await asyncio.gather(*[worker() for _ in range(workers)])
+        
+        for target in targets:
+            if results[target.name].status == "skipped":
+                self.skips[target.name] = self.skips.get(target.name, 0) + 1
+            else:
+                self.skips.pop(target.name, None)
+        
+        report = CycleReport([results[target.name] for target in targets], loop.time() - start)
+        self._log_report(report)
+        return report
+    
+    async def _run_target(self, target: CrawlTarget, context: Any) -> TargetResult:
+        start = time.perf_counter()
+        try:
+            items = await asyncio.wait_for(
+                target.scrape(context), timeout=self.settings.crawl_target_timeout_seconds
+            )
+            return TargetResult(target.name, "ok", items, time.perf_counter() - start)
+        except asyncio.TimeoutError:
+            logger.warning(f"{target.name} did not finish within {self.settings.crawl_target_timeout_seconds:.0f}s")
+            return TargetResult(target.name, "timeout", [], time.perf_counter() - start)
+        except Exception as e:
+            logger.error(f"Error crawling {target.name}: {e}")
+            return TargetResult(target.name, "error", [], time.perf_counter() - start)
+    
+    @staticmethod
+    def _log_report(report: CycleReport):
+        summary = ", ".join(
+            f"{result.name} {len(result.items)} items in {result.seconds:.1f}s"
+            if result.status == "ok" else f"{result.name} {result.status}"
+            for result in report.results
+        )
+        logger.info(
+            f"Crawl cycle: {len(report.items)} items in {report.seconds:.1f}s "
+            f"({report.items_per_minute:.1f} items/min); {summary}"
+        )
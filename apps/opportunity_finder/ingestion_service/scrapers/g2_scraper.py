@@ -1,6 +1,7 @@
 """G2 scraper for software reviews and feature requests."""
 
 import asyncio
+import hashlib
 import httpx
 from typing import Dict, Any, List
 from datetime import datetime
@@ -70,7 +71,7 @@ class G2Scraper(BaseScraper):
                                 rating = await review.locator('.stars, .rating').text_content()
                                 
                                 item = {
-                                    'id': f"g2_{category}_{i}_{hash(review_text)}",
+                                    'id': f"g2_{category}_{hashlib.sha1(review_text.strip().encode('utf-8')).hexdigest()[:16]}",
                                     'category': category,
                                     'review_text': review_text,
                                     'reviewer': reviewer or 'Anonymous',
@@ -79,9 +80,7 @@ class G2Scraper(BaseScraper):
                                     'scraped_at': datetime.utcnow().isoformat()
                                 }
                                 
-                                if not self._is_duplicate(item['id']):
-                                    items.append(item)
-                                    self._mark_as_scraped(item['id'])
+                                items.append(item)
                         except:
                             continue
                     
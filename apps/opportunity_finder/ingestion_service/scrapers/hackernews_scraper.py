@@ -7,6 +7,7 @@ from datetime import datetime
 from loguru import logger
 
 from .base_scraper import BaseScraper
+from .item_identity import item_key
 
 
 class HackerNewsScraper(BaseScraper):
@@ -46,6 +47,10 @@ class HackerNewsScraper(BaseScraper):
         """Fetch a batch of stories concurrently."""
         items = []
         
+        # Skip stories already published, checked for the whole batch at once
+        seen = self._seen([item_key(self.source_type, story_id) for story_id in story_ids])
+        story_ids = [story_id for story_id, was_seen in zip(story_ids, seen) if not was_seen]
+        
         # Create tasks for concurrent fetching
         tasks = []
         for story_id in story_ids:
@@ -64,10 +69,6 @@ class HackerNewsScraper(BaseScraper):
     async def _fetch_single_story(self, client: httpx.AsyncClient, story_id: int) -> Dict[str, Any]:
         """Fetch a single story and check if it's relevant."""
         try:
-            # Check if already processed
-            if self._is_duplicate(str(story_id)):
-                return {}
-            
             story_url = f"{self.settings.hn_api_base}/item/{story_id}.json"
             response = await client.get(story_url)
             response.raise_for_status()
@@ -75,9 +76,7 @@ class HackerNewsScraper(BaseScraper):
             story = response.json()
             
             if story and self._is_relevant_story(story):
-                item = self._extract_story_data(story)
-                self._mark_as_scraped(str(story_id))
-                return item
+                return self._extract_story_data(story)
                 
         except Exception as e:
             logger.debug(f"Error fetching HN story {story_id}: {e}")
@@ -0,0 +1,65 @@
+"""Canonical identity of scraped items, stable across scrape cycles."""
+
+import uuid
+from typing import Any, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = frozenset([
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src", "ref_url",
+])
+
+# Namespace of the name-based UUIDs; changing it changes every item key
+ITEM_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "opportunity-finder:items")
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so links to the same page compare equal.
+    
+    Lowercases scheme and host, drops ``www.``, default ports, the fragment,
+    tracking parameters and a trailing slash, and sorts the query.
+    """
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "https").lower()
+    if scheme == "http":
+        scheme = "https"
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def item_key(platform: str, native_id: Any = None, url: Optional[str] = None) -> str:
+    """Name-based UUID of an item's identity on its platform.
+    
+    The source-native ID identifies the item when there is one; otherwise
+    the normalized URL does. The same story therefore gets the same key in
+    every cycle, whichever listing it was found on. The key is also the
+    message ID downstream and the vector store point ID, so it is a UUID,
+    which Qdrant accepts, rather than a bare hex digest.
+    
+    Args:
+        platform: Site the item comes from (hackernews, reddit, ...)
+        native_id: The site's own ID for the item, if known
+        url: Link to the item
+    
+    Returns:
+        UUID string identifying the item
+    
+    Raises:
+        ValueError: If neither native_id nor url is given
+    """
+    if native_id not in (None, ""):
+        identity = f"{platform}\x1fid\x1f{native_id}"
+    elif url:
+        identity = f"{platform}\x1furl\x1f{normalize_url(url)}"
+    else:
+        raise ValueError(f"{platform} item has neither a native ID nor a URL")
+    return str(uuid.uuid5(ITEM_NAMESPACE, identity))
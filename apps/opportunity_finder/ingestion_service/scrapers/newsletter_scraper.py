@@ -47,10 +47,7 @@ class NewsletterScraper(BaseScraper):
             feed = feedparser.parse(response.content)
             
             for entry in feed.entries[:10]:  # Limit to 10 most recent entries
-                # Check if already processed
                 entry_id = entry.get('id') or entry.get('link', '')
-                if self._is_duplicate(entry_id):
-                    continue
                 
                 # Extract content
                 title = entry.get('title', '')
@@ -80,7 +77,6 @@ class NewsletterScraper(BaseScraper):
                     }
                     
                     items.append(item)
-                    self._mark_as_scraped(entry_id)
                     
         except Exception as e:
             logger.error(f"Error parsing feed {feed_url}: {e}")
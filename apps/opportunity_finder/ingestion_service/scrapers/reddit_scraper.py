@@ -37,16 +37,13 @@ class RedditScraper(BaseScraper):
                     for post_wrapper in posts[:25]:  # Limit to top 25 posts
                         post = post_wrapper.get('data', {})
                         
-                        # Skip if already processed
-                        post_id = post.get('id')
-                        if not post_id or self._is_duplicate(post_id):
+                        if not post.get('id'):
                             continue
                         
                         # Filter for potentially valuable posts
                         if self._is_relevant_post(post):
                             item = self._extract_post_data(post, subreddit)
                             items.append(item)
-                            self._mark_as_scraped(post_id)
                     
                     # Rate limiting
                     await asyncio.sleep(self.settings.request_delay_seconds)
@@ -0,0 +1,92 @@
+"""Items/sec benchmark for per-item vs micro-batched processing tasks.
+
+Feeds synthetic unique posts through process_raw_item (batch size 1, one
+flush per item) and process_raw_items_batch at each batch size. ``local``
+runs the tasks eagerly in this process, which isolates processing and
+publish cost; ``celery`` dispatches them to running workers like the
+consumer does, which adds broker and result round-trips.
+
+    python benchmark_batch_processing.py --items 2000 --batch-sizes 1 16 128 --mode local
+"""
+
+import argparse
+import random
+import time
+import uuid
+
+from workers.tasks import get_processors, process_raw_item, process_raw_items_batch
+
+
+SENTENCES = [
+    "We spent three weeks trying to reconcile invoices between Stripe and QuickBooks by hand.",
+    "Is there a tool that automates onboarding for B2B SaaS customers without writing code?",
+    "Our startup raised seed funding and we are hiring Python engineers in Berlin.",
+    "The biggest problem with our CRM is how slow and expensive it is for a small company.",
+    "I built a Chrome extension that summarizes Slack threads and turns them into tickets.",
+    "Founders keep asking for a simple way to track churn across Shopify and Amazon stores.",
+    "Kubernetes is frustrating to manage for a team of two, we need something serverless.",
+    "Manual data entry from PDFs into our database is tedious and error prone.",
+]
+
+
+def make_items(count, seed):
+    """Unique reddit-shaped raw items (a random tag keeps near-duplicate collapse out of the way)."""
+    rng = random.Random(seed)
+    return [
+        {
+            'id': str(uuid.uuid4()),
+            'source_type': 'reddit',
+            'raw_data': {
+                'title': rng.choice(SENTENCES),
+                'selftext': " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(3, 12)))
+                + f" Ref {rng.getrandbits(64):x}.",
+            },
+        }
+        for _ in range(count)
+    ]
+
+
+def run(items, batch_size, mode):
+    """Process every item at the given batch size and return the elapsed seconds."""
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    
+    start = time.perf_counter()
+    if mode == "local":
+        for batch in batches:
+            if batch_size == 1:
+                process_raw_item.apply(args=(batch[0],))
+            else:
+                process_raw_items_batch.apply(args=(batch,))
+    else:
+        if batch_size == 1:
+            results = [process_raw_item.delay(batch[0]) for batch in batches]
+        else:
+            results = [process_raw_items_batch.delay(batch) for batch in batches]
+        for result in results:
+            result.get()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 128])
+    parser.add_argument("--mode", choices=["local", "celery"], default="local")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    # Load spaCy and connect to Kafka before timing
+    get_processors()
+    
+    print(f"{args.items} items, mode={args.mode}")
+    baseline = None
+    for batch_size in args.batch_sizes:
+        items = make_items(args.items, args.seed + batch_size)
+        seconds = run(items, batch_size, args.mode)
+        rate = len(items) / seconds
+        baseline = baseline or rate
+        print(f"batch size {batch_size:4d}: {rate:8.1f} items/sec ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
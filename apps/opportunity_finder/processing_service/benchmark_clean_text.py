@@ -0,0 +1,135 @@
+"""Golden-output check and throughput benchmark for TextProcessor.clean_text.
+
+The legacy function below is the previous nine-pass implementation. Every
+generated document (scraped-style posts, HTML newsletters and random strings
+built from the characters the patterns care about) must clean to exactly the
+same output with clean_text and clean_text_streaming; the script exits
+non-zero if any differs.
+
+    python benchmark_clean_text.py --posts 20000 --newsletters 200 --fuzz 50000
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+
+from config import Settings
+from processors.text_processor import TextProcessor
+
+
+def legacy_clean_text(text, max_text_length):
+    if not text:
+        return ""
+    text = re.sub(r'<[^>]+>', ' ', text)
+    text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', ' ', text)
+    text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', ' ', text)
+    text = re.sub(r'[^\w\s.,!?;:()\-\'\"]', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[.]{3,}', '...', text)
+    text = re.sub(r'[!]{2,}', '!', text)
+    text = re.sub(r'[?]{2,}', '?', text)
+    text = text.strip()
+    if len(text) > max_text_length:
+        text = text[:max_text_length]
+        last_period = text.rfind('.')
+        if last_period > len(text) * 0.8:
+            text = text[:last_period + 1]
+    return text
+
+
+SENTENCES = [
+    "We spent three weeks reconciling invoices between Stripe and QuickBooks by hand!!!",
+    "Is there a tool that does this?? DM me at founder@example.io or see https://example.com/pricing?plan=pro&ref=hn",
+    "Our MRR went from $2k -> $12k in 8 months... AMA 🚀",
+    "Kubernetes is *frustrating* for a team of two — we need something serverless.",
+    "Check [the docs](https://docs.example.dev/guide#setup) and the thread at http://news.ycombinator.com/item?id=1234",
+    "Ça coûte 50€/mois, c'est trop cher pour une petite équipe.",
+    "Manual data entry from PDFs into our database is tedious & error prone....",
+    "\"Why isn't there a simple CRM for agencies?\" (asked every week in r/SaaS)",
+]
+
+HTML_BLOCKS = [
+    "<p>{}</p>",
+    "<h2 class=\"title\">{}</h2>\n",
+    "<a href=\"https://example.com/track?u=1&amp;id=2\">{}</a>",
+    "<div>\n  <span style=\"color: red\">{}</span>\n</div>",
+    "<li>{} <img src=\"https://cdn.example.com/x.png\" alt=\"x\"/></li>",
+]
+
+FUZZ_ALPHABET = "ab Z09\n\t.!?<>/:@%-_&=#\"'()*,;$~é€🚀" + "http://" + "x.io"
+
+
+def make_posts(count, rng):
+    return [" ".join(rng.choice(SENTENCES) for _ in range(rng.randint(1, 12))) for _ in range(count)]
+
+
+def make_newsletters(count, rng):
+    return [
+        "\n".join(rng.choice(HTML_BLOCKS).format(rng.choice(SENTENCES)) for _ in range(rng.randint(600, 1500)))
+        for _ in range(count)
+    ]
+
+
+def make_fuzz(count, rng):
+    return ["".join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randint(0, 120))) for _ in range(count)]
+
+
+def check(name, docs, processor, clean):
+    limit = processor.settings.max_text_length
+    mismatches = [doc for doc in docs if clean(doc) != legacy_clean_text(doc, limit)]
+    print(f"{name:32s} {len(docs):6d} docs, {len(mismatches)} mismatches")
+    for doc in mismatches[:3]:
+        print(f"  {doc[:200]!r}")
+    return len(mismatches)
+
+
+def throughput(name, docs, clean):
+    chars = sum(map(len, docs))
+    start = time.perf_counter()
+    for doc in docs:
+        clean(doc)
+    seconds = time.perf_counter() - start
+    print(f"{name:32s} {len(docs) / seconds:10.0f} docs/sec {chars / seconds / 1e6:8.1f} MB/s")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=20000)
+    parser.add_argument("--newsletters", type=int, default=200)
+    parser.add_argument("--fuzz", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    posts = make_posts(args.posts, rng)
+    newsletters = make_newsletters(args.newsletters, rng)
+    fuzz = make_fuzz(args.fuzz, rng)
+    
+    processor = TextProcessor(Settings())
+    # A small limit makes the streaming cut land inside the fuzz strings
+    short_processor = TextProcessor(Settings(max_text_length=20))
+    
+    print("golden output")
+    mismatches = sum([
+        check("posts, clean_text", posts, processor, processor.clean_text),
+        check("newsletters, clean_text", newsletters, processor, processor.clean_text),
+        check("newsletters, streaming", newsletters, processor, processor.clean_text_streaming),
+        check("fuzz, clean_text", fuzz, short_processor, short_processor.clean_text),
+        check("fuzz, streaming", fuzz, short_processor, short_processor.clean_text_streaming),
+    ])
+    
+    limit = processor.settings.max_text_length
+    print("\nthroughput")
+    for name, docs in (("posts", posts), ("newsletters", newsletters)):
+        legacy = throughput(f"{name}, legacy", docs, lambda doc: legacy_clean_text(doc, limit))
+        current = throughput(f"{name}, clean_text", docs, processor.clean_text)
+        print(f"{'':32s} {legacy / current:10.1f}x")
+    
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Per-item timing: shared DocumentAnalysis vs NER pass plus separate TextBlob passes.
+
+The previous path ran the NER-only spaCy pipeline for entities, then built
+one TextBlob for keyword noun phrases and another for sentence statistics.
+The current path parses each post once (tagger, senter and NER) and derives
+entities, keywords and statistics from that parse.
+
+    python benchmark_document_analysis.py --posts 2000 --batch-size 64
+"""
+
+import argparse
+import time
+
+import spacy
+from textblob import TextBlob
+
+from benchmark_entities import make_posts
+from config import Settings
+from processors.entity_extractor import EntityExtractor
+from processors.text_processor import TextProcessor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    posts = make_posts(args.posts, args.seed)
+    settings = Settings(spacy_batch_size=args.batch_size)
+    extractor = EntityExtractor(settings)
+    text_processor = TextProcessor(settings)
+    ner_only = spacy.load("en_core_web_sm", exclude=["tagger", "parser", "senter", "attribute_ruler", "lemmatizer"])
+    
+    # Previous path: NER-only pipe, then two TextBlob parses per post
+    start = time.perf_counter()
+    for post, doc in zip(posts, ner_only.pipe(posts, batch_size=args.batch_size)):
+        [ent.text for ent in doc.ents]
+        extractor.term_matcher.match(post)
+        [str(phrase).lower() for phrase in TextBlob(post).noun_phrases]
+        text_processor.get_text_stats(post)
+    previous_seconds = time.perf_counter() - start
+    
+    # Current path: one parse per post shared by every extractor
+    start = time.perf_counter()
+    for post, analysis in zip(posts, extractor.analyze_batch(posts)):
+        extractor.extract_entities_from(analysis)
+        extractor.extract_keywords(post, analysis=analysis)
+        text_processor.get_text_stats(post, analysis=analysis)
+    current_seconds = time.perf_counter() - start
+    
+    print(f"{len(posts)} posts, pipeline: {extractor.nlp.pipe_names}")
+    print(f"NER + 2x TextBlob      : {previous_seconds / len(posts) * 1000:7.2f} ms/item")
+    print(f"shared DocumentAnalysis: {current_seconds / len(posts) * 1000:7.2f} ms/item")
+    print(f"speedup: {previous_seconds / current_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
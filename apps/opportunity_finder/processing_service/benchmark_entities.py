@@ -0,0 +1,83 @@
+"""Docs/sec benchmark for EntityExtractor on synthetic mixed-length posts.
+
+Compares the old per-item path (full en_core_web_sm pipeline, one nlp()
+call per post) with extract_entities_batch (NER-only pipeline, nlp.pipe),
+and checks that both produce the same entities.
+
+    python benchmark_entities.py --posts 10000 --batch-size 64 --n-process 1
+"""
+
+import argparse
+import random
+import time
+
+import spacy
+
+from config import Settings
+from processors.entity_extractor import EntityExtractor
+
+
+SENTENCES = [
+    "We spent three weeks trying to reconcile invoices between Stripe and QuickBooks by hand.",
+    "Is there a tool that automates onboarding for B2B SaaS customers without writing code?",
+    "Our startup raised seed funding from Sequoia and we are hiring Python engineers in Berlin.",
+    "The biggest problem with Salesforce is how slow and expensive it is for a small company.",
+    "I built a Chrome extension with React and TypeScript that summarizes Slack threads using AI.",
+    "Founders keep asking for a simple way to track churn across Shopify and Amazon stores.",
+    "Kubernetes on AWS is frustrating to manage for a team of two, we need something serverless.",
+    "Microsoft and Google both launched machine learning APIs, but pricing is still a challenge.",
+    "Launching today on Product Hunt: an app that turns meeting notes into Jira tickets.",
+    "Manual data entry from PDFs into our database is tedious and error prone.",
+]
+
+
+def make_posts(count: int, seed: int):
+    """Posts of 1-2 (titles), 5-10 (typical) and 30-60 (long) sentences."""
+    rng = random.Random(seed)
+    posts = []
+    for _ in range(count):
+        length = rng.choices([(1, 2), (5, 10), (30, 60)], weights=[0.5, 0.4, 0.1])[0]
+        posts.append(" ".join(rng.choice(SENTENCES) for _ in range(rng.randint(*length))))
+    return posts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--n-process", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    posts = make_posts(args.posts, args.seed)
+    words = sum(len(post.split()) for post in posts)
+    print(f"{len(posts)} posts, {words / len(posts):.0f} words on average")
+    
+    # Keyword extraction off gives the NER-only pipeline
+    extractor = EntityExtractor(Settings(
+        spacy_batch_size=args.batch_size, spacy_n_process=args.n_process, extract_keywords=False
+    ))
+    full_nlp = spacy.load("en_core_web_sm")
+    
+    start = time.perf_counter()
+    baseline = [sorted((ent.text, ent.label_) for ent in full_nlp(post).ents) for post in posts]
+    per_item_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    extractor.extract_entities_batch(posts)
+    batch_seconds = time.perf_counter() - start
+    
+    piped = extractor.nlp.pipe(posts, batch_size=args.batch_size, n_process=args.n_process)
+    mismatches = sum(
+        sorted((ent.text, ent.label_) for ent in doc.ents) != expected
+        for doc, expected in zip(piped, baseline)
+    )
+    
+    print(f"full pipeline, nlp() per post : {len(posts) / per_item_seconds:8.1f} docs/sec")
+    print(f"NER only, nlp.pipe (batched)  : {len(posts) / batch_seconds:8.1f} docs/sec "
+          f"(pipeline: {extractor.nlp.pipe_names}, batch_size={args.batch_size}, n_process={args.n_process})")
+    print(f"speedup: {per_item_seconds / batch_seconds:.1f}x, entity mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Accuracy-vs-speed report for the language identification backends.
+
+Runs a labeled sample of posts through the original per-item langdetect
+check and through LanguageIdentifier with each available backend, and
+reports exact-language accuracy, accuracy of the supported/unsupported
+decision, accuracy on short texts and texts/sec. The built-in sample mixes
+scraped-style English titles and posts with other languages; pass a JSONL
+file of {"text": ..., "lang": ...} lines to use real labeled posts.
+
+    python benchmark_language_id.py --sample labeled_posts.jsonl --model /opt/models/lid.176.ftz
+"""
+
+import argparse
+import json
+import time
+
+from langdetect import DetectorFactory, detect
+
+from config import Settings
+from processors.language_id import LanguageIdentifier, UNKNOWN
+
+DetectorFactory.seed = 0
+
+SAMPLE = [
+    ("en", "Show HN: Stripe webhook debugger built in Rust"),
+    ("en", "Ask HN: How do you handle invoicing for a two-person SaaS?"),
+    ("en", "Launch: Notion-style CRM for freelancers, free tier available"),
+    ("en", "Looking for a tool that syncs Shopify orders with QuickBooks automatically"),
+    ("en", "We spent three weeks reconciling invoices between Stripe and QuickBooks by hand. "
+           "Is there anything that does this without writing custom scripts?"),
+    ("en", "Our startup raised a seed round last month and we are now hiring backend engineers. "
+           "The biggest challenge so far has been onboarding enterprise customers quickly."),
+    ("en", "I built a Chrome extension that summarizes Slack threads using AI. It started as a "
+           "weekend project but now has 2,000 weekly users and a few paying teams."),
+    ("en", "Kubernetes on AWS is frustrating to manage for a team of two. We need something "
+           "serverless that still lets us run long background jobs."),
+    ("en", "Manual data entry from PDFs into our database is tedious and error prone"),
+    ("en", "Best CRM for B2B SaaS under 50 seats?"),
+    ("en", "Product Hunt launch checklist 2024"),
+    ("en", "Indie SaaS MRR update: 12k after 18 months"),
+    ("es", "Busco una herramienta para automatizar facturas en mi empresa pequeña"),
+    ("es", "Lanzamos nuestra startup de logística hace seis meses y el mayor problema sigue "
+           "siendo la conciliación de pagos con los bancos locales."),
+    ("es", "¿Alguien conoce un CRM sencillo para agencias de marketing con menos de diez personas?"),
+    ("pt", "Estamos procurando uma ferramenta para gerenciar assinaturas e cobranças recorrentes "
+           "no Brasil, com suporte a Pix e boleto."),
+    ("pt", "Qual o melhor sistema de gestão para uma pequena loja virtual?"),
+    ("de", "Wie verwaltet ihr Rechnungen in einem kleinen Unternehmen ohne Buchhalter?"),
+    ("de", "Wir haben ein SaaS für Handwerksbetriebe gebaut und suchen jetzt die ersten "
+           "zahlenden Kunden in Bayern und Österreich."),
+    ("fr", "Nous cherchons un outil pour automatiser la facturation de nos clients professionnels."),
+    ("fr", "Quel est le meilleur logiciel de gestion de projet pour une petite agence web ?"),
+    ("it", "Cerchiamo uno strumento per gestire le prenotazioni del nostro ristorante online."),
+    ("nl", "Wij zoeken een eenvoudige boekhoudtool voor zzp'ers met koppeling aan de bank."),
+    ("ru", "Ищем простой инструмент для автоматизации счетов в небольшой компании."),
+    ("ru", "Как вы находите первых клиентов для B2B стартапа?"),
+    ("zh", "有没有适合小团队使用的客户关系管理工具？最好支持微信集成。"),
+    ("ja", "小規模なチーム向けの請求書管理ツールを探しています。おすすめはありますか？"),
+    ("ko", "스타트업을 위한 최고의 고객 관리 도구는 무엇인가요?"),
+    ("tr", "Küçük işletmeler için fatura otomasyonu yapan bir araç arıyoruz."),
+    ("pl", "Szukamy prostego narzędzia do fakturowania dla małej firmy usługowej."),
+]
+
+
+def load_sample(path):
+    if not path:
+        return SAMPLE
+    with open(path, encoding="utf-8") as f:
+        return [(row["lang"], row["text"]) for row in map(json.loads, f) if row.get("text")]
+
+
+def legacy_detect(texts):
+    """The previous is_supported_language path: one langdetect call per text."""
+    predictions = []
+    for text in texts:
+        try:
+            predictions.append((detect(text), 1.0))
+        except Exception:
+            predictions.append(UNKNOWN)
+    return predictions
+
+
+def report(name, predictions, seconds, sample, supported, short_chars):
+    labels = [lang for lang, _ in sample]
+    langs = [lang for lang, _ in predictions]
+    short = [i for i, (_, text) in enumerate(sample) if len(text) <= short_chars]
+    
+    exact = sum(p == l for p, l in zip(langs, labels)) / len(labels)
+    decision = sum((p in supported or p == UNKNOWN[0]) == (l in supported) for p, l in zip(langs, labels)) / len(labels)
+    short_exact = sum(langs[i] == labels[i] for i in short) / max(len(short), 1)
+    print(f"{name:34s} {exact:6.1%} {decision:9.1%} {short_exact:7.1%} {len(labels) / seconds:11.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sample", help="JSONL file of {text, lang} rows")
+    parser.add_argument("--model", default=Settings().language_model_path, help="fastText lid.176 model")
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the sample when timing")
+    args = parser.parse_args()
+    
+    sample = load_sample(args.sample)
+    texts = [text for _, text in sample]
+    settings = Settings(language_model_path=args.model)
+    supported = set(settings.supported_languages)
+    
+    print(f"{len(sample)} labeled texts, supported languages: {sorted(supported)}")
+    print(f"{'':34s} {'exact':>6s} {'supported':>9s} {'short':>7s} {'texts/sec':>11s}")
+    
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        predictions = legacy_detect(texts)
+    report("langdetect per item (previous)", predictions, (time.perf_counter() - start) / args.repeat,
+           sample, supported, settings.language_shortcut_max_chars)
+    
+    for backend in ("langdetect", "fasttext"):
+        identifier = LanguageIdentifier(settings.model_copy(update={"language_id_backend": backend}))
+        if identifier.backend.name != backend:
+            print(f"{backend}: unavailable, skipped")
+            continue
+        
+        # Cold: every pass starts with an empty cache, so this measures shortcut + backend
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            identifier.cache.clear()
+            predictions = identifier.detect_batch(texts)
+        report(f"{backend} + shortcut, batch", predictions, (time.perf_counter() - start) / args.repeat,
+               sample, supported, settings.language_shortcut_max_chars)
+        
+        # Warm: redelivered and reposted texts are answered from the cache
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            predictions = identifier.detect_batch(texts)
+        report(f"{backend} + shortcut, cached", predictions, (time.perf_counter() - start) / args.repeat,
+               sample, supported, settings.language_shortcut_max_chars)
+        
+        stats = identifier.get_stats()
+        print(f"  {stats['shortcut']}/{stats['texts']} texts answered by the shortcut")
+
+
+if __name__ == "__main__":
+    main()
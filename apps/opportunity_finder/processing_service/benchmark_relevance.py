@@ -0,0 +1,86 @@
+"""Identity check and throughput benchmark for keyword relevance scoring.
+
+Scores a Zipf-distributed stream of noun phrases (a few phrases recur
+constantly, most are rare, as in the scraped corpus) with the previous
+per-term substring loops and with RelevanceScorer, and checks every score
+is identical.
+
+    python benchmark_relevance.py --phrases 500000 --vocabulary 20000
+"""
+
+import argparse
+import itertools
+import random
+import sys
+import time
+
+from config import Settings
+from processors.relevance_scorer import RelevanceScorer
+
+
+def legacy_relevance(phrase):
+    score = 0.5
+    business_boosters = [
+        'market', 'customer', 'user', 'business', 'revenue', 'profit',
+        'solution', 'problem', 'opportunity', 'startup', 'company',
+        'tool', 'app', 'service', 'platform', 'software', 'technology'
+    ]
+    for booster in business_boosters:
+        if booster in phrase:
+            score += 0.1
+    reducers = [
+        'thing', 'stuff', 'way', 'time', 'people', 'person',
+        'good', 'bad', 'nice', 'great', 'awesome'
+    ]
+    for reducer in reducers:
+        if reducer in phrase:
+            score -= 0.1
+    return max(0.1, min(1.0, score))
+
+
+WORDS = [
+    "market", "customer", "users", "business", "revenue", "profitable", "solution", "problem",
+    "startup", "company", "tools", "application", "service", "platform", "software", "technology",
+    "things", "stuff", "always", "sometimes", "people", "personal", "good", "badge", "nice",
+    "great", "awesome", "invoice", "manual", "data", "entry", "team", "growth", "pricing",
+    "onboarding", "churn", "api", "integration", "workflow", "automation", "Market", "SaaS",
+]
+
+
+def make_phrases(count, vocabulary, seed):
+    rng = random.Random(seed)
+    phrases = list({" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))) for _ in range(vocabulary)})
+    weights = [1 / (rank + 1) for rank in range(len(phrases))]
+    cumulative = list(itertools.accumulate(weights))
+    return rng.choices(phrases, cum_weights=cumulative, k=count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--phrases", type=int, default=500_000)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    phrases = make_phrases(args.phrases, args.vocabulary, args.seed)
+    scorer = RelevanceScorer(Settings())
+    
+    start = time.perf_counter()
+    legacy = [legacy_relevance(phrase) for phrase in phrases]
+    legacy_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    current = [scorer.score(phrase) for phrase in phrases]
+    current_seconds = time.perf_counter() - start
+    
+    mismatches = sum(old != new for old, new in zip(legacy, current))
+    stats = scorer.get_stats()
+    print(f"{len(phrases)} phrases, {len(set(phrases))} distinct, cache hit rate {stats['hit_rate']:.1%}")
+    print(f"per-term loops   : {len(phrases) / legacy_seconds:10.0f} phrases/sec")
+    print(f"RelevanceScorer  : {len(phrases) / current_seconds:10.0f} phrases/sec")
+    print(f"speedup: {legacy_seconds / current_seconds:.1f}x, mismatching scores: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
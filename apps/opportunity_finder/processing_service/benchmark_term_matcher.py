@@ -0,0 +1,112 @@
+"""Per-document microbenchmark: TermMatcher vs the per-pattern regex/substring scans.
+
+The legacy functions below reproduce the extractor's previous
+``_extract_patterns`` / ``_extract_tech_terms`` behaviour so the benchmark
+can also check that both produce the same terms for every document.
+
+    python benchmark_term_matcher.py --docs 5000
+"""
+
+import argparse
+import random
+import re
+import time
+
+from processors.term_matcher import TermMatcher
+
+
+LEGACY_PATTERNS = {
+    'business_terms': [
+        r'\b(?:startup|company|business|firm|corporation|enterprise|venture)\b',
+        r'\b(?:SaaS|PaaS|IaaS|B2B|B2C|API|SDK|platform)\b',
+        r'\b(?:market|industry|sector|vertical|niche)\b',
+        r'\b(?:revenue|profit|funding|investment|valuation)\b'
+    ],
+    'pain_points': [
+        r'\b(?:problem|issue|challenge|difficulty|struggle)\b',
+        r'\b(?:frustrating|annoying|time-consuming|manual|tedious)\b',
+        r'\b(?:lacking|missing|need|want|wish|hope)\b',
+        r'\b(?:inefficient|slow|expensive|complicated)\b'
+    ],
+    'opportunities': [
+        r'\b(?:opportunity|gap|demand|potential|untapped)\b',
+        r'\b(?:solution|tool|app|service|platform|system)\b',
+        r'\b(?:automate|optimize|improve|streamline|simplify)\b',
+        r'\b(?:profitable|scalable|viable|marketable)\b'
+    ],
+}
+
+LEGACY_TECH_KEYWORDS = [
+    'ai', 'artificial intelligence', 'machine learning', 'ml', 'deep learning',
+    'nlp', 'natural language processing', 'computer vision', 'automation',
+    'api', 'rest', 'graphql', 'microservices', 'cloud', 'aws', 'azure', 'gcp',
+    'docker', 'kubernetes', 'serverless', 'lambda', 'database', 'sql', 'nosql',
+    'react', 'angular', 'vue', 'node.js', 'python', 'javascript', 'typescript',
+    'mobile app', 'ios', 'android', 'flutter', 'react native',
+    'blockchain', 'cryptocurrency', 'web3', 'smart contracts'
+]
+
+SENTENCES = [
+    "Our SaaS startup struggles with manual invoicing, it's tedious and time-consuming.",
+    "Is there a tool or platform that can automate onboarding for B2B customers?",
+    "We built a React Native mobile app with a Python API on AWS Lambda and PostgreSQL.",
+    "The market for AI and machine learning solutions in healthcare is still untapped.",
+    "Founders said the biggest problem is that existing systems are slow and expensive.",
+    "Kubernetes, Docker and serverless all promise to simplify deployment, in theory.",
+    "We need a scalable, profitable way to improve retention in our enterprise segment.",
+    "Interesting scenarios around blockchain, web3 and smart contracts keep coming up.",
+    "Funding is harder this year; valuations dropped across the whole industry.",
+    "Honestly I just want a simple app that syncs my notes with Notion and GraphQL.",
+]
+
+
+def legacy_match(text):
+    text_lower = text.lower()
+    result = {}
+    for category, patterns in LEGACY_PATTERNS.items():
+        matches = []
+        for pattern in patterns:
+            matches.extend(re.findall(pattern, text_lower, re.IGNORECASE))
+        result[category] = matches
+    result['technologies'] = [term for term in LEGACY_TECH_KEYWORDS if term in text_lower]
+    return result
+
+
+def make_docs(count, seed):
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(SENTENCES) for _ in range(rng.choice([1, 3, 8, 25])))
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    docs = make_docs(args.docs, args.seed)
+    matcher = TermMatcher.from_file()
+    
+    start = time.perf_counter()
+    legacy = [legacy_match(doc) for doc in docs]
+    legacy_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    current = [matcher.match(doc) for doc in docs]
+    matcher_seconds = time.perf_counter() - start
+    
+    mismatches = sum(
+        any(set(old[category]) != set(new[category]) for category in old)
+        for old, new in zip(legacy, current)
+    )
+    
+    print(f"{len(docs)} docs, {sum(map(len, docs)) / len(docs):.0f} chars on average")
+    print(f"legacy per-pattern scans: {legacy_seconds / len(docs) * 1e6:8.1f} us/doc")
+    print(f"TermMatcher single pass : {matcher_seconds / len(docs) * 1e6:8.1f} us/doc")
+    print(f"speedup: {legacy_seconds / matcher_seconds:.2f}x, mismatching docs: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Identity check, coverage report and benchmark for per-source text extraction.
+
+Builds raw items shaped like every scraper's output, including the sites
+BrowserScraper and SmartHttpScraper publish under one source_type, and
+extracts their text with the previous if/elif chain and with TextExtractor.
+Text must be identical for every item the chain handled; the report shows
+how many items each source loses to having no text.
+    
+    python benchmark_text_extraction.py --items 200000
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+
+from config import Settings
+from processors.text_extraction import TextExtractor
+
+
+def legacy_extract(raw_item):
+    source_type = raw_item.get('source_type', '')
+    raw_data = raw_item.get('raw_data', {})
+    text_parts = []
+    if source_type == 'reddit':
+        text_parts = [raw_data.get('title', ''), raw_data.get('selftext', '')]
+    elif source_type == 'hackernews':
+        text_parts = [raw_data.get('title', ''), raw_data.get('text', '')]
+    elif source_type == 'g2':
+        text_parts = [raw_data.get('review_text', '')]
+    elif source_type == 'linkedin':
+        text_parts = [raw_data.get('title', ''), raw_data.get('description', '')]
+    elif source_type == 'newsletter':
+        text_parts = [raw_data.get('title', ''), raw_data.get('summary', ''), raw_data.get('content', '')]
+    return ' '.join(filter(None, text_parts)).strip()
+
+
+def make_items(count, seed):
+    rng = random.Random(seed)
+    
+    def body(words):
+        text = " ".join(rng.choice(["invoice", "manual", "churn", "pricing", "api", "we", "need"]) for _ in range(words))
+        return rng.choice(["", " ", text, f" {text}\n"])
+    
+    shapes = [
+        ("reddit", lambda: {'title': body(8), 'selftext': body(400), 'subreddit': 'SaaS'}),
+        ("hackernews", lambda: {'title': body(8), 'text': body(200), 'kids': [1, 2]}),
+        ("g2", lambda: {'review_text': body(150), 'category': 'crm'}),
+        ("linkedin", lambda: {'title': body(8), 'description': body(100)}),
+        ("newsletter", lambda: {'title': body(8), 'summary': body(60), 'content': body(3000), 'tags': ['ai']}),
+        ("browser_automated", lambda: {'title': body(8), 'platform': 'dev.to', 'tags': body(3)}),
+        ("browser_automated", lambda: {'title': body(8), 'platform': 'product_hunt', 'description': body(30)}),
+        ("browser_automated", lambda: {'title': body(8), 'platform': 'indie_hackers'}),
+        ("browser_automated", lambda: {'title': body(8), 'platform': 'betalist', 'description': body(30)}),
+        ("browser_automated", lambda: {'title': body(8), 'platform': 'techcrunch'}),
+        ("browser_automated", lambda: {'title': body(8), 'platform': 'reddit', 'source_type': 'reddit_browser'}),
+        ("smart_http", lambda: {'title': body(8), 'platform': 'hackernews', 'source': 'hackernews'}),
+    ]
+    items = []
+    for i in range(count):
+        source_type, raw_data = rng.choice(shapes)
+        items.append({'id': str(i), 'source_type': source_type, 'raw_data': raw_data()})
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    items = make_items(args.items, args.seed)
+    extractor = TextExtractor(Settings())
+    
+    start = time.perf_counter()
+    legacy = [legacy_extract(item) for item in items]
+    legacy_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    current = [extractor.extract(item) for item in items]
+    current_seconds = time.perf_counter() - start
+    
+    legacy_sources = {'reddit', 'hackernews', 'g2', 'linkedin', 'newsletter'}
+    mismatches = sum(
+        old != new for item, old, new in zip(items, legacy, current) if item['source_type'] in legacy_sources
+    )
+    legacy_dropped = Counter(extractor.resolve_source(item) for item, text in zip(items, legacy) if not text)
+    
+    print(f"{'source':<14} {'items':>8} {'legacy dropped':>15} {'dropped':>8} {'coverage':>9}")
+    for source, stats in sorted(extractor.get_stats().items()):
+        print(f"{source:<14} {stats['items']:>8} {legacy_dropped[source]:>15} {stats['dropped']:>8} {stats['coverage']:>9.1%}")
+    print(f"if/elif chain  : {len(items) / legacy_seconds:10.0f} items/sec")
+    print(f"TextExtractor  : {len(items) / current_seconds:10.0f} items/sec")
+    print(f"mismatching texts on previously supported sources: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
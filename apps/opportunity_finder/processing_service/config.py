@@ -1,7 +1,7 @@
 """Configuration settings for the processing service."""
 
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -22,16 +22,52 @@ class Settings(BaseSettings):
     openai_max_tokens: int = 500
     
     # Processing Configuration
-    batch_size: int = 10
+    batch_size: int = 16  # Raw items per process_raw_items_batch task
+    batch_max_wait_ms: int = 1000  # Dispatch a partial batch this long after its first item
     max_text_length: int = 10000
     min_text_length: int = 50
     
     # Language Detection
     supported_languages: List[str] = ["en"]
+    language_id_backend: Literal["fasttext", "langdetect"] = "fasttext"  # Falls back to langdetect if the model is unavailable
+    language_model_path: str = "/opt/models/lid.176.ftz"
+    language_shortcut_max_chars: int = 200  # Texts up to this length may skip the classifier on script/wording alone
+    language_short_text_min_confidence: float = 0.9  # Below this, short ASCII texts are taken to be English
+    language_cache_size: int = 50000  # Predictions kept per process, keyed by text hash
+    
+    # Near-duplicate Detection (MinHash/LSH over cleaned_text)
+    near_duplicate_enabled: bool = True
+    near_duplicate_backend: Literal["redis", "memory"] = "redis"  # redis shares the index across workers
+    near_duplicate_action: Literal["mark", "skip"] = "mark"  # mark publishes with duplicate_of, skip drops
+    near_duplicate_threshold: float = 0.8  # Estimated Jaccard similarity of word shingles
+    near_duplicate_num_perm: int = 128
+    near_duplicate_bands: int = 16  # 16 bands x 8 rows puts the LSH S-curve near 0.7
+    near_duplicate_shingle_words: int = 3
+    near_duplicate_retention_hours: int = 72
     
     # Entity Extraction
     extract_entities: bool = True
     extract_keywords: bool = True
+    spacy_batch_size: int = 64  # Docs per nlp.pipe batch
+    spacy_n_process: int = 1  # >1 forks spaCy workers; keep 1 inside Celery prefork workers
+    entity_terms_path: Optional[str] = None  # JSON term lists; None uses processors/entity_terms.json
+    source_fields_path: Optional[str] = None  # JSON text fields per source; None uses processors/source_fields.json
+    relevance_weights_path: Optional[str] = None  # JSON keyword weights; None uses processors/relevance_weights.json
+    relevance_cache_size: int = 100000  # Memoized phrase scores per process
+    relevance_reload_interval: float = 30.0  # Seconds between weights file change checks; 0 disables reloading
+    
+    # Processing Mode
+    processing_mode: Literal["celery", "streaming"] = "celery"  # streaming processes in-process, for single-node installs
+    streaming_workers: int = 4  # Forked worker processes in streaming mode
+    streaming_max_pending_batches: int = 8  # Batches queued in the pool before polling pauses
+    
+    # Stage Metrics
+    stage_metrics_enabled: bool = True  # Per-item stage latency histograms, aggregated in Redis
+    stage_metrics_flush_interval: float = 10.0  # Seconds between each worker's Redis flushes
+    stage_metrics_log_interval: float = 300.0  # Seconds between stage latency log summaries; 0 disables
+    metrics_port: int = 9102  # Prometheus /metrics endpoint; 0 disables
+    profile_sample_rate: float = 0.0  # Fraction of batches run under cProfile; profiles of items over the p99 are kept
+    profile_dir: str = "/tmp/processing_profiles"
     
     # Celery Configuration
     celery_task_timeout: int = 300  # 5 minutes
@@ -1,18 +1,22 @@
 """Kafka consumer for processing raw opportunity items."""
 
 import json
+import time
 import asyncio
 from typing import Dict, Any
 from kafka import KafkaConsumer as Consumer
 from loguru import logger
 
 from config import Settings
-from workers.tasks import process_raw_item
+from workers.tasks import process_raw_items_batch
 
 
 class KafkaConsumer:
     """Handles consuming raw items from Kafka and dispatching to workers."""
     
+    # Offsets are committed by the client once polled; subclasses that commit themselves turn this off
+    auto_commit = True
+    
     def __init__(self, settings: Settings):
         self.settings = settings
         self.consumer = Consumer(
@@ -21,7 +25,7 @@ class KafkaConsumer:
             group_id=settings.kafka_consumer_group,
             value_deserializer=lambda m: json.loads(m.decode('utf-8')),
             auto_offset_reset='latest',
-            enable_auto_commit=True
+            enable_auto_commit=self.auto_commit
         )
         self.running = False
         logger.info(f"Kafka consumer initialized for topic: {settings.kafka_topic_raw_items}")
@@ -42,40 +46,49 @@ class KafkaConsumer:
             self.stop()
     
     def _consume_messages(self):
-        """Consume messages in a blocking manner."""
+        """Consume messages in a blocking manner.
+        
+        Messages are grouped into micro-batches that are dispatched when they
+        reach ``batch_size`` items or ``batch_max_wait_ms`` after their first
+        item, whichever comes first, so quiet topics do not hold items back.
+        """
         batch = []
+        deadline = None
+        max_wait = self.settings.batch_max_wait_ms / 1000
         
-        for message in self.consumer:
-            if not self.running:
-                break
+        while self.running:
+            timeout = max_wait if deadline is None else max(0.0, deadline - time.monotonic())
+            records = self.consumer.poll(
+                timeout_ms=int(timeout * 1000),
+                max_records=self.settings.batch_size - len(batch)
+            )
+            
+            # Add messages to batch
+            for messages in records.values():
+                batch.extend(message.value for message in messages)
             
-            try:
-                # Add message to batch
-                batch.append(message.value)
-                
-                # Process batch when it reaches target size
-                if len(batch) >= self.settings.batch_size:
-                    self._process_batch(batch)
-                    batch = []
-                    
-            except Exception as e:
-                logger.error(f"Error processing message: {e}")
-                continue
+            if batch and deadline is None:
+                deadline = time.monotonic() + max_wait
+            
+            # Process batch when it reaches target size or has waited long enough
+            if batch and (len(batch) >= self.settings.batch_size or time.monotonic() >= deadline):
+                self._process_batch(batch)
+                batch = []
+                deadline = None
         
         # Process remaining items in batch
         if batch:
             self._process_batch(batch)
     
     def _process_batch(self, batch: list):
-        """Send batch to Celery workers for processing."""
+        """Send batch to Celery workers as one task."""
         logger.debug(f"Processing batch of {len(batch)} items")
         
-        for item in batch:
-            try:
-                # Dispatch to Celery worker
-                process_raw_item.delay(item)
-            except Exception as e:
-                logger.error(f"Failed to dispatch item to worker: {e}")
+        try:
+            # Dispatch to Celery worker
+            process_raw_items_batch.delay(batch)
+        except Exception as e:
+            logger.error(f"Failed to dispatch batch of {len(batch)} items to worker: {e}")
     
     def stop(self):
         """Stop consuming messages."""
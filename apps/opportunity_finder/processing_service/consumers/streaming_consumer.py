@@ -0,0 +1,178 @@
+"""In-process streaming consumer for single-node deployments."""
+
+import gc
+import multiprocessing
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+from loguru import logger
+
+from config import Settings
+from workers.tasks import create_kafka_producer, get_nlp_processors, get_stage_timer, process_items
+from .kafka_consumer import KafkaConsumer
+
+
+def _process_in_worker(raw_items: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], str]]]:
+    """Pool entry point; the processors were loaded in the parent and inherited through fork."""
+    processed_items, failed_items = process_items(raw_items)
+    # Exceptions do not always pickle; the parent only needs the message
+    return processed_items, [(raw_item, repr(error)) for raw_item, error in failed_items]
+
+
+class StreamingConsumer(KafkaConsumer):
+    """Consumes raw items, processes them in a forked worker pool and produces clean items directly.
+    
+    This skips the Redis broker and Celery worker hops. spaCy, the language
+    identifier and the term matcher are loaded once in this process before
+    the pool forks, so the workers share those pages read-only instead of
+    each loading its own copy. Batches are formed exactly as in Celery mode.
+    Offsets are committed only once a batch is in the pool, so batches that
+    could not be submitted are redelivered after a restart.
+    """
+    
+    auto_commit = False
+    
+    def __init__(self, settings: Settings):
+        # Load models before forking and freeze them out of the cyclic GC so
+        # collections in the workers don't touch (and copy) their pages
+        get_nlp_processors()
+        gc.freeze()
+        
+        if settings.near_duplicate_enabled and settings.near_duplicate_backend == "memory" and settings.streaming_workers > 1:
+            logger.warning("Memory near-duplicate index is per worker process; use the redis backend to share it")
+        
+        # Fork before any Kafka client exists so workers inherit no sockets or threads
+        self.pool = multiprocessing.get_context("fork").Pool(settings.streaming_workers)
+        super().__init__(settings)
+        self.producer = create_kafka_producer(settings)
+        # Bounds batches waiting in the pool so a slow pool pauses polling
+        self.in_flight = threading.BoundedSemaphore(settings.streaming_max_pending_batches)
+        # Pending retry timers and the (batch, attempt) each will submit
+        self._retry_timers: Dict[threading.Timer, Tuple[list, int]] = {}
+        self._retry_lock = threading.Lock()
+        logger.info(f"Streaming mode with {settings.streaming_workers} worker processes")
+    
+    def _process_batch(self, batch: list, attempt: int = 0):
+        """Submit batch to the worker pool and commit the offsets of a fresh batch."""
+        logger.debug(f"Processing batch of {len(batch)} items")
+        
+        pool = self.pool
+        if pool is None:
+            self._not_submitted(batch, attempt, "worker pool is closed")
+            return
+        
+        self.in_flight.acquire()
+        try:
+            pool.apply_async(
+                _process_in_worker,
+                (batch,),
+                callback=lambda result: self._publish(batch, result, attempt),
+                error_callback=lambda error: self._batch_failed(batch, error, attempt)
+            )
+        except Exception as e:
+            self.in_flight.release()
+            self._not_submitted(batch, attempt, e)
+            return
+        
+        # Retries run on timer threads and their offsets were committed with the original batch
+        if attempt == 0:
+            try:
+                self.consumer.commit()
+            except Exception as e:
+                logger.warning(f"Failed to commit offsets after batch of {len(batch)} items: {e}")
+    
+    def _not_submitted(self, batch: list, attempt: int, reason):
+        if attempt == 0:
+            # Nothing past the last submitted batch has been committed
+            logger.warning(f"Leaving batch of {len(batch)} items uncommitted for redelivery: {reason}")
+        else:
+            logger.error(f"Dropping retry of {len(batch)} items: {reason}")
+    
+    def _publish(self, batch: list, result, attempt: int):
+        """Produce a finished batch and retry its failed items; runs on the pool's result thread."""
+        processed_items, failed_items = result
+        raw_by_id = {raw_item.get('id'): raw_item for raw_item in batch}
+        
+        futures = []
+        try:
+            start = time.perf_counter()
+            for processed_item in processed_items:
+                try:
+                    futures.append((processed_item, self.producer.send(
+                        self.settings.kafka_topic_clean_items,
+                        key=processed_item.get('source_type'),
+                        value=processed_item
+                    )))
+                except Exception as e:
+                    # Metadata timeout, full buffer or serialization error; retried like a processing failure
+                    failed_items.append((raw_by_id[processed_item['id']], repr(e)))
+            try:
+                self.producer.flush()
+            except Exception as e:
+                # Sends still unresolved fail their future.get below and are retried
+                logger.warning(f"Flushing batch of {len(futures)} items failed: {e}")
+            # Workers record the other stages; publishing happens here
+            get_stage_timer().record("publish", processed_items, time.perf_counter() - start)
+        finally:
+            self.in_flight.release()
+        
+        for processed_item, future in futures:
+            try:
+                future.get(timeout=0)
+            except Exception as e:
+                failed_items.append((raw_by_id[processed_item['id']], repr(e)))
+        
+        for raw_item, error in failed_items:
+            self._retry_item(raw_item, error, attempt)
+    
+    def _batch_failed(self, batch: list, error: BaseException, attempt: int):
+        """A worker raised outside process_items' per-item handling; retry items one by one."""
+        self.in_flight.release()
+        for raw_item in batch:
+            self._retry_item(raw_item, repr(error), attempt)
+    
+    def _retry_item(self, raw_item: Dict[str, Any], error: str, attempt: int):
+        logger.error(f"Error processing item {raw_item.get('id', 'unknown')}: {error}")
+        if attempt < self.settings.celery_max_retries and self.running:
+            # Same backoff as the Celery tasks; the timer thread also keeps the
+            # pool's result thread from blocking on in_flight
+            timer = threading.Timer(60 * (2 ** attempt), self._run_retry)
+            timer.args = (timer,)
+            timer.daemon = True
+            with self._retry_lock:
+                self._retry_timers[timer] = ([raw_item], attempt + 1)
+            timer.start()
+        else:
+            logger.error(f"Max retries exceeded for item {raw_item.get('id')}")
+    
+    def _run_retry(self, timer: threading.Timer):
+        with self._retry_lock:
+            pending = self._retry_timers.pop(timer, None)
+        # None when stop() already took this retry over
+        if pending is not None:
+            self._process_batch(*pending)
+    
+    def stop(self):
+        """Stop consuming, drain the worker pool and flush produced items.
+        
+        Retries still waiting on their backoff are submitted at once so the
+        pool drains them instead of their timers firing after it is closed.
+        """
+        self.running = False
+        with self._retry_lock:
+            pending = list(self._retry_timers.items())
+            self._retry_timers.clear()
+        for timer, (batch, attempt) in pending:
+            timer.cancel()
+            self._process_batch(batch, attempt)
+        
+        if self.pool:
+            pool, self.pool = self.pool, None
+            pool.close()
+            pool.join()
+        super().stop()
+        if self.producer:
+            self.producer.flush()
+            self.producer.close()
+            self.producer = None
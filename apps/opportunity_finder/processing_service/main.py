@@ -2,6 +2,8 @@
 
 Consumes raw items from Kafka, performs NLP cleaning and entity extraction,
 then publishes cleaned items back to Kafka for embedding generation.
+Processing runs on Celery workers by default; PROCESSING_MODE=streaming
+processes items in a local process pool instead, for single-node installs.
 """
 
 import asyncio
@@ -10,6 +12,8 @@ from loguru import logger
 
 from config import Settings
 from consumers.kafka_consumer import KafkaConsumer
+from consumers.streaming_consumer import StreamingConsumer
+from monitoring.metrics_server import MetricsServer
 from workers.celery_app import celery_app
 
 
@@ -18,13 +22,28 @@ class ProcessingService:
     
     def __init__(self, settings: Settings):
         self.settings = settings
-        self.kafka_consumer = KafkaConsumer(settings)
+        if settings.processing_mode == "streaming":
+            self.kafka_consumer = StreamingConsumer(settings)
+        else:
+            self.kafka_consumer = KafkaConsumer(settings)
+        self.metrics_server = MetricsServer(settings) if settings.stage_metrics_enabled else None
         self.running = True
     
     async def start(self):
         """Start the processing service."""
         logger.info("Starting AI Opportunity Finder Processing Service")
         
+        if self.metrics_server:
+            if self.settings.metrics_port:
+                self.metrics_server.start()
+            if self.settings.stage_metrics_log_interval > 0:
+                asyncio.create_task(self._log_stage_metrics())
+        
+        if self.settings.processing_mode == "streaming":
+            # Items are processed in the consumer's own worker pool
+            await self.kafka_consumer.start_consuming()
+            return
+        
         # Start Celery worker in the background
         celery_process = await asyncio.create_subprocess_exec(
             "celery", "-A", "workers.celery_app", "worker", 
@@ -39,12 +58,20 @@ class ProcessingService:
             celery_process.terminate()
             await celery_process.wait()
     
+    async def _log_stage_metrics(self):
+        """Periodically log the stage latency summary."""
+        while self.running:
+            await asyncio.sleep(self.settings.stage_metrics_log_interval)
+            await asyncio.get_event_loop().run_in_executor(None, self.metrics_server.log_summary)
+    
     def shutdown(self):
         """Graceful shutdown."""
         logger.info("Shutting down processing service...")
         self.running = False
         if self.kafka_consumer:
             self.kafka_consumer.stop()
+        if self.metrics_server:
+            self.metrics_server.stop()
 
 
 async def main():
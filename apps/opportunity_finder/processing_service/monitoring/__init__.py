@@ -0,0 +1 @@
+"""Monitoring package for stage latency metrics."""
@@ -0,0 +1,104 @@
+"""Prometheus-style /metrics endpoint and log summary for stage latency."""
+
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+
+import redis
+from loguru import logger
+
+from config import Settings
+from .stage_timer import STAGE_BUCKETS, TOTAL_STAGE, StageHistogram, read_stage_metrics
+
+
+def render_prometheus(histograms: Dict[Tuple[str, str], StageHistogram]) -> str:
+    """Render histograms in the Prometheus text exposition format."""
+    lines = [
+        "# HELP processing_stage_seconds Per-item time spent in each processing stage",
+        "# TYPE processing_stage_seconds histogram",
+    ]
+    for (source_type, stage), histogram in sorted(histograms.items()):
+        labels = f'source_type="{source_type}",stage="{stage}"'
+        cumulative = 0
+        for bound, count in zip(STAGE_BUCKETS, histogram.bucket_counts):
+            cumulative += count
+            le = "+Inf" if bound == float('inf') else repr(bound)
+            lines.append(f'processing_stage_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"processing_stage_seconds_sum{{{labels}}} {histogram.sum}")
+        lines.append(f"processing_stage_seconds_count{{{labels}}} {histogram.count}")
+    return "\n".join(lines) + "\n"
+
+
+def log_stage_summary(histograms: Dict[Tuple[str, str], StageHistogram]):
+    """Log per-stage average and p50/p95/p99 across all sources."""
+    by_stage: Dict[str, StageHistogram] = defaultdict(StageHistogram)
+    for (_, stage), histogram in histograms.items():
+        merged = by_stage[stage]
+        merged.count += histogram.count
+        merged.sum += histogram.sum
+        merged.bucket_counts = [a + b for a, b in zip(merged.bucket_counts, histogram.bucket_counts)]
+    
+    if not by_stage:
+        return
+    
+    # Pipeline stages first in order of cost, the end-to-end total last
+    stages = sorted((s for s in by_stage if s != TOTAL_STAGE), key=lambda s: -by_stage[s].sum)
+    stages += [TOTAL_STAGE] if TOTAL_STAGE in by_stage else []
+    summary = "; ".join(
+        f"{stage} avg {by_stage[stage].sum / by_stage[stage].count * 1000:.1f}ms "
+        f"p50<={by_stage[stage].quantile(0.5) * 1000:g}ms p95<={by_stage[stage].quantile(0.95) * 1000:g}ms "
+        f"p99<={by_stage[stage].quantile(0.99) * 1000:g}ms"
+        for stage in stages if by_stage[stage].count
+    )
+    items = by_stage[TOTAL_STAGE].count if TOTAL_STAGE in by_stage else 0
+    logger.info(f"Stage latency over {items} items: {summary}")
+
+
+class MetricsServer:
+    """Serves GET /metrics from the stage histograms every worker aggregates in Redis."""
+    
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.redis = redis.Redis.from_url(settings.redis_url)
+        self.httpd = None
+    
+    def start(self):
+        """Serve on metrics_port in a daemon thread."""
+        client = self.redis
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                try:
+                    body = render_prometheus(read_stage_metrics(client)).encode('utf-8')
+                except redis.RedisError as e:
+                    self.send_error(503, str(e))
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                # Scrapes every few seconds would flood the service log
+                pass
+        
+        self.httpd = ThreadingHTTPServer(("0.0.0.0", self.settings.metrics_port), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        logger.info(f"Stage metrics served on :{self.settings.metrics_port}/metrics")
+    
+    def log_summary(self):
+        """Log the current aggregated stage latencies."""
+        try:
+            log_stage_summary(read_stage_metrics(self.redis))
+        except redis.RedisError as e:
+            logger.debug(f"Stage metrics summary failed: {e}")
+    
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd = None
@@ -0,0 +1,233 @@
+"""Per-item, per-stage latency recording for the processing pipeline.
+
+Each worker process records stage times into local histograms keyed by
+(source_type, stage) and periodically adds them to a Redis hash, which the
+service's metrics endpoint and log summary read. Batched stages (language
+ID, spaCy, Kafka flush) are charged to their items evenly.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import random
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import redis
+from loguru import logger
+
+from config import Settings
+
+# Upper bounds (seconds) of the per-item latency histogram buckets
+STAGE_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf')
+)
+
+# Redis hash shared by every worker; fields are "source_type|stage|bucket index", "...|sum" and "...|count"
+METRICS_KEY = "processing:stage_metrics"
+
+# Stage that holds each item's end-to-end time
+TOTAL_STAGE = "total"
+
+# Fewest items before the local p99 is trusted as the outlier threshold
+_MIN_ITEMS_FOR_P99 = 200
+
+
+class StageHistogram:
+    """Count, sum and bucket counts of one stage's per-item latency."""
+    
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.bucket_counts = [0] * len(STAGE_BUCKETS)
+    
+    def observe(self, seconds: float):
+        self.count += 1
+        self.sum += seconds
+        self.bucket_counts[bisect_left(STAGE_BUCKETS, seconds)] += 1
+    
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket holding it."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(STAGE_BUCKETS, self.bucket_counts):
+            seen += count
+            if seen >= rank and count:
+                return bound
+        return 0.0
+
+
+class BatchTiming:
+    """Stage times of the items in one batch, collected until StageTimer.finish."""
+    
+    def __init__(self, raw_items: List[Dict[str, Any]], profiler: Optional[cProfile.Profile]):
+        # id(raw_item) -> (raw_item, {stage: seconds})
+        self.items: Dict[int, Tuple[Dict[str, Any], Dict[str, float]]] = {
+            id(raw_item): (raw_item, {}) for raw_item in raw_items
+        }
+        self.profiler = profiler
+    
+    @contextmanager
+    def stage(self, name: str, raw_items: List[Dict[str, Any]]) -> Iterator[None]:
+        """Time a stage and charge it evenly to raw_items."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if raw_items:
+                share = (time.perf_counter() - start) / len(raw_items)
+                for raw_item in raw_items:
+                    entry = self.items.get(id(raw_item))
+                    if entry is not None:
+                        stages = entry[1]
+                        stages[name] = stages.get(name, 0.0) + share
+
+
+class _DisabledTiming:
+    """Stand-in for BatchTiming when stage metrics are off."""
+    
+    items: Dict[int, Any] = {}
+    profiler = None
+    _context = nullcontext()
+    
+    def stage(self, name: str, raw_items: List[Dict[str, Any]]):
+        return self._context
+
+
+_DISABLED_TIMING = _DisabledTiming()
+
+
+class StageTimer:
+    """Records per-stage histograms by source_type and ships them to Redis.
+    
+    When stage metrics are disabled, start_batch returns a shared no-op
+    timing whose stage() is a reused nullcontext, so the instrumented code
+    pays one method call per stage. With profile_sample_rate set, that
+    fraction of batches runs under cProfile, and the profile is kept only if
+    one of the batch's items took longer than the current p99.
+    """
+    
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.enabled = settings.stage_metrics_enabled
+        self.pending: Dict[Tuple[str, str], StageHistogram] = {}
+        # Never reset; estimates the p99 that marks an item as a slow outlier
+        self.totals = StageHistogram()
+        self.next_flush = time.monotonic() + settings.stage_metrics_flush_interval
+        self.redis = redis.Redis.from_url(settings.redis_url) if self.enabled else None
+    
+    def start_batch(self, raw_items: List[Dict[str, Any]]):
+        """Begin timing a batch of raw items."""
+        if not self.enabled:
+            return _DISABLED_TIMING
+        
+        profiler = None
+        if self.settings.profile_sample_rate and random.random() < self.settings.profile_sample_rate:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler is already active in this thread
+                profiler = None
+        return BatchTiming(raw_items, profiler)
+    
+    def finish(self, timing):
+        """Record a batch's per-item stage times and flush to Redis when due."""
+        if timing is _DISABLED_TIMING:
+            return
+        if timing.profiler:
+            timing.profiler.disable()
+        
+        slowest: Optional[Tuple[float, Dict[str, Any]]] = None
+        for raw_item, stages in timing.items.values():
+            if not stages:
+                continue
+            total = sum(stages.values())
+            for stage, seconds in stages.items():
+                self._observe(raw_item, stage, seconds)
+            self._observe(raw_item, TOTAL_STAGE, total)
+            self.totals.observe(total)
+            if slowest is None or total > slowest[0]:
+                slowest = (total, raw_item)
+        
+        if timing.profiler and slowest:
+            self._keep_outlier_profile(timing.profiler, *slowest)
+        
+        if time.monotonic() >= self.next_flush:
+            self.flush()
+    
+    def record(self, stage: str, items: List[Dict[str, Any]], seconds: float):
+        """Charge a stage timed outside a batch timing evenly to items (not added to their totals)."""
+        if not self.enabled or not items:
+            return
+        
+        share = seconds / len(items)
+        for item in items:
+            self._observe(item, stage, share)
+        
+        if time.monotonic() >= self.next_flush:
+            self.flush()
+    
+    def _observe(self, item: Dict[str, Any], stage: str, seconds: float):
+        key = (item.get('source_type') or 'unknown', stage)
+        histogram = self.pending.get(key)
+        if histogram is None:
+            histogram = self.pending[key] = StageHistogram()
+        histogram.observe(seconds)
+    
+    def flush(self):
+        """Add pending histograms to the shared Redis hash; kept locally if Redis is unavailable."""
+        self.next_flush = time.monotonic() + self.settings.stage_metrics_flush_interval
+        if not self.pending:
+            return
+        
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for (source_type, stage), histogram in self.pending.items():
+                prefix = f"{source_type}|{stage}"
+                pipe.hincrby(METRICS_KEY, f"{prefix}|count", histogram.count)
+                pipe.hincrbyfloat(METRICS_KEY, f"{prefix}|sum", histogram.sum)
+                for index, count in enumerate(histogram.bucket_counts):
+                    if count:
+                        pipe.hincrby(METRICS_KEY, f"{prefix}|{index}", count)
+            pipe.execute()
+            self.pending = {}
+        except redis.RedisError as e:
+            logger.debug(f"Stage metrics flush failed, keeping them for the next flush: {e}")
+    
+    def _keep_outlier_profile(self, profiler: cProfile.Profile, seconds: float, raw_item: Dict[str, Any]):
+        """Save and log a sampled profile if its slowest item is beyond the p99."""
+        if self.totals.count < _MIN_ITEMS_FOR_P99 or seconds <= self.totals.quantile(0.99):
+            return
+        
+        os.makedirs(self.settings.profile_dir, exist_ok=True)
+        path = os.path.join(
+            self.settings.profile_dir,
+            f"{int(time.time())}_{raw_item.get('source_type')}_{raw_item.get('id')}.prof"
+        )
+        profiler.dump_stats(path)
+        
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(15)
+        logger.warning(
+            f"Slow item {raw_item.get('id')} ({raw_item.get('source_type')}) took {seconds * 1000:.0f} ms, "
+            f"over the p99; profile saved to {path}\n{summary.getvalue()}"
+        )
+
+
+def read_stage_metrics(client: redis.Redis) -> Dict[Tuple[str, str], StageHistogram]:
+    """Load every worker's aggregated histograms from Redis."""
+    histograms: Dict[Tuple[str, str], StageHistogram] = {}
+    for field, value in client.hgetall(METRICS_KEY).items():
+        source_type, stage, part = field.decode('utf-8').rsplit('|', 2)
+        histogram = histograms.setdefault((source_type, stage), StageHistogram())
+        if part == 'count':
+            histogram.count = int(value)
+        elif part == 'sum':
+            histogram.sum = float(value)
+        else:
+            histogram.bucket_counts[int(part)] = int(value)
+    return histograms
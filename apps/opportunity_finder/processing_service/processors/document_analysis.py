@@ -0,0 +1,68 @@
+"""Per-document analysis shared by entity, keyword and text-statistics extraction."""
+
+from functools import cached_property
+from typing import Any, Dict, List, Optional
+
+# Coarse POS tags that may appear inside a noun phrase, and those that may end one
+_PHRASE_POS = {"ADJ", "NOUN", "PROPN"}
+_PHRASE_HEAD_POS = {"NOUN", "PROPN"}
+
+
+class DocumentAnalysis:
+    """One spaCy parse of a text, with the views the extractors need derived from it.
+    
+    Entities, noun phrases, sentences and statistics all read the same doc,
+    so a text is tokenized and tagged once however many of them are used.
+    Views are computed on first access.
+    """
+    
+    def __init__(self, text: str, doc: Optional[Any]):
+        self.text = text
+        self.doc = doc
+    
+    @cached_property
+    def noun_phrases(self) -> List[str]:
+        """Lowercased noun phrases, one entry per occurrence.
+        
+        Phrases are maximal runs of adjectives and nouns trimmed to end on a
+        noun. Like TextBlob's fast extractor, single words are kept only if
+        they are proper nouns.
+        """
+        if self.doc is None or not self.doc.has_annotation("POS"):
+            return []
+        
+        phrases = []
+        run = []
+        for token in list(self.doc) + [None]:
+            if token is not None and token.pos_ in _PHRASE_POS:
+                run.append(token)
+                continue
+            
+            while run and run[-1].pos_ not in _PHRASE_HEAD_POS:
+                run.pop()
+            if len(run) > 1 or (run and run[0].pos_ == "PROPN"):
+                phrases.append(" ".join(t.text for t in run).lower())
+            run = []
+        
+        return phrases
+    
+    @cached_property
+    def sentences(self) -> List[str]:
+        """Sentence texts, using the senter or parser boundaries when the pipeline has them."""
+        if self.doc is None or not self.doc.has_annotation("SENT_START"):
+            return [self.text.strip()] if self.text.strip() else []
+        return [sent.text.strip() for sent in self.doc.sents if sent.text.strip()]
+    
+    @cached_property
+    def stats(self) -> Dict[str, Any]:
+        """Basic statistics about the text."""
+        words = self.text.split()
+        sentences = self.sentences
+        
+        return {
+            'char_count': len(self.text),
+            'word_count': len(words),
+            'sentence_count': len(sentences),
+            'avg_words_per_sentence': len(words) / max(len(sentences), 1),
+            'unique_words': len(set(word.lower() for word in words))
+        }
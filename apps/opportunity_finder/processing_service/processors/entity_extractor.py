@@ -1,13 +1,20 @@
 """Entity extraction and keyword identification."""
 
-import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from collections import Counter
 import spacy
 from textblob import TextBlob
 from loguru import logger
 
 from config import Settings
+from .document_analysis import DocumentAnalysis
+from .relevance_scorer import RelevanceScorer
+from .term_matcher import TermMatcher
+
+# en_core_web_sm components no extractor reads
+_UNUSED_PIPES = ["parser", "lemmatizer"]
+# Components only keyword extraction (noun phrases) and sentence stats read
+_ANALYSIS_PIPES = ["tagger", "attribute_ruler", "senter"]
 
 
 class EntityExtractor:
@@ -16,36 +23,26 @@ class EntityExtractor:
     def __init__(self, settings: Settings):
         self.settings = settings
         
-        # Load spaCy model
+        # Load spaCy model with only the components the enabled extractors need
         try:
-            self.nlp = spacy.load("en_core_web_sm")
+            exclude = _UNUSED_PIPES if settings.extract_keywords else _UNUSED_PIPES + _ANALYSIS_PIPES
+            self.nlp = spacy.load("en_core_web_sm", exclude=exclude)
+            if "senter" in self.nlp.disabled:
+                # Sentence boundaries without the much slower parser
+                self.nlp.enable_pipe("senter")
+            if "tok2vec" in self.nlp.pipe_names and not self.nlp.get_pipe("tok2vec").listening_components:
+                # The small model's NER embeds tokens itself; the shared tok2vec only fed the parser
+                self.nlp.disable_pipe("tok2vec")
+            logger.info(f"spaCy pipeline: {self.nlp.pipe_names}")
         except OSError:
             logger.warning("spaCy model not found, entity extraction will be limited")
             self.nlp = None
         
-        # Define business/tech entity patterns
-        self.business_patterns = [
-            r'\b(?:startup|company|business|firm|corporation|enterprise|venture)\b',
-            r'\b(?:SaaS|PaaS|IaaS|B2B|B2C|API|SDK|platform)\b',
-            r'\b(?:market|industry|sector|vertical|niche)\b',
-            r'\b(?:revenue|profit|funding|investment|valuation)\b'
-        ]
-        
-        # Pain point indicators
-        self.pain_indicators = [
-            r'\b(?:problem|issue|challenge|difficulty|struggle)\b',
-            r'\b(?:frustrating|annoying|time-consuming|manual|tedious)\b',
-            r'\b(?:lacking|missing|need|want|wish|hope)\b',
-            r'\b(?:inefficient|slow|expensive|complicated)\b'
-        ]
-        
-        # Opportunity indicators
-        self.opportunity_indicators = [
-            r'\b(?:opportunity|gap|demand|potential|untapped)\b',
-            r'\b(?:solution|tool|app|service|platform|system)\b',
-            r'\b(?:automate|optimize|improve|streamline|simplify)\b',
-            r'\b(?:profitable|scalable|viable|marketable)\b'
-        ]
+        # Business terms, pain points, opportunities and technologies, matched in one scan
+        self.term_matcher = TermMatcher.from_file(settings.entity_terms_path)
+        
+        # Memoized keyword relevance scoring with hot-reloadable weights
+        self.relevance_scorer = RelevanceScorer(settings)
     
     def extract_entities(self, text: str) -> Dict[str, List[str]]:
         """Extract named entities from text.
@@ -56,6 +53,49 @@ class EntityExtractor:
         Returns:
             Dictionary of entity types and their values
         """
+        return self.extract_entities_batch([text])[0]
+    
+    def extract_entities_batch(self, texts: List[str]) -> List[Dict[str, List[str]]]:
+        """Extract named entities from many texts with one spaCy pass.
+        
+        Args:
+            texts: Input texts
+            
+        Returns:
+            Entity dictionaries aligned with texts
+        """
+        return [self.extract_entities_from(analysis) for analysis in self.analyze_batch(texts)]
+    
+    def analyze_batch(self, texts: List[str]) -> List[DocumentAnalysis]:
+        """Parse many texts once for entity, keyword and statistics extraction.
+        
+        Texts are streamed through ``nlp.pipe`` in batches of
+        ``spacy_batch_size``, using ``spacy_n_process`` processes.
+        
+        Args:
+            texts: Input texts
+            
+        Returns:
+            Analyses aligned with texts
+        """
+        docs = [None] * len(texts)
+        
+        # Use spaCy if available
+        if self.nlp:
+            indices = [i for i, text in enumerate(texts) if text]
+            piped = self.nlp.pipe(
+                (texts[i] for i in indices),
+                batch_size=self.settings.spacy_batch_size,
+                n_process=self.settings.spacy_n_process
+            )
+            for i, doc in zip(indices, piped):
+                docs[i] = doc
+        
+        return [DocumentAnalysis(text, doc) for text, doc in zip(texts, docs)]
+    
+    def extract_entities_from(self, analysis: DocumentAnalysis) -> Dict[str, List[str]]:
+        """Combine spaCy entities with pattern and tech-term matches for one analyzed text."""
+        text, doc = analysis.text, analysis.doc
         entities = {
             'organizations': [],
             'technologies': [],
@@ -67,10 +107,7 @@ class EntityExtractor:
         if not text:
             return entities
         
-        # Use spaCy if available
-        if self.nlp:
-            doc = self.nlp(text)
-            
+        if doc is not None:
             for ent in doc.ents:
                 if ent.label_ in ['ORG', 'PRODUCT']:
                     entities['organizations'].append(ent.text.strip())
@@ -79,13 +116,9 @@ class EntityExtractor:
                     if any(keyword in ent.text.lower() for keyword in ['ceo', 'founder', 'startup']):
                         entities['business_terms'].append(ent.text.strip())
         
-        # Extract pattern-based entities
-        entities['business_terms'].extend(self._extract_patterns(text, self.business_patterns))
-        entities['pain_points'].extend(self._extract_patterns(text, self.pain_indicators))
-        entities['opportunities'].extend(self._extract_patterns(text, self.opportunity_indicators))
-        
-        # Extract technology terms
-        entities['technologies'].extend(self._extract_tech_terms(text))
+        # Extract pattern-based entities and technology terms
+        for entity_type, terms in self.term_matcher.match(text).items():
+            entities.setdefault(entity_type, []).extend(terms)
         
         # Remove duplicates and clean
         for entity_type in entities:
@@ -94,12 +127,18 @@ class EntityExtractor:
         
         return entities
     
-    def extract_keywords(self, text: str, max_keywords: int = 20) -> List[Dict[str, Any]]:
+    def extract_keywords(
+        self,
+        text: str,
+        max_keywords: int = 20,
+        analysis: Optional[DocumentAnalysis] = None
+    ) -> List[Dict[str, Any]]:
         """Extract important keywords from text.
         
         Args:
             text: Input text
             max_keywords: Maximum number of keywords to return
+            analysis: Existing analysis of text from analyze_batch, to avoid parsing it again
             
         Returns:
             List of keyword dictionaries with scores
@@ -110,11 +149,12 @@ class EntityExtractor:
         keywords = []
         
         try:
-            # Use TextBlob for noun phrase extraction
-            blob = TextBlob(text)
-            
-            # Extract noun phrases
-            noun_phrases = [str(phrase).lower() for phrase in blob.noun_phrases]
+            # Extract noun phrases from the spaCy parse, or with TextBlob without a model
+            if self.nlp:
+                analysis = analysis or self.analyze_batch([text])[0]
+                noun_phrases = analysis.noun_phrases
+            else:
+                noun_phrases = [str(phrase).lower() for phrase in TextBlob(text).noun_phrases]
             
             # Count frequency
             phrase_counts = Counter(noun_phrases)
@@ -140,54 +180,6 @@ class EntityExtractor:
             logger.debug(f"Keyword extraction failed: {e}")
             return []
     
-    def _extract_patterns(self, text: str, patterns: List[str]) -> List[str]:
-        """Extract text matching specific patterns.
-        
-        Args:
-            text: Input text
-            patterns: List of regex patterns
-            
-        Returns:
-            List of matched terms
-        """
-        matches = []
-        text_lower = text.lower()
-        
-        for pattern in patterns:
-            found = re.findall(pattern, text_lower, re.IGNORECASE)
-            matches.extend(found)
-        
-        return matches
-    
-    def _extract_tech_terms(self, text: str) -> List[str]:
-        """Extract technology-related terms.
-        
-        Args:
-            text: Input text
-            
-        Returns:
-            List of technology terms
-        """
-        tech_terms = []
-        text_lower = text.lower()
-        
-        # Common tech terms and acronyms
-        tech_keywords = [
-            'ai', 'artificial intelligence', 'machine learning', 'ml', 'deep learning',
-            'nlp', 'natural language processing', 'computer vision', 'automation',
-            'api', 'rest', 'graphql', 'microservices', 'cloud', 'aws', 'azure', 'gcp',
-            'docker', 'kubernetes', 'serverless', 'lambda', 'database', 'sql', 'nosql',
-            'react', 'angular', 'vue', 'node.js', 'python', 'javascript', 'typescript',
-            'mobile app', 'ios', 'android', 'flutter', 'react native',
-            'blockchain', 'cryptocurrency', 'web3', 'smart contracts'
-        ]
-        
-        for term in tech_keywords:
-            if term in text_lower:
-                tech_terms.append(term)
-        
-        return tech_terms
-    
     def _calculate_business_relevance(self, phrase: str) -> float:
         """Calculate business relevance score for a phrase.
         
@@ -197,27 +189,4 @@ class EntityExtractor:
         Returns:
             Relevance score between 0 and 1
         """
-        score = 0.5  # Base score
-        
-        # Boost score for business-relevant terms
-        business_boosters = [
-            'market', 'customer', 'user', 'business', 'revenue', 'profit',
-            'solution', 'problem', 'opportunity', 'startup', 'company',
-            'tool', 'app', 'service', 'platform', 'software', 'technology'
-        ]
-        
-        for booster in business_boosters:
-            if booster in phrase:
-                score += 0.1
-        
-        # Reduce score for common but less relevant terms
-        reducers = [
-            'thing', 'stuff', 'way', 'time', 'people', 'person',
-            'good', 'bad', 'nice', 'great', 'awesome'
-        ]
-        
-        for reducer in reducers:
-            if reducer in phrase:
-                score -= 0.1
-        
-        return max(0.1, min(1.0, score))  # Clamp between 0.1 and 1.0
\ No newline at end of file
+        return self.relevance_scorer.score(phrase)
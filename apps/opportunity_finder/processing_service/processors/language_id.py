@@ -0,0 +1,216 @@
+"""Language identification with a fast classifier, a script shortcut and a hash cache."""
+
+import hashlib
+import re
+import unicodedata
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from langdetect import DetectorFactory, detect_langs
+from loguru import logger
+
+from config import Settings
+
+try:
+    import fasttext
+except ImportError:
+    fasttext = None
+
+# Set seed for consistent language detection
+DetectorFactory.seed = 0
+
+# (language code, confidence)
+Prediction = Tuple[str, float]
+UNKNOWN: Prediction = ("unknown", 0.0)
+
+_WORD_PATTERN = re.compile(r"[a-z']+")
+
+# English function words that are not also common words in other Latin-script languages
+_ENGLISH_FUNCTION_WORDS = frozenset([
+    "the", "and", "of", "to", "is", "are", "was", "were", "for", "with", "this", "that",
+    "you", "your", "how", "what", "why", "when", "who", "have", "has", "it", "it's", "i'm",
+    "my", "we", "our", "can", "any", "on", "be", "not", "or", "from", "about", "does", "just",
+    "there", "they", "their", "which", "will", "would", "should", "into", "than", "more",
+])
+
+# Scripts written by a single language, keyed by Unicode character name prefix
+_SINGLE_LANGUAGE_SCRIPTS = {
+    "HANGUL": "ko",
+    "HIRAGANA": "ja",
+    "KATAKANA": "ja",
+    "THAI": "th",
+    "GREEK": "el",
+    "HEBREW": "he",
+    "GEORGIAN": "ka",
+    "ARMENIAN": "hy",
+}
+
+
+def _script_shortcut(text: str, max_chars: int) -> Optional[Prediction]:
+    """Confident answer for short texts whose script or wording settles the language.
+    
+    Classifiers are least reliable on titles and one-liners, which is also
+    where these rules are most reliable: pure-ASCII text with enough
+    distinctly English function words is English, and text written mostly in
+    a script only one language uses is that language. Anything else returns
+    None and goes to the classifier; see LanguageIdentifier for how
+    low-confidence answers on short ASCII text are treated.
+    """
+    if len(text) > max_chars:
+        return None
+    
+    if text.isascii():
+        words = _WORD_PATTERN.findall(text.lower())
+        hits = sum(word in _ENGLISH_FUNCTION_WORDS for word in words)
+        if words and hits >= 2 and hits / len(words) >= 0.15:
+            return ("en", 1.0)
+        return None
+    
+    scripts = Counter(
+        unicodedata.name(char, "").split(" ", 1)[0]
+        for char in text if char.isalpha()
+    )
+    letters = sum(scripts.values())
+    for script, count in scripts.most_common(1):
+        if count / letters <= 0.5:
+            break
+        language = _SINGLE_LANGUAGE_SCRIPTS.get(script)
+        if language:
+            return (language, 1.0)
+        # Han without any kana or hangul is Chinese
+        if script == "CJK" and not scripts.keys() & {"HIRAGANA", "KATAKANA", "HANGUL"}:
+            return ("zh", 1.0)
+    return None
+
+
+class LangDetectBackend:
+    """Seeded langdetect; slow but has no model file to deploy."""
+    
+    name = "langdetect"
+    
+    def detect_batch(self, texts: List[str]) -> List[Prediction]:
+        predictions = []
+        for text in texts:
+            try:
+                best = detect_langs(text)[0]
+                predictions.append((best.lang, best.prob))
+            except Exception as e:
+                logger.debug(f"Language detection failed: {e}")
+                predictions.append(UNKNOWN)
+        return predictions
+
+
+class FastTextBackend:
+    """fastText lid.176 character n-gram classifier, predicting a whole batch per call."""
+    
+    name = "fasttext"
+    
+    def __init__(self, model_path: str):
+        self.model = fasttext.load_model(model_path)
+    
+    def detect_batch(self, texts: List[str]) -> List[Prediction]:
+        # predict() treats newlines as sample separators
+        labels, probs = self.model.predict([text.replace("\n", " ") for text in texts], k=1)
+        return [
+            (label[0].replace("__label__", ""), float(prob[0])) if label else UNKNOWN
+            for label, prob in zip(labels, probs)
+        ]
+
+
+class LanguageIdentifier:
+    """Pluggable language identification with a short-text shortcut and an LRU cache.
+    
+    Every text first goes through the script shortcut. The rest are looked up
+    by a 16-byte blake2b digest in an LRU cache, and the misses from a batch
+    are classified in a single backend call. Short ASCII texts the backend is
+    not confident about are taken to be English.
+    """
+    
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.backend = self._load_backend(settings)
+        self.cache: "OrderedDict[bytes, Prediction]" = OrderedDict()
+        self.stats = {'texts': 0, 'shortcut': 0, 'cache_hits': 0, 'classified': 0}
+        logger.info(f"Language identification backend: {self.backend.name}")
+    
+    @staticmethod
+    def _load_backend(settings: Settings):
+        if settings.language_id_backend == "fasttext":
+            if fasttext is None:
+                logger.warning("fasttext is not installed, falling back to langdetect")
+            else:
+                try:
+                    return FastTextBackend(settings.language_model_path)
+                except ValueError as e:
+                    # fasttext raises ValueError for a missing or unreadable model file
+                    logger.warning(f"Could not load {settings.language_model_path} ({e}), falling back to langdetect")
+        return LangDetectBackend()
+    
+    def detect(self, text: str) -> Prediction:
+        """Identify the language of one text.
+        
+        Args:
+            text: Input text
+        
+        Returns:
+            (language code, confidence); ("unknown", 0.0) if detection failed
+        """
+        return self.detect_batch([text])[0]
+    
+    def detect_batch(self, texts: List[str]) -> List[Prediction]:
+        """Identify the language of many texts with at most one backend call.
+        
+        Args:
+            texts: Input texts
+        
+        Returns:
+            Predictions aligned with texts
+        """
+        predictions: List[Optional[Prediction]] = [None] * len(texts)
+        # digest -> (text, indices waiting for it)
+        misses: Dict[bytes, Tuple[str, List[int]]] = {}
+        self.stats['texts'] += len(texts)
+        
+        for i, text in enumerate(texts):
+            shortcut = _script_shortcut(text, self.settings.language_shortcut_max_chars)
+            if shortcut:
+                predictions[i] = shortcut
+                self.stats['shortcut'] += 1
+                continue
+            
+            key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+            cached = self.cache.get(key)
+            if cached:
+                self.cache.move_to_end(key)
+                predictions[i] = cached
+                self.stats['cache_hits'] += 1
+            else:
+                misses.setdefault(key, (text, []))[1].append(i)
+        
+        if misses:
+            keys = list(misses)
+            results = self.backend.detect_batch([misses[key][0] for key in keys])
+            self.stats['classified'] += len(keys)
+            
+            for key, prediction in zip(keys, results):
+                text = misses[key][0]
+                if (
+                    prediction[1] < self.settings.language_short_text_min_confidence
+                    and len(text) <= self.settings.language_shortcut_max_chars
+                    and text.isascii()
+                ):
+                    # Terse ASCII titles ("Show HN: ...", "Best CRM for B2B SaaS?") are mostly
+                    # English product jargon that classifiers scatter across Germanic languages
+                    prediction = ("en", prediction[1])
+                for i in misses[key][1]:
+                    predictions[i] = prediction
+                self.cache[key] = prediction
+            
+            while len(self.cache) > self.settings.language_cache_size:
+                self.cache.popitem(last=False)
+        
+        return predictions
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Counts of texts answered by the shortcut, the cache and the backend."""
+        return {**self.stats, 'backend': self.backend.name, 'cache_size': len(self.cache)}
@@ -0,0 +1,225 @@
+"""Near-duplicate detection with MinHash signatures and an LSH band index."""
+
+import hashlib
+import re
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from config import Settings
+
+# Mersenne prime modulus for the universal hash permutations
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+class MinHasher:
+    """Computes MinHash signatures over word shingles."""
+    
+    def __init__(self, num_perm: int, shingle_words: int, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_words = shingle_words
+        
+        # Fixed seed so every worker process produces comparable signatures
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    
+    def shingles(self, text: str) -> List[str]:
+        """Lowercased word n-grams; short texts fall back to the whole text."""
+        words = _WORD_PATTERN.findall(text.lower())
+        if len(words) <= self.shingle_words:
+            return [" ".join(words)] if words else []
+        return [
+            " ".join(words[i:i + self.shingle_words])
+            for i in range(len(words) - self.shingle_words + 1)
+        ]
+    
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of a text, or None if it has no words."""
+        shingles = set(self.shingles(text))
+        if not shingles:
+            return None
+        
+        # Stable 32-bit shingle hashes (Python's hash() is salted per process)
+        hashes = np.array(
+            [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') for s in shingles],
+            dtype=np.uint64
+        )
+        
+        with np.errstate(over='ignore'):
+            permuted = (np.outer(hashes, self.a) + self.b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+class _MemoryIndex:
+    """In-process LSH index; entries older than the retention window are pruned."""
+    
+    def __init__(self):
+        self.buckets: Dict[str, Dict[str, float]] = {}
+        self.signatures: Dict[str, tuple] = {}
+        # (seen_at, item_id) in insertion order, so expiry only looks at the oldest entries
+        self.expiry: deque = deque()
+    
+    def candidates(self, band_keys: List[str], cutoff: float) -> List[str]:
+        found = []
+        for key in band_keys:
+            for item_id, seen_at in self.buckets.get(key, {}).items():
+                if seen_at >= cutoff and item_id not in found:
+                    found.append(item_id)
+        return found
+    
+    def get_signatures(self, item_ids: List[str]) -> List[Optional[bytes]]:
+        return [self.signatures.get(item_id, (None,))[0] for item_id in item_ids]
+    
+    def insert(self, item_id: str, band_keys: List[str], signature: bytes, now: float, cutoff: float):
+        for key in band_keys:
+            self.buckets.setdefault(key, {})[item_id] = now
+        self.signatures[item_id] = (signature, now, band_keys)
+        self.expiry.append((now, item_id))
+        
+        # Drop expired items so the index stays bounded by the retention window
+        while self.expiry and self.expiry[0][0] < cutoff:
+            _, old_id = self.expiry.popleft()
+            entry = self.signatures.get(old_id)
+            # A re-inserted item has a newer entry further back in the queue
+            if entry is None or entry[1] >= cutoff:
+                continue
+            _, _, old_keys = self.signatures.pop(old_id)
+            for key in old_keys:
+                bucket = self.buckets.get(key)
+                if bucket is not None:
+                    bucket.pop(old_id, None)
+                    if not bucket:
+                        del self.buckets[key]
+
+
+class _RedisIndex:
+    """LSH index in Redis shared by all workers.
+    
+    Each band bucket is a sorted set of item ids scored by first-seen time;
+    signatures are plain keys. Both expire with the retention window.
+    """
+    
+    def __init__(self, redis_url: str, prefix: str, retention_seconds: int):
+        import redis
+        self.redis = redis.Redis.from_url(redis_url)
+        self.prefix = prefix
+        self.retention_seconds = retention_seconds
+    
+    def candidates(self, band_keys: List[str], cutoff: float) -> List[str]:
+        pipe = self.redis.pipeline(transaction=False)
+        for key in band_keys:
+            pipe.zrangebyscore(f"{self.prefix}:band:{key}", cutoff, "+inf")
+        
+        found = []
+        for members in pipe.execute():
+            for member in members:
+                item_id = member.decode('utf-8')
+                if item_id not in found:
+                    found.append(item_id)
+        return found
+    
+    def get_signatures(self, item_ids: List[str]) -> List[Optional[bytes]]:
+        if not item_ids:
+            return []
+        return self.redis.mget([f"{self.prefix}:sig:{item_id}" for item_id in item_ids])
+    
+    def insert(self, item_id: str, band_keys: List[str], signature: bytes, now: float, cutoff: float):
+        pipe = self.redis.pipeline(transaction=False)
+        for key in band_keys:
+            bucket = f"{self.prefix}:band:{key}"
+            pipe.zadd(bucket, {item_id: now})
+            pipe.zremrangebyscore(bucket, "-inf", f"({cutoff}")
+            pipe.expire(bucket, self.retention_seconds)
+        pipe.set(f"{self.prefix}:sig:{item_id}", signature, ex=self.retention_seconds)
+        pipe.execute()
+
+
+class NearDuplicateDetector:
+    """Flags items whose cleaned text nearly matches one seen recently.
+    
+    Signatures are split into bands; items sharing any band bucket are
+    candidates, and a candidate is a duplicate when the estimated Jaccard
+    similarity of the two signatures reaches the threshold. Only originals
+    are indexed, so a duplicate always points at the first copy seen.
+    """
+    
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.hasher = MinHasher(settings.near_duplicate_num_perm, settings.near_duplicate_shingle_words)
+        self.bands = settings.near_duplicate_bands
+        self.rows = settings.near_duplicate_num_perm // self.bands
+        self.threshold = settings.near_duplicate_threshold
+        self.retention_seconds = settings.near_duplicate_retention_hours * 3600
+        
+        if settings.near_duplicate_backend == "redis":
+            self.index = _RedisIndex(settings.redis_url, "neardup", self.retention_seconds)
+        else:
+            self.index = _MemoryIndex()
+        
+        self.stats = {
+            'checked': 0,
+            'duplicates': 0,
+            'saved_chars': 0,
+        }
+        # Value of stats['checked'] when the stats were last logged
+        self.last_logged_checked = 0
+    
+    def _band_keys(self, signature: np.ndarray) -> List[str]:
+        """One bucket key per band of the signature."""
+        return [
+            f"{band}:{hashlib.blake2b(signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8).hexdigest()}"
+            for band in range(self.bands)
+        ]
+    
+    def check(self, item_id: str, text: str) -> Optional[str]:
+        """Return the id of the original this item duplicates, or index it and return None.
+        
+        Args:
+            item_id: Identifier of the item being processed
+            text: Cleaned text of the item
+        
+        Returns:
+            Id of the earlier near-identical item, or None for an original
+        """
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return None
+        
+        self.stats['checked'] += 1
+        band_keys = self._band_keys(signature)
+        now = time.time()
+        cutoff = now - self.retention_seconds
+        
+        candidates = [c for c in self.index.candidates(band_keys, cutoff) if c != item_id]
+        for candidate, blob in zip(candidates, self.index.get_signatures(candidates)):
+            if blob is None:
+                continue
+            similarity = float(np.mean(np.frombuffer(blob, dtype=np.uint32) == signature))
+            if similarity >= self.threshold:
+                self.stats['duplicates'] += 1
+                self.stats['saved_chars'] += len(text)
+                logger.debug(f"Item {item_id} is a near-duplicate of {candidate} (similarity {similarity:.2f})")
+                return candidate
+        
+        self.index.insert(item_id, band_keys, signature.tobytes(), now, cutoff)
+        return None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Duplicate rate and the downstream work skipped because of it.
+        
+        Every duplicate skips entity extraction and one embedding; embedding
+        tokens are estimated at four characters per token.
+        """
+        checked = self.stats['checked']
+        return {
+            **self.stats,
+            'duplicate_rate': self.stats['duplicates'] / checked if checked else 0.0,
+            'saved_embeddings': self.stats['duplicates'],
+            'saved_embedding_tokens': self.stats['saved_chars'] // 4,
+        }
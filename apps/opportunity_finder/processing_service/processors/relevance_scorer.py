@@ -0,0 +1,139 @@
+"""Memoized business-relevance scoring for keyword phrases."""
+
+import json
+import os
+import time
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from config import Settings
+from .term_matcher import TermMatcher
+
+# Weights shipped with the service; RELEVANCE_WEIGHTS_PATH can point elsewhere
+DEFAULT_WEIGHTS_PATH = Path(__file__).with_name("relevance_weights.json")
+
+
+class _Weights:
+    """One loaded weights file: the term automaton and the precomputed score table."""
+    
+    def __init__(self, config: Dict[str, Any], cache_size: int):
+        booster_terms = config["boosters"]["terms"]
+        reducer_terms = config["reducers"]["terms"]
+        # A term listed twice counts twice, as it did in the old loops
+        self.booster_counts = Counter(booster_terms)
+        self.reducer_counts = Counter(reducer_terms)
+        
+        # Terms match as case-sensitive substrings, like `term in phrase`
+        self.matcher = TermMatcher({
+            "boosters": {"match": "substring", "terms": list(self.booster_counts)},
+            "reducers": {"match": "substring", "terms": list(self.reducer_counts)},
+        }, lowercase=False)
+        
+        # Score for every (boosters found, reducers found) pair, built with the
+        # same sequence of float additions as the old per-term loops
+        booster_weight = config["boosters"]["weight"]
+        reducer_weight = config["reducers"]["weight"]
+        self.table = {}
+        boosted = config["base_score"]
+        for boosters in range(len(booster_terms) + 1):
+            score = boosted
+            for reducers in range(len(reducer_terms) + 1):
+                self.table[boosters, reducers] = max(config["min_score"], min(config["max_score"], score))
+                score -= reducer_weight
+            boosted += booster_weight
+        
+        # Terms without whitespace can only occur inside one word, so a phrase's
+        # matches are the union of its words' matches, which recur far more
+        terms = list(self.booster_counts) + list(self.reducer_counts)
+        self.per_word = not any(char.isspace() for term in terms for char in term)
+        self.word_terms = lru_cache(maxsize=cache_size)(self._match)
+    
+    def _match(self, text: str):
+        found = self.matcher.match(text)
+        return frozenset(found["boosters"]), frozenset(found["reducers"])
+    
+    def score(self, phrase: str) -> float:
+        if self.per_word:
+            words = phrase.split()
+            if len(words) == 1:
+                found_boosters, found_reducers = self.word_terms(words[0])
+            else:
+                found_boosters, found_reducers = set(), set()
+                for word in words:
+                    word_boosters, word_reducers = self.word_terms(word)
+                    found_boosters |= word_boosters
+                    found_reducers |= word_reducers
+        else:
+            found_boosters, found_reducers = self._match(phrase)
+        
+        boosters = sum(self.booster_counts[term] for term in found_boosters)
+        reducers = sum(self.reducer_counts[term] for term in found_reducers)
+        return self.table[boosters, reducers]
+
+
+class RelevanceScorer:
+    """Scores phrases by business-relevant and generic terms they contain.
+    
+    A phrase scores the base score, plus the booster weight for each booster
+    term it contains, minus the reducer weight for each reducer term, clamped
+    to [min_score, max_score]. All terms are found in one automaton scan,
+    the score comes from a table precomputed per (boosters, reducers) count,
+    and both per-word matches and per-phrase scores are memoized in bounded
+    LRUs because the same words and phrases recur across the corpus. The
+    weights file is re-read when its modification time changes.
+    """
+    
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.path = settings.relevance_weights_path or DEFAULT_WEIGHTS_PATH
+        self.mtime: Optional[float] = None
+        self.next_check = 0.0
+        self._load()
+    
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            weights = _Weights(json.load(f), self.settings.relevance_cache_size)
+        self.mtime = os.path.getmtime(self.path)
+        # A new cache per load so stale scores never outlive a weights change
+        self._score = lru_cache(maxsize=self.settings.relevance_cache_size)(weights.score)
+    
+    def _maybe_reload(self):
+        """Reload the weights if the file changed, checking at most once per reload interval."""
+        now = time.monotonic()
+        if self.settings.relevance_reload_interval <= 0 or now < self.next_check:
+            return
+        self.next_check = now + self.settings.relevance_reload_interval
+        
+        try:
+            if os.path.getmtime(self.path) != self.mtime:
+                self._load()
+                logger.info(f"Reloaded relevance weights from {self.path}")
+        except (OSError, ValueError, KeyError) as e:
+            # Keep scoring with the last good weights
+            logger.error(f"Failed to reload relevance weights from {self.path}: {e}")
+    
+    def score(self, phrase: str) -> float:
+        """Relevance score between min_score and max_score for a phrase.
+        
+        Args:
+            phrase: Input phrase
+        
+        Returns:
+            Relevance score
+        """
+        self._maybe_reload()
+        return self._score(phrase)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """LRU cache statistics."""
+        info = self._score.cache_info()
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'hit_rate': info.hits / max(info.hits + info.misses, 1)
+        }
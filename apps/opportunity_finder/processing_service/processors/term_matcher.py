@@ -0,0 +1,105 @@
+"""Single-pass multi-category term matcher."""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Term lists shipped with the service; ENTITY_TERMS_PATH can point elsewhere
+DEFAULT_TERMS_PATH = Path(__file__).with_name("entity_terms.json")
+
+
+def _trie_regex(terms: List[str]) -> str:
+    """Build an alternation factored by shared prefixes.
+    
+    ``sre`` tries alternatives one by one at every position; factoring the
+    terms into a trie means each position costs roughly one character test
+    per trie level instead of one attempt per term. Longer continuations
+    come first so the longest term starting at a position is matched.
+    """
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        branches.sort(key=len, reverse=True)
+        optional = "" in node
+        if not branches:
+            return ""
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")" + ("?" if optional else "")
+    
+    return build(trie)
+
+
+def _is_word_boundary(text: str, index: int) -> bool:
+    """Same test as the regex ``\\b`` assertion."""
+    before = index > 0 and (text[index - 1].isalnum() or text[index - 1] == "_")
+    after = index < len(text) and (text[index].isalnum() or text[index] == "_")
+    return before != after
+
+
+class TermMatcher:
+    """Tags every category's terms in one regex scan over (by default lowercased) text.
+    
+    Each category matches its terms either as whole words (``"word"``, the
+    behaviour of ``\\b(?:a|b)\\b`` patterns) or anywhere in the text
+    (``"substring"``, the behaviour of ``term in text``). The scan uses a
+    zero-width lookahead so overlapping terms are all found; every term that
+    matches at a position is a prefix of the longest one, so the longest
+    match plus its known prefixes gives the complete set.
+    """
+    
+    def __init__(self, categories: Dict[str, Dict[str, object]], lowercase: bool = True):
+        self.categories = list(categories)
+        # With lowercase=False, terms and text are compared exactly as given
+        self.lowercase = lowercase
+        # term -> [(category, mode), ...]
+        self.term_categories: Dict[str, List[tuple]] = {}
+        
+        for category, spec in categories.items():
+            mode = spec.get("match", "word")
+            if mode not in ("word", "substring"):
+                raise ValueError(f"Unknown match mode for {category}: {mode}")
+            for term in spec["terms"]:
+                key = term.lower() if lowercase else term
+                self.term_categories.setdefault(key, []).append((category, mode))
+        
+        terms = list(self.term_categories)
+        # Every term that is a prefix of a longer term also matches where the longer one does
+        self.prefixes: Dict[str, List[str]] = {
+            term: [other for other in terms if term.startswith(other)]
+            for term in terms
+        }
+        self.pattern = re.compile("(?=(" + _trie_regex(terms) + "))") if terms else None
+    
+    @classmethod
+    def from_file(cls, path: Optional[str] = None) -> "TermMatcher":
+        """Load categories from a JSON file of ``{category: {match, terms}}``."""
+        with open(path or DEFAULT_TERMS_PATH, encoding="utf-8") as f:
+            return cls(json.load(f))
+    
+    def match(self, text: str) -> Dict[str, List[str]]:
+        """Return the distinct terms found per category, in order of first occurrence."""
+        found: Dict[str, Dict[str, None]] = {category: {} for category in self.categories}
+        if not text or self.pattern is None:
+            return {category: [] for category in self.categories}
+        
+        text_lower = text.lower() if self.lowercase else text
+        for m in self.pattern.finditer(text_lower):
+            start = m.start()
+            for term in self.prefixes[m.group(1)]:
+                end = start + len(term)
+                for category, mode in self.term_categories[term]:
+                    if mode == "word" and not (
+                        _is_word_boundary(text_lower, start) and _is_word_boundary(text_lower, end)
+                    ):
+                        continue
+                    found[category][term] = None
+        
+        return {category: list(terms) for category, terms in found.items()}
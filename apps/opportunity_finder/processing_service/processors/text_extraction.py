@@ -0,0 +1,119 @@
+"""Source-aware text extraction from raw items, driven by per-source field lists."""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from config import Settings
+
+DEFAULT_FIELDS_PATH = Path(__file__).with_name("source_fields.json")
+
+# raw_data keys that name the site behind aggregating scrapers (browser_automated, smart_http)
+_PLATFORM_KEYS = ("platform", "source")
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+
+
+def normalize_source(name: str) -> str:
+    """Registry key for a source name: "dev.to", "product_hunt" and "DevTo" all map to "devto"."""
+    return _NON_ALNUM.sub("", name.lower())
+
+
+class TextExtractor:
+    """Extracts an item's text from the raw_data fields registered for its source.
+    
+    Sources are registered with the raw_data fields holding their text, in
+    output order: from source_fields.json at startup, or with register() by
+    code that adds a scraper. Items whose source_type is not registered are
+    resolved through raw_data["platform"] or raw_data["source"], which is how
+    BrowserScraper and SmartHttpScraper name the site an item came from.
+    
+    Field values are read straight from raw_data; a body held in a single
+    field is returned as the same string object, and several fields are
+    joined with one copy.
+    """
+    
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.fields: Dict[str, Tuple[str, ...]] = {}
+        # Raw source_type / platform name -> registry key, or None if not registered
+        self.aliases: Dict[str, Optional[str]] = {}
+        with open(settings.source_fields_path or DEFAULT_FIELDS_PATH, encoding="utf-8") as f:
+            for source, fields in json.load(f).items():
+                self.register(source, fields)
+        # source -> counts of items seen, extracted and dropped for having no text
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self.total = 0
+    
+    def register(self, source: str, fields: Sequence[str]):
+        """Register the raw_data fields that hold a source's text.
+        
+        Args:
+            source: Source name; normalized with normalize_source
+            fields: raw_data keys, in the order their text is joined
+        """
+        self.fields[normalize_source(source)] = tuple(fields)
+        self.aliases.clear()
+    
+    def _lookup(self, name: str) -> Optional[str]:
+        if name not in self.aliases:
+            key = normalize_source(name)
+            self.aliases[name] = key if key in self.fields else None
+        return self.aliases[name]
+    
+    def resolve_source(self, raw_item: Dict[str, Any]) -> str:
+        """Registered source of an item, or its normalized source_type if none matches."""
+        source_type = raw_item.get('source_type') or ''
+        source = self._lookup(source_type)
+        if source:
+            return source
+        
+        raw_data = raw_item.get('raw_data') or {}
+        for key in _PLATFORM_KEYS:
+            platform = raw_data.get(key)
+            if isinstance(platform, str):
+                source = self._lookup(platform)
+                if source:
+                    return source
+        return normalize_source(source_type) or 'unknown'
+    
+    def extract(self, raw_item: Dict[str, Any]) -> str:
+        """Text content of a raw item; empty if its source is unknown or its fields are empty.
+        
+        Args:
+            raw_item: Raw item from ingestion service
+        
+        Returns:
+            Non-empty string fields joined with spaces, stripped
+        """
+        source = self.resolve_source(raw_item)
+        fields = self.fields.get(source, ())
+        raw_data = raw_item.get('raw_data') or {}
+        
+        parts: List[str] = [
+            value for value in map(raw_data.get, fields) if value and isinstance(value, str)
+        ]
+        
+        # str.strip returns the string itself when there is nothing to strip
+        text = parts[0].strip() if len(parts) == 1 else ' '.join(parts).strip()
+        self._count(source, bool(text), registered=bool(fields))
+        return text
+    
+    def _count(self, source: str, extracted: bool, registered: bool):
+        counts = self.stats.get(source)
+        if counts is None:
+            counts = self.stats[source] = {'items': 0, 'extracted': 0, 'dropped': 0}
+            if not registered:
+                logger.warning(f"No text fields registered for source {source}; its items are dropped")
+        counts['items'] += 1
+        counts['extracted' if extracted else 'dropped'] += 1
+        self.total += 1
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-source item counts and coverage (share of items with text)."""
+        return {
+            source: {**counts, 'coverage': counts['extracted'] / counts['items']}
+            for source, counts in self.stats.items()
+        }
@@ -1,15 +1,67 @@
 """Text processing utilities for cleaning and normalization."""
 
 import re
-from typing import List
-from langdetect import detect, DetectorFactory
+from typing import List, Optional
 from textblob import TextBlob
 from loguru import logger
 
 from config import Settings
+from .document_analysis import DocumentAnalysis
+from .language_id import LanguageIdentifier, UNKNOWN
 
-# Set seed for consistent language detection
-DetectorFactory.seed = 0
+_HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+# Every character of the old alternation ([a-zA-Z]|[0-9]|[$-_@.&+]|[!*\(\),]|%XX) as one class
+_URL_PATTERN = re.compile(r'https?://[$-_a-z!*\\(),]+')
+_EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+# Whitespace and special characters both become spaces and whitespace runs then collapse, so
+# every run of characters that are neither word characters nor basic punctuation becomes one space
+_SEPARATOR_PATTERN = re.compile(r'[^\w.,!?;:()\-\'\"]+')
+_ELLIPSIS_PATTERN = re.compile(r'\.{4,}')
+_EXCLAMATION_PATTERN = re.compile(r'!{2,}')
+_QUESTION_PATTERN = re.compile(r'\?{2,}')
+
+
+def _clean(text: str) -> str:
+    """Strip markup, links and special characters and normalize whitespace, without truncating.
+    
+    Character filtering and whitespace collapsing share one pass. HTML, URL
+    and email removal stay separate because each can change what the next
+    matches, and they and the punctuation passes are skipped when their
+    marker substring is absent, which is the common case for scraped posts.
+    """
+    if '<' in text:
+        text = _HTML_TAG_PATTERN.sub(' ', text)
+    if '://' in text:
+        text = _URL_PATTERN.sub(' ', text)
+    if '@' in text:
+        text = _EMAIL_PATTERN.sub(' ', text)
+    
+    text = _SEPARATOR_PATTERN.sub(' ', text)
+    
+    # Remove excessive punctuation
+    if '....' in text:
+        text = _ELLIPSIS_PATTERN.sub('...', text)
+    if '!!' in text:
+        text = _EXCLAMATION_PATTERN.sub('!', text)
+    if '??' in text:
+        text = _QUESTION_PATTERN.sub('?', text)
+    
+    return text.strip()
+
+
+def _safe_cut(text: str, end: int) -> int:
+    """Last position before end where cleaning a prefix cannot differ from cleaning the whole text.
+    
+    The cut must fall on whitespace, which no URL, email or punctuation run
+    contains, after the last '>' (tags can contain whitespace) and before any
+    later '<' (it may still close after the cut). Returns 0 if there is no
+    such position.
+    """
+    last_close = text.rfind('>', 0, end)
+    open_tag = text.find('<', last_close + 1, end)
+    if open_tag != -1:
+        end = open_tag
+    return max(0, *(text.rfind(ws, last_close + 1, end) for ws in (' ', '\n', '\t', '\r')))
 
 
 class TextProcessor:
@@ -18,6 +70,7 @@ class TextProcessor:
     def __init__(self, settings: Settings):
         self.settings = settings
         self.supported_languages = set(settings.supported_languages)
+        self.language_identifier = LanguageIdentifier(settings)
         
     def clean_text(self, text: str) -> str:
         """Clean and normalize text content.
@@ -31,29 +84,41 @@ class TextProcessor:
         if not text:
             return ""
         
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', ' ', text)
-        
-        # Remove URLs
-        text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', ' ', text)
-        
-        # Remove email addresses
-        text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', ' ', text)
-        
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s.,!?;:()\-\'\"]', ' ', text)
+        # Long bodies (newsletters) only need cleaning up to the truncation point
+        if len(text) > 2 * self.settings.max_text_length:
+            return self.clean_text_streaming(text)
         
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove excessive punctuation
-        text = re.sub(r'[.]{3,}', '...', text)
-        text = re.sub(r'[!]{2,}', '!', text)
-        text = re.sub(r'[?]{2,}', '?', text)
+        return self._truncate(_clean(text))
+    
+    def clean_text_streaming(self, text: str) -> str:
+        """Clean a long text, stopping once max_text_length characters are produced.
         
-        # Trim and check length
-        text = text.strip()
+        Cleans growing prefixes of the text, each cut at whitespace outside
+        any HTML tag so no pattern can match across the cut, until the
+        cleaned prefix is longer than max_text_length. The result is the same
+        as clean_text on the whole text.
         
+        Args:
+            text: Raw text to clean
+            
+        Returns:
+            Cleaned text
+        """
+        limit = self.settings.max_text_length
+        window = limit + limit // 2
+        
+        while window < len(text):
+            cut = _safe_cut(text, window)
+            if cut:
+                cleaned = _clean(text[:cut])
+                if len(cleaned) > limit:
+                    return self._truncate(cleaned)
+            window *= 2
+        
+        return self._truncate(_clean(text))
+    
+    def _truncate(self, text: str) -> str:
+        """Truncate cleaned text to max_text_length."""
         # Truncate if too long
         if len(text) > self.settings.max_text_length:
             text = text[:self.settings.max_text_length]
@@ -73,16 +138,26 @@ class TextProcessor:
         Returns:
             True if language is supported
         """
-        if not text or len(text) < self.settings.min_text_length:
-            return False
+        return self.are_supported_languages([text])[0]
+    
+    def are_supported_languages(self, texts: List[str]) -> List[bool]:
+        """Detect which texts are in a supported language, classifying them in one batch.
         
-        try:
-            detected_lang = detect(text)
-            return detected_lang in self.supported_languages
-        except Exception as e:
-            logger.debug(f"Language detection failed: {e}")
-            # Default to English assumption for short texts
-            return True
+        Args:
+            texts: Texts to check
+            
+        Returns:
+            True for each text whose language is supported, aligned with texts
+        """
+        results = [False] * len(texts)
+        indices = [i for i, text in enumerate(texts) if text and len(text) >= self.settings.min_text_length]
+        predictions = self.language_identifier.detect_batch([texts[i] for i in indices])
+        
+        for i, (language, _) in zip(indices, predictions):
+            # Keep texts the detector could not classify rather than dropping them
+            results[i] = language == UNKNOWN[0] or language in self.supported_languages
+        
+        return results
     
     def extract_sentences(self, text: str) -> List[str]:
         """Extract sentences from text.
@@ -102,15 +177,19 @@ class TextProcessor:
             sentences = re.split(r'[.!?]+', text)
             return [s.strip() for s in sentences if s.strip()]
     
-    def get_text_stats(self, text: str) -> dict:
+    def get_text_stats(self, text: str, analysis: Optional[DocumentAnalysis] = None) -> dict:
         """Get basic statistics about the text.
         
         Args:
             text: Input text
+            analysis: Existing analysis of text, whose sentences are used instead of TextBlob's
             
         Returns:
             Dictionary with text statistics
         """
+        if analysis is not None:
+            return analysis.stats
+        
         words = text.split()
         sentences = self.extract_sentences(text)
         
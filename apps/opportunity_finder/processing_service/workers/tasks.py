@@ -1,7 +1,7 @@
 """Celery tasks for processing raw opportunity items."""
 
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from kafka import KafkaProducer
 from loguru import logger
@@ -9,30 +9,83 @@ from loguru import logger
 from .celery_app import celery_app
 from processors.text_processor import TextProcessor
 from processors.entity_extractor import EntityExtractor
+from processors.near_duplicate import NearDuplicateDetector
+from processors.text_extraction import TextExtractor
+from monitoring.stage_timer import BatchTiming, StageTimer
 from config import Settings
 
 # Initialize processors (lazy loading)
 _text_processor = None
 _entity_extractor = None
 _kafka_producer = None
+_near_duplicate_detector = None
+_text_extractor = None
+_stage_timer = None
 _settings = None
 
+# Log near-duplicate savings every this many checked items
+NEAR_DUPLICATE_STATS_EVERY = 500
 
-def get_processors():
-    """Lazy initialization of processors."""
-    global _text_processor, _entity_extractor, _kafka_producer, _settings
+# Log per-source text extraction coverage every this many items
+EXTRACTION_STATS_EVERY = 1000
+
+
+def get_nlp_processors():
+    """Lazy initialization of the processors process_items needs.
+    
+    Kept apart from the Kafka producer so the streaming mode can load the
+    models once in the parent and fork them into its worker pool.
+    """
+    global _text_processor, _entity_extractor, _near_duplicate_detector, _settings
     
     if _text_processor is None:
         _settings = Settings()
         _text_processor = TextProcessor(_settings)
         _entity_extractor = EntityExtractor(_settings)
-        _kafka_producer = KafkaProducer(
-            bootstrap_servers=_settings.kafka_bootstrap_servers.split(','),
-            value_serializer=lambda v: json.dumps(v).encode('utf-8'),
-            key_serializer=lambda k: k.encode('utf-8') if k else None
-        )
+        if _settings.near_duplicate_enabled:
+            _near_duplicate_detector = NearDuplicateDetector(_settings)
+    
+    return _text_processor, _entity_extractor, _near_duplicate_detector, _settings
+
+
+def get_processors():
+    """Lazy initialization of processors."""
+    global _kafka_producer
+    
+    text_processor, entity_extractor, near_duplicate_detector, settings = get_nlp_processors()
+    if _kafka_producer is None:
+        _kafka_producer = create_kafka_producer(settings)
     
-    return _text_processor, _entity_extractor, _kafka_producer, _settings
+    return text_processor, entity_extractor, _kafka_producer, near_duplicate_detector, settings
+
+
+def get_text_extractor() -> TextExtractor:
+    """Lazy initialization of the per-source text extractor."""
+    global _text_extractor
+    
+    if _text_extractor is None:
+        _text_extractor = TextExtractor(get_nlp_processors()[3])
+    
+    return _text_extractor
+
+
+def get_stage_timer() -> StageTimer:
+    """Lazy initialization of this process's stage timer."""
+    global _stage_timer
+    
+    if _stage_timer is None:
+        _stage_timer = StageTimer(get_nlp_processors()[3])
+    
+    return _stage_timer
+
+
+def create_kafka_producer(settings: Settings) -> KafkaProducer:
+    """Producer for processed items."""
+    return KafkaProducer(
+        bootstrap_servers=settings.kafka_bootstrap_servers.split(','),
+        value_serializer=lambda v: json.dumps(v).encode('utf-8'),
+        key_serializer=lambda k: k.encode('utf-8') if k else None
+    )
 
 
 @celery_app.task(bind=True, max_retries=3)
@@ -41,33 +94,227 @@ def process_raw_item(self, raw_item: Dict[str, Any]) -> Optional[Dict[str, Any]]
     
     Args:
         raw_item: Raw item from ingestion service
-        
+    
     Returns:
         Processed item or None if processing failed
     """
     try:
-        text_processor, entity_extractor, kafka_producer, settings = get_processors()
+        _, _, kafka_producer, _, settings = get_processors()
+        stage_timer = get_stage_timer()
         
-        logger.debug(f"Processing item {raw_item.get('id', 'unknown')}")
+        timing = stage_timer.start_batch([raw_item])
+        try:
+            processed_items, failed_items = process_items([raw_item], timing)
+            if failed_items:
+                raise failed_items[0][1]
+            if not processed_items:
+                return None
+            processed_item = processed_items[0]
+            
+            # Publish to clean items topic
+            with timing.stage("publish", [raw_item]):
+                kafka_producer.send(
+                    settings.kafka_topic_clean_items,
+                    key=raw_item.get('source_type'),
+                    value=processed_item
+                )
+                kafka_producer.flush()
+        finally:
+            stage_timer.finish(timing)
         
-        # Extract text content based on source type
-        text_content = _extract_text_content(raw_item)
+        logger.debug(f"Successfully processed item {raw_item.get('id')}")
+        return processed_item
+    
+    except Exception as e:
+        logger.error(f"Error processing item {raw_item.get('id', 'unknown')}: {e}")
         
-        if not text_content:
-            logger.warning(f"No text content found in item {raw_item.get('id')}")
+        # Retry with exponential backoff
+        if self.request.retries < self.max_retries:
+            raise self.retry(countdown=60 * (2 ** self.request.retries))
+        else:
+            logger.error(f"Max retries exceeded for item {raw_item.get('id')}")
             return None
+
+
+@celery_app.task(bind=True, max_retries=3)
+def process_raw_items_batch(self, raw_items: List[Dict[str, Any]], attempt: int = 0) -> Dict[str, int]:
+    """Process a micro-batch of raw items and publish them with a single flush.
+    
+    Items that fail, either while processing or while publishing, are
+    retried on their own: each one is re-queued as a one-item batch with
+    the same exponential backoff and retry limit as process_raw_item, so a
+    bad item never causes its neighbours to be reprocessed.
+    
+    Args:
+        raw_items: Raw items from ingestion service
+        attempt: Retry count of these items (0 for a fresh batch)
+    
+    Returns:
+        Counts of published, filtered and failed items
+    """
+    _, _, kafka_producer, _, settings = get_processors()
+    stage_timer = get_stage_timer()
+    
+    timing = stage_timer.start_batch(raw_items)
+    try:
+        processed_items, failed_items = process_items(raw_items, timing)
+        filtered = len(raw_items) - len(processed_items) - len(failed_items)
+        raw_by_id = {raw_item.get('id'): raw_item for raw_item in raw_items}
         
-        # Clean and normalize text
-        cleaned_text = text_processor.clean_text(text_content)
+        # Queue every send, then wait for all of them once
+        futures = []
+        with timing.stage("publish", [raw_by_id[processed_item['id']] for processed_item in processed_items]):
+            for processed_item in processed_items:
+                try:
+                    futures.append((processed_item, kafka_producer.send(
+                        settings.kafka_topic_clean_items,
+                        key=processed_item.get('source_type'),
+                        value=processed_item
+                    )))
+                except Exception as e:
+                    # Metadata timeout, full buffer or serialization error; retried like a processing failure
+                    failed_items.append((raw_by_id[processed_item['id']], e))
+            try:
+                kafka_producer.flush()
+            except Exception as e:
+                # Sends still unresolved fail their future.get below and are retried
+                logger.warning(f"Flushing batch of {len(futures)} items failed: {e}")
+    finally:
+        stage_timer.finish(timing)
+    
+    published = 0
+    for processed_item, future in futures:
+        try:
+            future.get(timeout=0)
+            published += 1
+        except Exception as e:
+            failed_items.append((raw_by_id[processed_item['id']], e))
+    
+    for raw_item, error in failed_items:
+        logger.error(f"Error processing item {raw_item.get('id', 'unknown')}: {error}")
+        if attempt < self.max_retries:
+            process_raw_items_batch.apply_async(
+                args=([raw_item],),
+                kwargs={'attempt': attempt + 1},
+                countdown=60 * (2 ** attempt)
+            )
+        else:
+            logger.error(f"Max retries exceeded for item {raw_item.get('id')}")
+    
+    logger.debug(f"Published {published}/{len(raw_items)} items from batch ({len(failed_items)} failed)")
+    return {
+        'published': published,
+        'filtered': filtered,
+        'failed': len(failed_items),
+    }
+
+
+def process_items(
+    raw_items: List[Dict[str, Any]],
+    timing: Optional[BatchTiming] = None
+) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], Exception]]]:
+    """Clean, filter and enrich raw items, running spaCy once for the whole list.
+    
+    Args:
+        raw_items: Raw items from ingestion service
+        timing: Stage timing to record into; the caller then finishes it. Without
+            one, the batch is timed and recorded here.
+    
+    Returns:
+        Processed items for the raw items that passed filtering, in input
+        order, and (raw_item, error) pairs for items that raised
+    """
+    text_processor, entity_extractor, near_duplicate_detector, settings = get_nlp_processors()
+    text_extractor = get_text_extractor()
+    own_timing = timing is None
+    if own_timing:
+        timing = get_stage_timer().start_batch(raw_items)
+    
+    # (raw_item, cleaned_text, duplicate_of) for items that pass filtering
+    prepared: List[Tuple[Dict[str, Any], str, Optional[str]]] = []
+    failed_items: List[Tuple[Dict[str, Any], Exception]] = []
+    
+    # (raw_item, cleaned_text) for items with text content
+    cleaned: List[Tuple[Dict[str, Any], str]] = []
+    for raw_item in raw_items:
+        logger.debug(f"Processing item {raw_item.get('id', 'unknown')}")
+        
+        try:
+            with timing.stage("clean", [raw_item]):
+                # Extract text content based on source type
+                text_content = text_extractor.extract(raw_item)
+                _log_extraction_stats(text_extractor)
+                
+                if not text_content:
+                    logger.warning(f"No text content found in item {raw_item.get('id')}")
+                    continue
+                
+                # Clean and normalize text
+                cleaned.append((raw_item, text_processor.clean_text(text_content)))
         
-        # Language detection and filtering
-        if not text_processor.is_supported_language(cleaned_text):
+        except Exception as e:
+            failed_items.append((raw_item, e))
+    
+    # Language detection and filtering, classifying the whole batch at once
+    try:
+        with timing.stage("language", [raw_item for raw_item, _ in cleaned]):
+            supported = text_processor.are_supported_languages([cleaned_text for _, cleaned_text in cleaned])
+    except Exception as e:
+        failed_items.extend((raw_item, e) for raw_item, _ in cleaned)
+        cleaned, supported = [], []
+    
+    for (raw_item, cleaned_text), is_supported in zip(cleaned, supported):
+        if not is_supported:
             logger.debug(f"Unsupported language for item {raw_item.get('id')}")
-            return None
+            continue
+        
+        try:
+            # Collapse near-duplicates before entity extraction and embedding
+            duplicate_of = None
+            if near_duplicate_detector is not None:
+                with timing.stage("near_duplicate", [raw_item]):
+                    duplicate_of = near_duplicate_detector.check(str(raw_item.get('id')), cleaned_text)
+                _log_near_duplicate_stats(near_duplicate_detector)
+            
+            if duplicate_of and settings.near_duplicate_action == "skip":
+                logger.debug(f"Skipping item {raw_item.get('id')}, near-duplicate of {duplicate_of}")
+                continue
+            
+            prepared.append((raw_item, cleaned_text, duplicate_of))
         
-        # Extract entities and keywords
-        entities = entity_extractor.extract_entities(cleaned_text)
-        keywords = entity_extractor.extract_keywords(cleaned_text)
+        except Exception as e:
+            failed_items.append((raw_item, e))
+    
+    # One nlp.pipe pass over every original in the batch, shared by entities and keywords
+    originals = [i for i, (_, _, duplicate_of) in enumerate(prepared) if not duplicate_of]
+    try:
+        with timing.stage("spacy", [prepared[i][0] for i in originals]):
+            analyses = entity_extractor.analyze_batch([prepared[i][1] for i in originals])
+    except Exception as e:
+        # Cannot tell which text broke the batch; retry each original on its own
+        failed_items.extend((prepared[i][0], e) for i in originals)
+        prepared = [entry for entry in prepared if entry[2]]
+        originals, analyses = [], []
+    analysis_by_index = dict(zip(originals, analyses))
+    
+    processed_items = []
+    for i, (raw_item, cleaned_text, duplicate_of) in enumerate(prepared):
+        try:
+            # Extract entities and keywords
+            if duplicate_of:
+                entities, keywords = {}, []
+            else:
+                analysis = analysis_by_index[i]
+                with timing.stage("entities", [raw_item]):
+                    entities = entity_extractor.extract_entities_from(analysis)
+                with timing.stage("keywords", [raw_item]):
+                    keywords = (
+                        entity_extractor.extract_keywords(cleaned_text, analysis=analysis)
+                        if settings.extract_keywords else []
+                    )
+        except Exception as e:
+            failed_items.append((raw_item, e))
+            continue
         
         # Create processed item
         processed_item = {
@@ -80,61 +327,37 @@ def process_raw_item(self, raw_item: Dict[str, Any]) -> Optional[Dict[str, Any]]
             'processed_at': datetime.utcnow().isoformat(),
             'processor_version': '1.0'
         }
+        if duplicate_of:
+            # Downstream stages skip embedding and scoring for marked items
+            processed_item['duplicate_of'] = duplicate_of
         
-        # Publish to clean items topic
-        kafka_producer.send(
-            settings.kafka_topic_clean_items,
-            key=raw_item.get('source_type'),
-            value=processed_item
+        processed_items.append(processed_item)
+    
+    if own_timing:
+        get_stage_timer().finish(timing)
+    
+    return processed_items, failed_items
+
+
+def _log_near_duplicate_stats(detector: NearDuplicateDetector):
+    """Periodically log how much downstream work near-duplicate collapse saved."""
+    # checked does not advance for items without words, so log once per multiple
+    checked = detector.stats['checked']
+    if checked // NEAR_DUPLICATE_STATS_EVERY > detector.last_logged_checked // NEAR_DUPLICATE_STATS_EVERY:
+        detector.last_logged_checked = checked
+        stats = detector.get_stats()
+        logger.info(
+            f"Near-duplicates: {stats['duplicates']}/{stats['checked']} items "
+            f"({stats['duplicate_rate']:.1%}), saved {stats['saved_embeddings']} embeddings, "
+            f"~{stats['saved_embedding_tokens']} embedding tokens"
         )
-        kafka_producer.flush()
-        
-        logger.debug(f"Successfully processed item {raw_item.get('id')}")
-        return processed_item
-        
-    except Exception as e:
-        logger.error(f"Error processing item {raw_item.get('id', 'unknown')}: {e}")
-        
-        # Retry with exponential backoff
-        if self.request.retries < self.max_retries:
-            raise self.retry(countdown=60 * (2 ** self.request.retries))
-        else:
-            logger.error(f"Max retries exceeded for item {raw_item.get('id')}")
-            return None
 
 
-def _extract_text_content(raw_item: Dict[str, Any]) -> str:
-    """Extract relevant text content from raw item based on source type."""
-    source_type = raw_item.get('source_type', '')
-    raw_data = raw_item.get('raw_data', {})
-    
-    text_parts = []
-    
-    if source_type == 'reddit':
-        title = raw_data.get('title', '')
-        selftext = raw_data.get('selftext', '')
-        text_parts = [title, selftext]
-        
-    elif source_type == 'hackernews':
-        title = raw_data.get('title', '')
-        text = raw_data.get('text', '')
-        text_parts = [title, text]
-        
-    elif source_type == 'g2':
-        review_text = raw_data.get('review_text', '')
-        text_parts = [review_text]
-        
-    elif source_type == 'linkedin':
-        title = raw_data.get('title', '')
-        description = raw_data.get('description', '')
-        text_parts = [title, description]
-        
-    elif source_type == 'newsletter':
-        title = raw_data.get('title', '')
-        summary = raw_data.get('summary', '')
-        content = raw_data.get('content', '')
-        text_parts = [title, summary, content]
-    
-    # Combine and clean text parts
-    combined_text = ' '.join(filter(None, text_parts))
-    return combined_text.strip()
\ No newline at end of file
+def _log_extraction_stats(extractor: TextExtractor):
+    """Periodically log per-source text coverage and items dropped for having no text."""
+    if extractor.total % EXTRACTION_STATS_EVERY == 0:
+        summary = ", ".join(
+            f"{source} {stats['extracted']}/{stats['items']} ({stats['coverage']:.0%}, {stats['dropped']} dropped)"
+            for source, stats in sorted(extractor.get_stats().items())
+        )
+        logger.info(f"Text extraction by source: {summary}")
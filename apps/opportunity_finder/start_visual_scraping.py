@@ -22,7 +22,7 @@ class VisualScrapingDemo:
     """可视化抓取演示类"""
     
     def __init__(self):
-        self.settings = Settings()
+        self.settings = Settings(browser_profile="visual")
         self.kafka_producer = None
         self.scraper = None
         self.running = True
@@ -58,6 +58,9 @@ class VisualScrapingDemo:
             
             # Start scraping with visual feedback
             items = await self.scraper.scrape_batch()
+            if self.kafka_producer and items:
+                published = await self.scraper.publish(items)
+                print(f"📨 已发送 {published} 条数据到Kafka")
             
             # Display results
             print("\n🎉 可视化抓取演示完成!")
@@ -74,7 +74,8 @@ async def test_browser_scraping():
         
         # Test Reddit browser scraping
         print("📱 测试浏览器Reddit抓取...")
-        reddit_items = await scraper._scrape_reddit_with_browser('startups')
+        context = await scraper._create_stealth_context()
+        reddit_items = await scraper._scrape_reddit_with_browser(context, 'startups')
         print(f"✅ 浏览器Reddit成功抓取: {len(reddit_items)} 条数据")
         
         if reddit_items:
@@ -86,7 +87,7 @@ async def test_browser_scraping():
         
         # Test HackerNews browser scraping
         print("\n📰 测试浏览器HackerNews抓取...")
-        hn_items = await scraper._scrape_hackernews_with_browser()
+        hn_items = await scraper._scrape_hackernews_optimized(context)
         print(f"✅ 浏览器HackerNews成功抓取: {len(hn_items)} 条数据")
         
         if hn_items:
@@ -99,6 +100,7 @@ async def test_browser_scraping():
         print(f"\n🎉 浏览器自动化抓取完成! 总共获取: {total_items} 条数据")
         
         # Cleanup browser resources
+        await context.close()
         await scraper.cleanup()
         
         return reddit_items + hn_items